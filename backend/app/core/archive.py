@@ -0,0 +1,228 @@
+"""Move old exercises out of the hot `exercises` table.
+
+Archived rows go to `exercises_archive`, a WITHOUT ROWID table clustered on
+(child_id, created_at, id). The same transaction folds them into two rollups:
+`exercise_archive_totals`, with per (child, exercise type, word) counts and
+score sums, and `exercise_archive_daily`, with per-day counts. Progress
+summaries add the rollups to the hot aggregates, so totals, averages, weak
+words and streaks stay exact. Only history listings read archived rows.
+
+Run online, from the repository root:
+    python -m backend.app.core.archive [--days 400] [--batch-size 500]
+
+Each batch is its own short write transaction, so requests are never blocked
+for longer than one batch.
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from .config import env_int
+from .db import get_connection
+
+LOW_SCORE = 70
+
+
+def archive_after_days() -> int:
+    return max(1, env_int("GOGOHANNAH_ARCHIVE_AFTER_DAYS", 400))
+
+
+def archive_batch_size() -> int:
+    return max(1, env_int("GOGOHANNAH_ARCHIVE_BATCH_SIZE", 500))
+
+
+def init_archive() -> None:
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS exercises_archive (
+                child_id INTEGER NOT NULL,
+                created_at TIMESTAMP NOT NULL,
+                id INTEGER NOT NULL,
+                word TEXT NOT NULL,
+                exercise_type TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                correct BOOLEAN NOT NULL,
+                PRIMARY KEY (child_id, created_at, id)
+            ) WITHOUT ROWID
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS exercise_archive_totals (
+                child_id INTEGER NOT NULL,
+                exercise_type TEXT NOT NULL,
+                word TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                correct_count INTEGER NOT NULL,
+                score_sum INTEGER NOT NULL,
+                low_attempts INTEGER NOT NULL,
+                low_score_sum INTEGER NOT NULL,
+                PRIMARY KEY (child_id, exercise_type, word)
+            ) WITHOUT ROWID
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS exercise_archive_daily (
+                child_id INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                completed INTEGER NOT NULL,
+                PRIMARY KEY (child_id, date)
+            ) WITHOUT ROWID
+        """
+        )
+        conn.commit()
+
+
+def _archive_batch(conn, cutoff: str, batch_size: int) -> int:
+    cursor = conn.cursor()
+    # Take the write lock up front so the read below sees what we delete.
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        rows = cursor.execute(
+            """
+            SELECT id, child_id, word, exercise_type, score, correct, created_at
+            FROM exercises
+            WHERE created_at < ? AND child_id IS NOT NULL
+            ORDER BY created_at, id
+            LIMIT ?
+        """,
+            (cutoff, batch_size),
+        ).fetchall()
+        if not rows:
+            conn.rollback()
+            return 0
+
+        totals: dict[tuple, list[int]] = {}
+        daily: dict[tuple, int] = {}
+        for _, child_id, word, exercise_type, score, correct, created_at in rows:
+            entry = totals.setdefault((child_id, exercise_type, word), [0, 0, 0, 0, 0])
+            entry[0] += 1
+            entry[1] += 1 if correct else 0
+            entry[2] += score
+            if score < LOW_SCORE:
+                entry[3] += 1
+                entry[4] += score
+            day = (child_id, created_at[:10])
+            daily[day] = daily.get(day, 0) + 1
+
+        cursor.executemany(
+            """
+            INSERT INTO exercises_archive
+                (id, child_id, word, exercise_type, score, correct, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+            rows,
+        )
+        cursor.executemany(
+            """
+            INSERT INTO exercise_archive_totals (
+                child_id, exercise_type, word, attempts, correct_count,
+                score_sum, low_attempts, low_score_sum
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(child_id, exercise_type, word) DO UPDATE SET
+                attempts = attempts + excluded.attempts,
+                correct_count = correct_count + excluded.correct_count,
+                score_sum = score_sum + excluded.score_sum,
+                low_attempts = low_attempts + excluded.low_attempts,
+                low_score_sum = low_score_sum + excluded.low_score_sum
+        """,
+            [key + tuple(values) for key, values in totals.items()],
+        )
+        cursor.executemany(
+            """
+            INSERT INTO exercise_archive_daily (child_id, date, completed)
+            VALUES (?, ?, ?)
+            ON CONFLICT(child_id, date) DO UPDATE SET
+                completed = completed + excluded.completed
+        """,
+            [key + (count,) for key, count in daily.items()],
+        )
+        cursor.executemany(
+            "DELETE FROM exercises WHERE id = ?", [(row[0],) for row in rows]
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return len(rows)
+
+
+def archive_exercises(
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+    pause_seconds: float = 0.05,
+) -> dict:
+    """Archive exercises older than the horizon, one batch per transaction.
+
+    `pause_seconds` between batches lets queued writers take the lock.
+    """
+    days = older_than_days if older_than_days is not None else archive_after_days()
+    size = batch_size or archive_batch_size()
+    # created_at is SQLite's CURRENT_TIMESTAMP, in UTC.
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime(
+        "%Y-%m-%d %H:%M:%S"
+    )
+    moved = 0
+    batches = 0
+    conn = get_connection()
+    try:
+        while max_batches is None or batches < max_batches:
+            count = _archive_batch(conn, cutoff, size)
+            if not count:
+                break
+            moved += count
+            batches += 1
+            if count < size:
+                break
+            if pause_seconds:
+                time.sleep(pause_seconds)
+    finally:
+        conn.close()
+    return {"cutoff": cutoff, "moved": moved, "batches": batches}
+
+
+def archive_status() -> dict:
+    with get_connection() as conn:
+        hot = conn.execute("SELECT COUNT(*) FROM exercises").fetchone()[0]
+        archived, oldest, newest = conn.execute(
+            "SELECT COUNT(*), MIN(created_at), MAX(created_at) FROM exercises_archive"
+        ).fetchone()
+    return {
+        "hot_rows": hot,
+        "archived_rows": archived,
+        "archived_from": oldest,
+        "archived_to": newest,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive old exercises.")
+    parser.add_argument("--days", type=int, default=None, help="archive rows older than this")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--max-batches", type=int, default=None)
+    parser.add_argument("--pause", type=float, default=0.05, help="seconds between batches")
+    args = parser.parse_args()
+
+    # Importing progress creates the hot tables on a fresh database.
+    from . import progress  # noqa: F401
+
+    result = archive_exercises(args.days, args.batch_size, args.max_batches, args.pause)
+    print(
+        f"archived {result['moved']} exercises older than {result['cutoff']} "
+        f"in {result['batches']} batches"
+    )
+    print(archive_status())
+
+
+init_archive()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import asyncio
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Iterable, Optional, TypeVar
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import env_float, env_int
+
+T = TypeVar("T")
+
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+
+class TranscriptionBusy(RuntimeError):
+    pass
+
+
+def max_audio_bytes() -> int:
+    return env_int("GOGOHANNAH_MAX_AUDIO_BYTES", 10 * 1024 * 1024)
+
+
+def transcribe_workers() -> int:
+    return max(1, env_int("GOGOHANNAH_TRANSCRIBE_WORKERS", 4))
+
+
+def transcribe_queue_timeout() -> float:
+    return env_float("GOGOHANNAH_TRANSCRIBE_QUEUE_TIMEOUT", 30.0)
+
+
+# Room for the multipart boundaries and small form fields around the file.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+_TOO_LARGE = "Audio file is too large."
+
+
+class UploadLimitMiddleware:
+    """Cap the request body of upload routes before it is parsed.
+
+    Starlette parses a multipart body into temp files before the endpoint
+    runs, so a size check in the endpoint cannot stop a large upload being
+    read. This middleware answers 413 straight away when Content-Length is
+    over the cap. It also stops reading a body mid-stream once it passes the
+    cap, which covers chunked uploads and wrong lengths.
+
+    The time from the first body read to the last chunk, which includes the
+    parser spooling the file, is stored as `request.state.upload_ms`.
+    """
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str]) -> None:
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        limit = max_audio_bytes() + MULTIPART_OVERHEAD_BYTES
+        declared = Headers(scope=scope).get("content-length", "")
+        if declared.isdigit() and int(declared) > limit:
+            response = JSONResponse({"detail": _TOO_LARGE}, status_code=413)
+            await response(scope, receive, send)
+            return
+        received = 0
+        started: Optional[float] = None
+        state = scope.setdefault("state", {})
+
+        async def limited_receive() -> Message:
+            nonlocal received, started
+            if started is None:
+                started = time.perf_counter()
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI passes HTTPExceptions from body parsing through.
+                    raise HTTPException(status_code=413, detail=_TOO_LARGE)
+                if not message.get("more_body", False):
+                    state["upload_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def hash_upload(file: BinaryIO, digest) -> int:
+    """Feed an uploaded file to a hashlib `digest` in place; returns its size.
+
+    Reads the temp file Starlette already spooled the upload into, in
+    chunks, and rewinds it for the next reader.
+    """
+    file.seek(0)
+    size = 0
+    while True:
+        chunk = file.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        size += len(chunk)
+        digest.update(chunk)
+    file.seek(0)
+    return size
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+# One semaphore per event loop; asyncio primitives cannot cross loops.
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=transcribe_workers(),
+            thread_name_prefix="transcribe",
+        )
+    return _executor
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(transcribe_workers())
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def run_transcription(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking transcription call on the dedicated executor.
+
+    At most `GOGOHANNAH_TRANSCRIBE_WORKERS` calls run at once; callers that
+    wait longer than `GOGOHANNAH_TRANSCRIBE_QUEUE_TIMEOUT` seconds for a
+    slot get TranscriptionBusy instead of piling up behind the executor.
+    """
+    semaphore = _get_semaphore()
+    try:
+        # Unlike wait_for, a timeout here cannot race with a granted slot.
+        async with asyncio.timeout(transcribe_queue_timeout()):
+            await semaphore.acquire()
+    except TimeoutError:
+        raise TranscriptionBusy("Transcription service is busy.")
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_executor(), lambda: func(*args, **kwargs)
+        )
+    finally:
+        semaphore.release()
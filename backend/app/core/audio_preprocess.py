@@ -0,0 +1,155 @@
+import io
+import os
+import wave
+from typing import BinaryIO, Optional
+
+import numpy as np
+
+TARGET_SAMPLE_RATE = 16_000
+FRAME_MS = 20
+# Keep a little audio around detected speech so soft onsets are not clipped.
+PAD_MS = 150
+# Frames quieter than this (relative to the loudest frame) count as silence.
+RELATIVE_SILENCE_DB = -30.0
+ABSOLUTE_SILENCE_DB = -50.0
+TARGET_PEAK_DB = -1.0
+MAX_GAIN_DB = 20.0
+_FIR_TAPS = 31
+
+
+def preprocess_enabled() -> bool:
+    return os.getenv("GOGOHANNAH_AUDIO_PREPROCESS", "true").lower() in {
+        "1",
+        "true",
+        "yes",
+    }
+
+
+def _db_to_amplitude(db: float) -> float:
+    return float(10 ** (db / 20))
+
+
+def read_wav(source: BinaryIO) -> Optional[tuple[np.ndarray, int]]:
+    """Decode PCM WAV into float32 samples (frames x channels) in [-1, 1].
+
+    Returns None when the input is not a PCM WAV file this module handles.
+    """
+    try:
+        with wave.open(source, "rb") as wav:
+            channels = wav.getnchannels()
+            width = wav.getsampwidth()
+            rate = wav.getframerate()
+            raw = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    elif width == 3:
+        packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = packed[:, 0] | (packed[:, 1] << 8) | (packed[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        samples = values.astype(np.float32) / 8388608
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        return None
+    usable = len(samples) - len(samples) % channels
+    return samples[:usable].reshape(-1, channels), rate
+
+
+def write_wav(samples: np.ndarray, rate: int) -> io.BytesIO:
+    """Encode mono float samples as 16-bit PCM WAV."""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm.tobytes())
+    buffer.seek(0)
+    return buffer
+
+
+def _lowpass_kernel(cutoff: float) -> np.ndarray:
+    """Windowed-sinc FIR; `cutoff` is a fraction of the input sample rate."""
+    n = np.arange(_FIR_TAPS) - (_FIR_TAPS - 1) / 2
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(_FIR_TAPS)
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+def resample(samples: np.ndarray, rate: int, target_rate: int) -> np.ndarray:
+    """Resample mono audio with an anti-aliasing filter and linear interpolation."""
+    if rate == target_rate or len(samples) < 2:
+        return samples
+    if target_rate < rate:
+        cutoff = 0.45 * target_rate / rate
+        samples = np.convolve(samples, _lowpass_kernel(cutoff), mode="same")
+    duration = len(samples) / rate
+    target_length = max(1, int(round(duration * target_rate)))
+    positions = np.arange(target_length, dtype=np.float64) * (rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def trim_silence(samples: np.ndarray, rate: int) -> np.ndarray:
+    """Drop leading and trailing silence using per-frame RMS energy."""
+    frame = max(1, rate * FRAME_MS // 1000)
+    count = len(samples) // frame
+    if count == 0:
+        return samples
+    frames = samples[: count * frame].reshape(count, frame)
+    energy = np.sqrt(np.mean(frames**2, axis=1))
+    loudest = float(energy.max())
+    threshold = max(
+        _db_to_amplitude(ABSOLUTE_SILENCE_DB),
+        loudest * _db_to_amplitude(RELATIVE_SILENCE_DB),
+    )
+    voiced = np.flatnonzero(energy >= threshold)
+    if voiced.size == 0:
+        return samples
+    pad = rate * PAD_MS // 1000
+    start = max(0, voiced[0] * frame - pad)
+    end = min(len(samples), (voiced[-1] + 1) * frame + pad)
+    return samples[start:end]
+
+
+def normalize(samples: np.ndarray) -> np.ndarray:
+    """Scale to the target peak level, capping the gain applied to quiet input."""
+    peak = float(np.max(np.abs(samples))) if len(samples) else 0.0
+    if peak == 0.0:
+        return samples
+    gain = min(
+        _db_to_amplitude(TARGET_PEAK_DB) / peak,
+        _db_to_amplitude(MAX_GAIN_DB),
+    )
+    return samples * gain
+
+
+def preprocess_audio(source: BinaryIO) -> Optional[io.BytesIO]:
+    """Shrink a WAV recording before transcription.
+
+    Decodes, downmixes to mono, resamples to 16 kHz, trims silence and
+    normalizes levels. Returns a new 16-bit WAV, or None (with `source`
+    rewound) when the input is not PCM WAV so it can be sent unchanged.
+    """
+    mono = decode_mono(source)
+    if mono is None:
+        return None
+    mono = trim_silence(mono, TARGET_SAMPLE_RATE)
+    return write_wav(normalize(mono), TARGET_SAMPLE_RATE)
+
+
+def decode_mono(source: BinaryIO) -> Optional[np.ndarray]:
+    """Decode a PCM WAV file to mono float samples at 16 kHz.
+
+    Returns None (with `source` rewound) when the input is not PCM WAV.
+    """
+    start = source.tell()
+    decoded = read_wav(source)
+    source.seek(start)
+    if decoded is None:
+        return None
+    samples, rate = decoded
+    mono = samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+    return resample(mono, rate, TARGET_SAMPLE_RATE)
@@ -0,0 +1,329 @@
+"""Online snapshots of progress.db with SQLite's backup API.
+
+The database runs in WAL mode (see db.py), so a snapshot is copied in one
+backup step from a single read transaction while other connections keep
+writing. The file is integrity-checked before it is renamed into place, so
+a `progress-*.db` in the backup directory is always complete.
+
+Run from the repository root:
+    python -m backend.app.core.backup snapshot
+    python -m backend.app.core.backup list
+    python -m backend.app.core.backup verify PATH
+    python -m backend.app.core.backup restore PATH
+    python -m backend.app.core.backup prune
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .config import env_float, env_int
+from .db import DATA_DIR, database_path
+from .study_time import flush_study_time
+from .versions import init_versions
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+SNAPSHOT_PREFIX = "progress-"
+SNAPSHOT_SUFFIX = ".db"
+_STAMP_FORMAT = "%Y%m%dT%H%M%S%fZ"
+# Leftovers from a crashed backup, not one that is still running.
+_STALE_PARTIAL_SECONDS = 3600
+
+
+def backup_dir() -> Path:
+    return Path(os.getenv("GOGOHANNAH_BACKUP_DIR", str(DATA_DIR / "backups")))
+
+
+def backup_interval_seconds() -> float:
+    """Seconds between scheduled snapshots; 0 (the default) disables them."""
+    return max(0.0, env_float("GOGOHANNAH_BACKUP_INTERVAL_HOURS", 0.0) * 3600)
+
+
+def create_snapshot(dest_dir: Optional[Path] = None) -> dict:
+    """Copy the live database into a new verified snapshot file.
+
+    The copy is a single backup step, so it reads one consistent version of
+    the database. In WAL mode writers are not blocked; the WAL file grows
+    until the copy ends and the next checkpoint runs. With WAL disabled the
+    copy holds writers back for its whole duration.
+    """
+    # Buffered heartbeats belong in the snapshot.
+    flush_study_time()
+    dest_dir = Path(dest_dir or backup_dir())
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime(_STAMP_FORMAT)
+    final = dest_dir / f"{SNAPSHOT_PREFIX}{stamp}{SNAPSHOT_SUFFIX}"
+    partial = final.with_name(final.name + ".partial")
+
+    started = time.perf_counter()
+    source = sqlite3.connect(str(database_path()))
+    target = sqlite3.connect(str(partial))
+    try:
+        journal_mode = source.execute("PRAGMA journal_mode").fetchone()[0]
+        source.backup(target)
+        # Keep the snapshot a single self-contained file, without -wal/-shm.
+        target.execute("PRAGMA journal_mode=DELETE")
+        page_count = target.execute("PRAGMA page_count").fetchone()[0]
+    except BaseException:
+        target.close()
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        source.close()
+    target.close()
+    copied = time.perf_counter() - started
+
+    check = verify_snapshot(partial)
+    if not check["ok"]:
+        partial.unlink(missing_ok=True)
+        raise RuntimeError(f"Snapshot failed integrity check: {check['result']}")
+    with open(partial, "rb") as handle:
+        os.fsync(handle.fileno())
+    os.replace(partial, final)
+    return {
+        "path": str(final),
+        "bytes": final.stat().st_size,
+        "pages": page_count,
+        "journal_mode": journal_mode,
+        "copy_seconds": round(copied, 3),
+        "verify_seconds": check["seconds"],
+    }
+
+
+def verify_snapshot(path: Path, quick: bool = False) -> dict:
+    """Run `PRAGMA integrity_check` (or `quick_check`) on a snapshot file."""
+    started = time.perf_counter()
+    pragma = "quick_check" if quick else "integrity_check"
+    try:
+        conn = sqlite3.connect(f"file:{Path(path)}?mode=ro", uri=True)
+        try:
+            rows = [row[0] for row in conn.execute(f"PRAGMA {pragma}")]
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError as exc:
+        rows = [str(exc)]
+    return {
+        "path": str(path),
+        "ok": rows == ["ok"],
+        "result": rows[:20],
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def list_snapshots(dest_dir: Optional[Path] = None) -> list[dict]:
+    """Complete snapshots, newest first."""
+    snapshots = []
+    for path in Path(dest_dir or backup_dir()).glob(
+        f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}"
+    ):
+        stamp = path.name[len(SNAPSHOT_PREFIX) : -len(SNAPSHOT_SUFFIX)]
+        try:
+            created = datetime.strptime(stamp, _STAMP_FORMAT).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+        snapshots.append(
+            {"path": str(path), "created_at": created, "bytes": path.stat().st_size}
+        )
+    snapshots.sort(key=lambda item: item["created_at"], reverse=True)
+    return snapshots
+
+
+def prune_snapshots(
+    keep_last: Optional[int] = None,
+    keep_daily: Optional[int] = None,
+    dest_dir: Optional[Path] = None,
+) -> list[str]:
+    """Apply retention and return the removed paths.
+
+    Keeps the newest `keep_last` snapshots plus the newest snapshot of each
+    of the last `keep_daily` days that have one.
+    """
+    if keep_last is None:
+        keep_last = env_int("GOGOHANNAH_BACKUP_KEEP", 7)
+    if keep_daily is None:
+        keep_daily = env_int("GOGOHANNAH_BACKUP_KEEP_DAILY", 14)
+    snapshots = list_snapshots(dest_dir)
+    keep = {item["path"] for item in snapshots[: max(0, keep_last)]}
+    days: list = []
+    for item in snapshots:
+        day = item["created_at"].date()
+        if day not in days:
+            if len(days) >= keep_daily:
+                break
+            days.append(day)
+            keep.add(item["path"])
+    removed = []
+    for item in snapshots:
+        if item["path"] not in keep:
+            Path(item["path"]).unlink(missing_ok=True)
+            removed.append(item["path"])
+    now = time.time()
+    for partial in Path(dest_dir or backup_dir()).glob("*.partial"):
+        if now - partial.stat().st_mtime > _STALE_PARTIAL_SECONDS:
+            partial.unlink(missing_ok=True)
+            removed.append(str(partial))
+    return removed
+
+
+def restore_snapshot(path: Path, safety_snapshot: bool = True) -> dict:
+    """Replace the live database with a verified snapshot.
+
+    The copy is one backup step, so readers see either the old or the new
+    database and writers wait for it to finish; the live file stays in WAL
+    mode. Child versions are moved
+    past every version handed out before, so no stale ETag matches restored
+    data.
+    """
+    check = verify_snapshot(path)
+    if not check["ok"]:
+        raise ValueError(f"Snapshot failed integrity check: {check['result']}")
+    safety = create_snapshot() if safety_snapshot else None
+
+    started = time.perf_counter()
+    flush_study_time()
+    snapshot = sqlite3.connect(f"file:{Path(path)}?mode=ro", uri=True)
+    live = sqlite3.connect(str(database_path()))
+    try:
+        known = _version_state(live)
+        snapshot.backup(live)
+        # Snapshots taken before version counters existed lack the table.
+        init_versions()
+        floor = max(known.values(), default=0) + 1
+        live.execute("UPDATE child_versions SET version = version + ?", (floor,))
+        restored_children = [row[0] for row in live.execute("SELECT id FROM children")]
+        live.executemany(
+            """
+            INSERT INTO child_versions (child_id, version) VALUES (?, ?)
+            ON CONFLICT(child_id) DO NOTHING
+        """,
+            [(child_id, floor) for child_id in set(known) | set(restored_children)],
+        )
+        live.commit()
+    finally:
+        snapshot.close()
+        live.close()
+    return {
+        "restored_from": str(path),
+        "safety_snapshot": safety["path"] if safety else None,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def _version_state(conn: sqlite3.Connection) -> dict[int, int]:
+    try:
+        return dict(conn.execute("SELECT child_id, version FROM child_versions"))
+    except sqlite3.OperationalError:
+        return {}
+
+
+@contextmanager
+def _exclusive(dest_dir: Path) -> Iterator[bool]:
+    """Non-blocking cross-process lock, so one worker backs up at a time."""
+    if fcntl is None:
+        yield True
+        return
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    with open(dest_dir / ".lock", "w") as handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def run_scheduled_backup(interval: float) -> Optional[dict]:
+    """Snapshot and prune, unless another worker did so within the interval."""
+    dest_dir = backup_dir()
+    with _exclusive(dest_dir) as acquired:
+        if not acquired:
+            return None
+        latest = list_snapshots(dest_dir)[:1]
+        if latest:
+            age = (datetime.now(timezone.utc) - latest[0]["created_at"]).total_seconds()
+            if age < interval * 0.9:
+                return None
+        result = create_snapshot(dest_dir)
+        result["pruned"] = prune_snapshots(dest_dir=dest_dir)
+        return result
+
+
+_scheduler: Optional[threading.Thread] = None
+_scheduler_stop = threading.Event()
+
+
+def _schedule_loop(interval: float) -> None:
+    while not _scheduler_stop.wait(interval):
+        try:
+            run_scheduled_backup(interval)
+        except Exception:
+            # A failed snapshot leaves no partial behind; try again next tick.
+            continue
+
+
+def start_backup_scheduler() -> bool:
+    global _scheduler
+    interval = backup_interval_seconds()
+    if interval <= 0 or (_scheduler is not None and _scheduler.is_alive()):
+        return False
+    _scheduler_stop.clear()
+    _scheduler = threading.Thread(
+        target=_schedule_loop, args=(interval,), name="backup-scheduler", daemon=True
+    )
+    _scheduler.start()
+    return True
+
+
+def stop_backup_scheduler() -> None:
+    _scheduler_stop.set()
+    if _scheduler is not None:
+        _scheduler.join(timeout=5)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Back up and restore progress.db.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("snapshot")
+    commands.add_parser("list")
+    verify = commands.add_parser("verify")
+    verify.add_argument("path")
+    restore = commands.add_parser("restore")
+    restore.add_argument("path")
+    restore.add_argument("--no-safety-snapshot", action="store_true")
+    prune = commands.add_parser("prune")
+    prune.add_argument("--keep-last", type=int, default=None)
+    prune.add_argument("--keep-daily", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "snapshot":
+        result = create_snapshot()
+    elif args.command == "list":
+        result = [
+            {**item, "created_at": item["created_at"].isoformat()}
+            for item in list_snapshots()
+        ]
+    elif args.command == "verify":
+        result = verify_snapshot(Path(args.path))
+    elif args.command == "restore":
+        result = restore_snapshot(Path(args.path), safety_snapshot=not args.no_safety_snapshot)
+    else:
+        result = prune_snapshots(args.keep_last, args.keep_daily)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
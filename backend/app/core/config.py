@@ -0,0 +1,21 @@
+"""Typed readers for `GOGOHANNAH_*` environment settings.
+
+Settings are read on every call, so tests and operators can change them
+without a restart. A value that does not parse falls back to the default.
+"""
+
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
@@ -1,6 +1,7 @@
 from typing import Iterable, Optional
 
 from .db import get_connection
+from .versions import bump_child_versions
 
 
 def init_custom_vocab() -> None:
@@ -40,6 +41,7 @@ def save_custom_vocab(
         """,
             [(child_id, word, list_name) for word in cleaned],
         )
+        bump_child_versions(cursor, [child_id])
         conn.commit()
     return cleaned
 
@@ -61,17 +63,20 @@ def replace_custom_vocab(
             """,
                 [(child_id, word, list_name) for word in cleaned],
             )
+        bump_child_versions(cursor, [child_id])
         conn.commit()
     return cleaned
 
 
-def get_custom_vocab(child_id: int) -> list[str]:
+def get_custom_vocab(child_id: int, list_name: Optional[str] = None) -> list[str]:
+    query = "SELECT word FROM custom_vocab WHERE child_id = ?"
+    params: list = [child_id]
+    if list_name is not None:
+        query += " AND list_name = ?"
+        params.append(list_name)
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(
-            "SELECT word FROM custom_vocab WHERE child_id = ? ORDER BY word",
-            (child_id,),
-        )
+        cursor.execute(query + " ORDER BY word", params)
         return [row[0] for row in cursor.fetchall()]
 
 
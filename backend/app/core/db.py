@@ -2,6 +2,8 @@ import os
 import sqlite3
 from pathlib import Path
 
+from .metrics import span
+
 DATA_DIR = Path(__file__).resolve().parents[2] / "data"
 DEFAULT_DB_PATH = DATA_DIR / "progress.db"
 DB_PATH = Path(os.getenv("GOGOHANNAH_DB_PATH", str(DEFAULT_DB_PATH)))
@@ -15,10 +17,74 @@ def _ensure_parent(path: Path) -> bool:
         return False
 
 
-def get_connection() -> sqlite3.Connection:
+def _statement_span(sql: str) -> str:
+    verb = sql.lstrip().split(None, 1)[0].lower() if sql.strip() else "query"
+    return f"db.{verb}"
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that records each statement as a `db.<verb>` span."""
+
+    def execute(self, sql, parameters=()):
+        with span(_statement_span(sql)):
+            return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        with span(_statement_span(sql)):
+            return super().executemany(sql, seq_of_parameters)
+
+    def fetchall(self):
+        with span("db.fetch"):
+            return super().fetchall()
+
+
+class TimedConnection(sqlite3.Connection):
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def database_path() -> Path:
     db_path = DB_PATH
     if not _ensure_parent(db_path):
         db_path = DEFAULT_DB_PATH
         if not _ensure_parent(db_path):
             raise PermissionError("Unable to create database directory.")
-    return sqlite3.connect(str(db_path))
+    return db_path
+
+
+def wal_enabled() -> bool:
+    return os.getenv("GOGOHANNAH_SQLITE_WAL", "true").lower() in {"1", "true", "yes"}
+
+
+# Paths already switched to WAL by this process. The mode is stored in the
+# database file, so one successful switch per process is enough.
+_configured: set[str] = set()
+
+
+def set_journal_mode(conn: sqlite3.Connection) -> str:
+    """Put the database in WAL mode (unless disabled) and return the mode.
+
+    In WAL mode readers, including backups, never block writers and writers
+    never block readers.
+    """
+    mode = "wal" if wal_enabled() else "delete"
+    return conn.execute(f"PRAGMA journal_mode={mode}").fetchone()[0]
+
+
+def get_connection() -> sqlite3.Connection:
+    path = str(database_path())
+    conn = sqlite3.connect(path, factory=TimedConnection)
+    if path not in _configured:
+        try:
+            set_journal_mode(conn)
+            _configured.add(path)
+        except sqlite3.OperationalError:
+            # Another connection holds a lock; switch on a later connection.
+            pass
+    return conn
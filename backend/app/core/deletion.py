@@ -0,0 +1,464 @@
+"""Delete a child and every row that belongs to them.
+
+`request_child_deletion` tombstones the child in one short transaction. It
+removes the `children` row, so the name no longer resolves and can be
+reused, and it queues a `child_deletions` job. A background worker then
+purges each table in chunks of `GOGOHANNAH_DELETE_BATCH_SIZE` rows, one
+transaction per chunk, recording progress on the job row as it goes.
+Finally it compacts the database. Jobs survive restarts: a job left
+`running` by a dead worker is picked up again once it goes stale.
+
+Run from the repository root:
+    python -m backend.app.core.deletion status [CHILD_ID]
+    python -m backend.app.core.deletion run
+    python -m backend.app.core.deletion orphans
+    python -m backend.app.core.deletion compact
+"""
+
+import argparse
+import json
+import threading
+import time
+from typing import Optional
+
+from .config import env_int
+from .db import get_connection
+from .study_time import discard_pending_study_time, flush_study_time
+from .versions import bump_child_versions
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# A running job whose row has not moved for this long has lost its worker.
+_STALE_SECONDS = 300
+# Free pages returned per incremental_vacuum step.
+_VACUUM_STEP_PAGES = 256
+
+# (table, key, rows of the child). `rowid` keys delete by rowid. Other keys
+# are the primary-key columns after child_id of a WITHOUT ROWID table.
+# Embeddings go before the documents they point at.
+_PURGE_STEPS = (
+    ("embeddings", "rowid", "doc_id IN (SELECT id FROM documents WHERE child_id = ?)"),
+    ("documents", "rowid", "child_id = ?"),
+    ("custom_vocab", "rowid", "child_id = ?"),
+    ("word_schedule", "word", "child_id = ?"),
+    ("study_time", "rowid", "child_id = ?"),
+    ("study_time_rollups", "period, period_start", "child_id = ?"),
+    ("exercise_archive_totals", "exercise_type, word", "child_id = ?"),
+    ("exercise_archive_daily", "date", "child_id = ?"),
+    ("exercises_archive", "created_at, id", "child_id = ?"),
+    ("exercises", "rowid", "child_id = ?"),
+)
+# Tables scanned for rows whose child no longer exists.
+_CHILD_TABLES = tuple(table for table, _, where in _PURGE_STEPS if where == "child_id = ?")
+
+
+def delete_batch_size() -> int:
+    return max(1, env_int("GOGOHANNAH_DELETE_BATCH_SIZE", 500))
+
+
+def init_deletions() -> None:
+    with get_connection() as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS child_deletions (
+                child_id INTEGER PRIMARY KEY,
+                status TEXT NOT NULL,
+                current_table TEXT NULL,
+                rows_deleted INTEGER NOT NULL DEFAULT 0,
+                table_counts TEXT NOT NULL DEFAULT '{}',
+                free_pages INTEGER NULL,
+                error TEXT NULL,
+                requested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                finished_at TIMESTAMP NULL
+            )
+        """
+        )
+        conn.commit()
+
+
+def _queue(cursor, child_ids: list[int]) -> None:
+    """Queue jobs, restarting finished or failed ones and leaving active ones."""
+    cursor.executemany(
+        """
+        INSERT INTO child_deletions (child_id, status) VALUES (?, 'pending')
+        ON CONFLICT(child_id) DO UPDATE SET
+            status = 'pending',
+            current_table = NULL,
+            error = NULL,
+            requested_at = CURRENT_TIMESTAMP,
+            updated_at = CURRENT_TIMESTAMP,
+            finished_at = NULL
+        WHERE status IN ('done', 'failed')
+    """,
+        [(child_id,) for child_id in child_ids],
+    )
+
+
+def request_child_deletion(child_id: int, background: bool = True) -> dict:
+    """Tombstone a child now and queue the purge of their rows.
+
+    With `background` the worker thread is woken to run the job; otherwise
+    the caller runs it, e.g. with `run_deletion`.
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM children WHERE id = ?", (child_id,))
+        _queue(cursor, [child_id])
+        # Keep the version row: a reused id must not repeat an old ETag.
+        bump_child_versions(cursor, [child_id])
+        conn.commit()
+    # Buffered heartbeats would recreate rows the purge has already passed.
+    discard_pending_study_time(child_id)
+    if background:
+        _ensure_worker()
+    return get_deletion_status(child_id)
+
+
+def _status_row(row: tuple) -> dict:
+    return {
+        "child_id": row[0],
+        "status": row[1],
+        "current_table": row[2],
+        "rows_deleted": row[3],
+        "tables": json.loads(row[4]),
+        "free_pages": row[5],
+        "error": row[6],
+        "requested_at": row[7],
+        "updated_at": row[8],
+        "finished_at": row[9],
+    }
+
+
+_STATUS_COLUMNS = """
+    child_id, status, current_table, rows_deleted, table_counts, free_pages,
+    error, requested_at, updated_at, finished_at
+"""
+
+
+def get_deletion_status(child_id: int) -> Optional[dict]:
+    with get_connection() as conn:
+        row = conn.execute(
+            f"SELECT {_STATUS_COLUMNS} FROM child_deletions WHERE child_id = ?",
+            (child_id,),
+        ).fetchone()
+    return _status_row(row) if row else None
+
+
+def list_deletions(limit: int = 50) -> list[dict]:
+    """Most recently requested jobs first."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT {_STATUS_COLUMNS} FROM child_deletions
+            ORDER BY requested_at DESC, child_id DESC
+            LIMIT ?
+        """,
+            (limit,),
+        ).fetchall()
+    return [_status_row(row) for row in rows]
+
+
+def _existing_tables(conn) -> set[str]:
+    return {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+
+
+def _chunk_sql(table: str, key: str, where: str) -> tuple[str, int]:
+    """DELETE for one chunk, and how many times it binds the child id."""
+    if key == "rowid":
+        return (
+            f"DELETE FROM {table} WHERE rowid IN "
+            f"(SELECT rowid FROM {table} WHERE {where} LIMIT ?)",
+            1,
+        )
+    # The leading child_id keeps each delete a primary-key search rather
+    # than a scan of all the child's rows.
+    return (
+        f"DELETE FROM {table} WHERE child_id = ? AND ({key}) IN "
+        f"(SELECT {key} FROM {table} WHERE {where} LIMIT ?)",
+        2,
+    )
+
+
+def _set_status(conn, child_id: int, status: str, **fields) -> None:
+    fields["status"] = status
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    conn.execute(
+        f"""
+        UPDATE child_deletions SET {assignments}, updated_at = CURRENT_TIMESTAMP
+        WHERE child_id = ?
+    """,
+        (*fields.values(), child_id),
+    )
+    conn.commit()
+
+
+def run_deletion(
+    child_id: int,
+    batch_size: Optional[int] = None,
+    pause_seconds: float = 0.05,
+    stop: Optional[threading.Event] = None,
+) -> dict:
+    """Purge a tombstoned child's rows, then compact.
+
+    Each chunk deletes at most `batch_size` rows and updates the job row in
+    the same transaction, so progress is exact and a restarted job resumes
+    where it stopped. `pause_seconds` between chunks lets queued writers take
+    the lock. Setting `stop` returns the job to `pending` after the current
+    chunk.
+    """
+    size = batch_size or delete_batch_size()
+    # Anything still buffered for this child would land after the purge.
+    flush_study_time()
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT table_counts FROM child_deletions WHERE child_id = ?", (child_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"No deletion requested for child {child_id}.")
+        counts = json.loads(row[0])
+        _set_status(conn, child_id, STATUS_RUNNING, error=None)
+        tables = _existing_tables(conn)
+        try:
+            for table, key, where in _PURGE_STEPS:
+                if table not in tables or (table == "embeddings" and "documents" not in tables):
+                    continue
+                sql, binds = _chunk_sql(table, key, where)
+                while True:
+                    if stop is not None and stop.is_set():
+                        _set_status(conn, child_id, STATUS_PENDING)
+                        return get_deletion_status(child_id)
+                    cursor = conn.cursor()
+                    cursor.execute("BEGIN IMMEDIATE")
+                    deleted = cursor.execute(sql, (child_id,) * binds + (size,)).rowcount
+                    counts[table] = counts.get(table, 0) + deleted
+                    cursor.execute(
+                        """
+                        UPDATE child_deletions
+                        SET current_table = ?, rows_deleted = rows_deleted + ?,
+                            table_counts = ?, updated_at = CURRENT_TIMESTAMP
+                        WHERE child_id = ?
+                    """,
+                        (table, deleted, json.dumps(counts), child_id),
+                    )
+                    conn.commit()
+                    if deleted < size:
+                        break
+                    if pause_seconds:
+                        time.sleep(pause_seconds)
+            free_pages = _compact(conn, pause_seconds)
+        except Exception as exc:
+            conn.rollback()
+            _set_status(conn, child_id, STATUS_FAILED, error=str(exc) or type(exc).__name__)
+            raise
+        _set_status(
+            conn,
+            child_id,
+            STATUS_DONE,
+            current_table=None,
+            free_pages=free_pages,
+            finished_at=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+        )
+    finally:
+        conn.close()
+    return get_deletion_status(child_id)
+
+
+def _compact(conn, pause_seconds: float) -> int:
+    """Refresh planner stats, return free pages if possible; report those left.
+
+    SQLite only gives pages back to the file system in incremental
+    auto-vacuum mode (see `compact_database`). Otherwise the freed pages stay
+    on the free list and later inserts reuse them.
+    """
+    conn.execute("PRAGMA optimize")
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        while conn.execute("PRAGMA freelist_count").fetchone()[0] > 0:
+            conn.execute(f"PRAGMA incremental_vacuum({_VACUUM_STEP_PAGES})").fetchall()
+            conn.commit()
+            if pause_seconds:
+                time.sleep(pause_seconds)
+    return conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+def compact_database() -> dict:
+    """Rebuild the database file and switch it to incremental auto-vacuum.
+
+    VACUUM rewrites every table and index and blocks writers while it runs,
+    so use it in a quiet period. Afterwards each deletion job returns its
+    freed pages in small steps on its own.
+    """
+    conn = get_connection()
+    try:
+        before = conn.execute("PRAGMA page_count").fetchone()[0]
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        after = conn.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        conn.close()
+    return {"pages_before": before, "pages_after": after}
+
+
+def queue_orphan_deletions(background: bool = True) -> list[int]:
+    """Queue jobs for child ids that still own rows but have no `children` row.
+
+    Catches rows left by earlier clears, which only removed exercises, and
+    writes that raced a deletion.
+    """
+    with get_connection() as conn:
+        tables = _existing_tables(conn)
+        if "children" not in tables:
+            return []
+        selects = [
+            f"SELECT DISTINCT child_id FROM {table} WHERE child_id IS NOT NULL"
+            for table in _CHILD_TABLES
+            if table in tables
+        ]
+        if not selects:
+            return []
+        orphans = [
+            row[0]
+            for row in conn.execute(
+                f"""
+                SELECT child_id FROM ({' UNION '.join(selects)})
+                WHERE child_id NOT IN (SELECT id FROM children)
+                ORDER BY child_id
+            """
+            )
+        ]
+        cursor = conn.cursor()
+        _queue(cursor, orphans)
+        conn.commit()
+    if orphans and background:
+        _ensure_worker()
+    return orphans
+
+
+def _claim_next() -> Optional[int]:
+    """Mark the oldest pending (or stale running) job as running and return it."""
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        row = cursor.execute(
+            """
+            SELECT child_id FROM child_deletions
+            WHERE status = 'pending'
+               OR (status = 'running' AND updated_at < datetime('now', ?))
+            ORDER BY requested_at, child_id
+            LIMIT 1
+        """,
+            (f"-{_STALE_SECONDS} seconds",),
+        ).fetchone()
+        if row is None:
+            conn.rollback()
+            return None
+        cursor.execute(
+            """
+            UPDATE child_deletions SET status = 'running', updated_at = CURRENT_TIMESTAMP
+            WHERE child_id = ?
+        """,
+            (row[0],),
+        )
+        conn.commit()
+        return row[0]
+    finally:
+        conn.close()
+
+
+def run_pending_deletions(stop: Optional[threading.Event] = None) -> list[dict]:
+    """Run queued jobs until none are left (or `stop` is set)."""
+    results = []
+    while stop is None or not stop.is_set():
+        child_id = _claim_next()
+        if child_id is None:
+            break
+        try:
+            results.append(run_deletion(child_id, stop=stop))
+        except Exception:
+            # Recorded as failed on the job row; carry on with the others.
+            results.append(get_deletion_status(child_id))
+    return results
+
+
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+_worker_wake = threading.Event()
+_worker_stop = threading.Event()
+
+
+def _worker_loop() -> None:
+    while not _worker_stop.is_set():
+        _worker_wake.clear()
+        try:
+            run_pending_deletions(stop=_worker_stop)
+        except Exception:
+            # The database may be busy; try again on the next wake-up.
+            pass
+        # Also polls for jobs queued by other processes and stale ones.
+        _worker_wake.wait(_STALE_SECONDS / 5)
+
+
+def _ensure_worker() -> None:
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker_stop.clear()
+            _worker = threading.Thread(
+                target=_worker_loop, name="child-deletion", daemon=True
+            )
+            _worker.start()
+    _worker_wake.set()
+
+
+def start_deletion_worker() -> None:
+    """Start the worker, which resumes jobs left over from a previous run."""
+    _ensure_worker()
+
+
+def stop_deletion_worker() -> None:
+    """Stop after the current chunk; unfinished jobs stay queued."""
+    _worker_stop.set()
+    _worker_wake.set()
+    if _worker is not None:
+        _worker.join(timeout=5)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Purge deleted children's data.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    status = commands.add_parser("status")
+    status.add_argument("child_id", type=int, nargs="?")
+    commands.add_parser("run", help="run queued jobs in the foreground")
+    commands.add_parser("orphans", help="queue jobs for rows without a child, then run them")
+    commands.add_parser("compact", help="VACUUM into incremental auto-vacuum mode")
+    args = parser.parse_args()
+
+    # Importing progress creates the tables on a fresh database.
+    from . import progress  # noqa: F401
+
+    if args.command == "status":
+        result = (
+            list_deletions() if args.child_id is None else get_deletion_status(args.child_id)
+        )
+    elif args.command == "run":
+        result = run_pending_deletions()
+    elif args.command == "orphans":
+        queued = queue_orphan_deletions(background=False)
+        result = {"queued": queued, "jobs": run_pending_deletions()}
+    else:
+        result = compact_database()
+    print(json.dumps(result, indent=2))
+
+
+init_deletions()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""In-process latency histograms, request spans and Prometheus text export."""
+
+import contextvars
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Upper bounds in seconds, from sub-millisecond SQLite queries to slow LLM calls.
+BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def metrics_enabled() -> bool:
+    return os.getenv("GOGOHANNAH_METRICS_ENABLED", "true").lower() in {
+        "1",
+        "true",
+        "yes",
+    }
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram keyed by label values."""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts (non-cumulative), then sum and count.
+                series = [[0] * len(BUCKETS), 0.0, 0]
+                self._series[labels] = series
+            for index, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += seconds
+            series[2] += 1
+
+    def snapshot(self) -> dict[tuple[str, ...], tuple[list[int], float, int]]:
+        with self._lock:
+            return {
+                labels: (list(series[0]), series[1], series[2])
+                for labels, series in self._series.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (buckets, total, count) in sorted(self.snapshot().items()):
+            base = ",".join(
+                f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels)
+            )
+            prefix = base + "," if base else ""
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS, buckets):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+            suffix = f"{{{base}}}" if base else ""
+            lines.append(f"{self.name}_sum{suffix} {total:.6f}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_SECONDS = Histogram(
+    "gogohannah_http_request_duration_seconds",
+    "HTTP request latency by route and status.",
+    ("method", "route", "status"),
+)
+SPAN_SECONDS = Histogram(
+    "gogohannah_span_duration_seconds",
+    "Latency of instrumented stages (db, llm, rag, repair).",
+    ("span",),
+)
+
+# Spans finished during the current request, for the Server-Timing header.
+# Worker threads started by Starlette and asyncio.to_thread inherit the
+# context, so they append to the same list.
+_request_spans: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar(
+    "request_spans", default=None
+)
+
+
+def start_request() -> contextvars.Token:
+    return _request_spans.set([])
+
+
+def finish_request(token: contextvars.Token) -> list[tuple[str, float]]:
+    spans = _request_spans.get() or []
+    _request_spans.reset(token)
+    return spans
+
+
+def record_span(name: str, seconds: float) -> None:
+    SPAN_SECONDS.observe(seconds, name)
+    spans = _request_spans.get()
+    if spans is not None:
+        spans.append((name, seconds))
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - started)
+
+
+def timed(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator recording each call of a function as span `name`."""
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def server_timing_header(spans: list[tuple[str, float]], total: float) -> str:
+    """Aggregate spans by name into a `Server-Timing` header value."""
+    totals: dict[str, list] = {}
+    for name, seconds in spans:
+        entry = totals.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    parts = [f"total;dur={total * 1000:.1f}"]
+    for name, (seconds, count) in totals.items():
+        metric = name.replace(".", "-")
+        description = f';desc="x{count}"' if count > 1 else ""
+        parts.append(f"{metric};dur={seconds * 1000:.1f}{description}")
+    return ", ".join(parts)
+
+
+def render_metrics() -> str:
+    lines = REQUEST_SECONDS.render() + SPAN_SECONDS.render()
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    REQUEST_SECONDS.clear()
+    SPAN_SECONDS.clear()
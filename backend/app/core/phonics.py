@@ -43,10 +43,11 @@ def phonics_hint(word: str) -> str:
     tokens = cleaned.split()
     if not tokens:
         return ""
-    return " / ".join("-".join(_split_token(token)) for token in tokens)
+    return " / ".join("-".join(split_graphemes(token)) for token in tokens)
 
 
-def _split_token(token: str) -> list[str]:
+def split_graphemes(token: str) -> list[str]:
+    """Split one lowercase token into phonics chunks (e.g. "night" -> n-igh-t)."""
     parts: list[str] = []
     i = 0
     while i < len(token):
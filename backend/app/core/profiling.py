@@ -0,0 +1,240 @@
+"""On-demand sampling profiler and tracemalloc snapshots for live workers.
+
+Both tools are per process: with several workers, each request reaches one
+of them, so profile the worker that serves the traffic you care about (or
+run a single worker while investigating).
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Optional
+
+MAX_SECONDS = 300.0
+MAX_REQUESTS = 10_000
+# Leaf frames in these files mean the thread is parked, not working.
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py", "thread.py")
+# Profiler and tracemalloc calls do not count toward a request budget.
+_UNCOUNTED_PREFIX = "/v1/debug/"
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval.
+
+    Stacks are stored in collapsed form (`root;...;leaf` -> count), which
+    flamegraph.pl, speedscope and inferno read directly. Profiling stops
+    after `seconds`, after `requests` finished requests, or when stopped.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._idle_samples = 0
+        self._interval = 0.005
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._deadline: Optional[float] = None
+        self._requests_left: Optional[int] = None
+        self._requests_seen = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(
+        self,
+        seconds: Optional[float] = None,
+        requests: Optional[int] = None,
+        interval_ms: float = 5.0,
+    ) -> dict:
+        if seconds is None and requests is None:
+            raise ValueError("Set seconds or requests.")
+        with self._lock:
+            if self.running:
+                raise ValueError("Profiler is already running.")
+            self._stacks = Counter()
+            self._samples = 0
+            self._idle_samples = 0
+            self._interval = max(0.001, interval_ms / 1000)
+            self._started_at = time.monotonic()
+            self._finished_at = None
+            # A hard cap keeps a forgotten request-count profile from running forever.
+            window = min(seconds if seconds is not None else MAX_SECONDS, MAX_SECONDS)
+            self._deadline = self._started_at + window
+            self._requests_left = min(requests, MAX_REQUESTS) if requests else None
+            self._requests_seen = 0
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="debug-profiler", daemon=True
+            )
+            self._thread.start()
+        return self.status()
+
+    def stop(self) -> dict:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2)
+        return self.status()
+
+    def request_finished(self, path: str = "") -> None:
+        if not self.running or path.startswith(_UNCOUNTED_PREFIX):
+            return
+        with self._lock:
+            self._requests_seen += 1
+            if self._requests_left is not None:
+                self._requests_left -= 1
+                if self._requests_left <= 0:
+                    self._stop.set()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.is_set() and time.monotonic() < self._deadline:
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            stacks = []
+            idle = 0
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+                    idle += 1
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(thread_id, f"thread-{thread_id}"))
+                stacks.append(";".join(reversed(labels)))
+            # Walk frames unlocked; readers only wait for the counter update.
+            with self._lock:
+                self._stacks.update(stacks)
+                self._samples += len(stacks)
+                self._idle_samples += idle
+            self._stop.wait(self._interval)
+        with self._lock:
+            self._finished_at = time.monotonic()
+
+    def status(self) -> dict:
+        with self._lock:
+            end = self._finished_at or time.monotonic()
+            return {
+                "running": self.running,
+                "interval_ms": self._interval * 1000,
+                "elapsed_seconds": round(end - self._started_at, 3)
+                if self._started_at
+                else 0.0,
+                "requests_seen": self._requests_seen,
+                "requests_left": self._requests_left,
+                "samples": self._samples,
+                "idle_samples": self._idle_samples,
+                "distinct_stacks": len(self._stacks),
+            }
+
+    def collapsed(self) -> str:
+        """Folded stacks, one `frames count` line each, heaviest first."""
+        with self._lock:
+            stacks = self._stacks.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def top_functions(self, limit: int = 20) -> list[dict]:
+        """Functions by self samples (leaf frames) and total samples."""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        with self._lock:
+            stacks = list(self._stacks.items())
+        for stack, count in stacks:
+            frames = stack.split(";")[1:]
+            if not frames:
+                continue
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        return [
+            {"function": name, "self_samples": own[name], "total_samples": total[name]}
+            for name, _ in own.most_common(limit)
+        ]
+
+
+profiler = SamplingProfiler()
+
+_last_snapshot: Optional[tracemalloc.Snapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def start_tracemalloc(frames: int = 10) -> dict:
+    global _last_snapshot
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(max(1, min(frames, 50)))
+    with _snapshot_lock:
+        _last_snapshot = None
+    return tracemalloc_status()
+
+
+def stop_tracemalloc() -> dict:
+    global _last_snapshot
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    with _snapshot_lock:
+        _last_snapshot = None
+    return tracemalloc_status()
+
+
+def tracemalloc_status() -> dict:
+    tracing = tracemalloc.is_tracing()
+    current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+    return {
+        "tracing": tracing,
+        "frames": tracemalloc.get_traceback_limit() if tracing else 0,
+        "traced_bytes": current,
+        "peak_bytes": peak,
+    }
+
+
+def _site(traceback: tracemalloc.Traceback) -> str:
+    frame = traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def take_snapshot(limit: int = 20) -> dict:
+    """Top allocation sites, plus growth since the previous snapshot."""
+    global _last_snapshot
+    if not tracemalloc.is_tracing():
+        raise ValueError("tracemalloc is not running.")
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )
+    )
+    top = [
+        {"site": _site(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+    with _snapshot_lock:
+        previous = _last_snapshot
+        _last_snapshot = snapshot
+    growth = []
+    if previous is not None:
+        growth = [
+            {
+                "site": _site(stat.traceback),
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+            }
+            for stat in snapshot.compare_to(previous, "lineno")[:limit]
+            if stat.size_diff
+        ]
+    return {**tracemalloc_status(), "top": top, "growth_since_last": growth}
@@ -1,7 +1,13 @@
+import base64
+import json
 from datetime import date, timedelta
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from .archive import LOW_SCORE
 from .db import get_connection
+from .deletion import request_child_deletion, run_deletion
+from .scheduler import rebuild_schedule, record_review
+from .versions import bump_child_versions
 
 
 def init_db() -> None:
@@ -31,6 +37,21 @@ def init_db() -> None:
         )
     """
         )
+        # Serves per-child history pages and exports as index range scans.
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_exercises_child_created
+            ON exercises (child_id, created_at, id)
+        """
+        )
+        # Lets archival find the oldest rows without scanning the table.
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_exercises_created ON exercises (created_at)"
+        )
+        cursor.execute("SELECT 1 FROM word_schedule LIMIT 1")
+        if cursor.fetchone() is None:
+            rebuild_schedule(cursor)
+        conn.commit()
 
 
 def get_or_create_child(name: str) -> int:
@@ -61,50 +82,92 @@ def save_exercise(child_id: int, word: str, exercise_type: str, score: int, corr
         """,
             (child_id, word, exercise_type, score, correct),
         )
+        record_review(cursor, child_id, word, score, correct)
+        bump_child_versions(cursor, [child_id])
         conn.commit()
 
 
 def get_child_progress(child_id: int) -> Dict:
     """Get progress summary for a child."""
     with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM exercises WHERE child_id = ?", (child_id,))
-        total_exercises = cursor.fetchone()[0]
+        stats = _word_stats(conn.cursor(), [child_id])
+    return _summary_from_word_stats(stats.get(child_id, []))
 
-        cursor.execute(
-            "SELECT COUNT(*) FROM exercises WHERE child_id = ? AND correct = 1",
-            (child_id,),
-        )
-        correct_count = cursor.fetchone()[0]
 
-        cursor.execute(
-            """
-            SELECT exercise_type, AVG(score), COUNT(*)
-            FROM exercises
-            WHERE child_id = ?
-            GROUP BY exercise_type
-        """,
-            (child_id,),
-        )
-        scores_by_type = {
-            row[0]: {"avg_score": row[1], "count": row[2]} for row in cursor.fetchall()
-        }
+def _word_stats(cursor, child_ids: List[int]) -> Dict[int, List[tuple]]:
+    """Per (exercise type, word) counts and score sums, hot and archived.
 
-        cursor.execute(
-            """
-            SELECT word, AVG(score), COUNT(*)
+    One grouped scan of the hot rows plus a primary-key range read of the
+    archive rollup. Rows are `(exercise_type, word, attempts, correct_count,
+    score_sum, low_attempts, low_score_sum)`, ordered by type then word.
+    """
+    placeholders = ",".join("?" for _ in child_ids)
+    cursor.execute(
+        f"""
+        SELECT child_id, exercise_type, word, SUM(attempts), SUM(correct_count),
+               SUM(score_sum), SUM(low_attempts), SUM(low_score_sum)
+        FROM (
+            SELECT child_id, exercise_type, word,
+                   COUNT(*) AS attempts,
+                   SUM(correct = 1) AS correct_count,
+                   SUM(score) AS score_sum,
+                   SUM(score < {LOW_SCORE}) AS low_attempts,
+                   SUM(CASE WHEN score < {LOW_SCORE} THEN score ELSE 0 END) AS low_score_sum
             FROM exercises
-            WHERE child_id = ? AND score < 70
-            GROUP BY word
-            ORDER BY AVG(score) ASC
-        """,
-            (child_id,),
+            WHERE child_id IN ({placeholders})
+            GROUP BY child_id, exercise_type, word
+            UNION ALL
+            SELECT child_id, exercise_type, word, attempts, correct_count,
+                   score_sum, low_attempts, low_score_sum
+            FROM exercise_archive_totals
+            WHERE child_id IN ({placeholders})
         )
-        weak_words = [
-            {"word": row[0], "avg_score": row[1], "attempts": row[2]}
-            for row in cursor.fetchall()
-        ]
-
+        GROUP BY child_id, exercise_type, word
+        ORDER BY child_id, exercise_type, word
+    """,
+        list(child_ids) * 2,
+    )
+    stats: Dict[int, List[tuple]] = {}
+    for row in cursor.fetchall():
+        stats.setdefault(row[0], []).append(row[1:])
+    return stats
+
+
+def _summary_from_word_stats(rows: List[tuple]) -> Dict:
+    total_exercises = 0
+    correct_count = 0
+    by_type: Dict[str, List[int]] = {}
+    low_by_word: Dict[str, List[int]] = {}
+    for exercise_type, word, attempts, correct, score_sum, low_attempts, low_sum in rows:
+        total_exercises += attempts
+        correct_count += correct
+        type_entry = by_type.setdefault(exercise_type, [0, 0])
+        type_entry[0] += score_sum
+        type_entry[1] += attempts
+        if low_attempts:
+            word_entry = low_by_word.setdefault(word, [0, 0])
+            word_entry[0] += low_sum
+            word_entry[1] += low_attempts
+    scores_by_type = {
+        exercise_type: {"avg_score": score_sum / count, "count": count}
+        for exercise_type, (score_sum, count) in by_type.items()
+    }
+    weak_words = sorted(
+        (
+            {"word": word, "avg_score": low_sum / attempts, "attempts": attempts}
+            for word, (low_sum, attempts) in low_by_word.items()
+        ),
+        key=lambda entry: (entry["avg_score"], entry["word"]),
+    )
+    return _progress_summary(total_exercises, correct_count, scores_by_type, weak_words)
+
+
+def _progress_summary(
+    total_exercises: int,
+    correct_count: int,
+    scores_by_type: Dict,
+    weak_words: List[Dict],
+) -> Dict:
     return {
         "total_exercises": total_exercises,
         "correct_count": correct_count,
@@ -114,77 +177,130 @@ def get_child_progress(child_id: int) -> Dict:
     }
 
 
-def get_recommended_words(child_id: int, all_words: List[str], limit: int = 10) -> List[str]:
-    """Get recommended words with smart prioritization."""
+def get_recent_exercises(child_id: int, limit: int = 20) -> List[Dict]:
+    """Get recent exercise history for a child."""
     with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT word, AVG(score), COUNT(*), MIN(score)
-            FROM exercises
-            WHERE child_id = ?
-            GROUP BY word
-        """,
-            (child_id,),
-        )
+        rows = _history_rows(conn, child_id, None, True, limit)
+    return [
+        {key: value for key, value in _history_row(row).items() if key != "id"}
+        for row in rows
+    ]
 
-        word_stats = {}
-        for row in cursor.fetchall():
-            word_stats[row[0]] = {
-                "avg_score": row[1],
-                "attempts": row[2],
-                "min_score": row[3],
-            }
 
-    weak_words = []
-    over_practiced = []
-    practiced_words = set(word_stats.keys())
+HISTORY_PAGE_MAX = 200
+EXPORT_BATCH_SIZE = 500
 
-    for word, stats in word_stats.items():
-        if stats["attempts"] >= 5:
-            over_practiced.append(word)
-        elif stats["avg_score"] < 70 and stats["attempts"] < 3:
-            weak_words.append((word, stats["avg_score"]))
+_HISTORY_COLUMNS = "id, word, exercise_type, score, correct, created_at"
 
-    weak_words.sort(key=lambda x: x[1])
-    weak_words = [word for word, _ in weak_words]
 
-    new_words = [word for word in all_words if word not in practiced_words]
+def _history_row(row) -> Dict:
+    return {
+        "id": row[0],
+        "word": row[1],
+        "exercise_type": row[2],
+        "score": row[3],
+        "correct": bool(row[4]),
+        "created_at": row[5],
+    }
 
-    recommended = []
-    recommended.extend(weak_words)
-    recommended.extend(new_words)
 
-    recommended = [word for word in recommended if word not in over_practiced]
+def encode_history_cursor(created_at: str, exercise_id: int) -> str:
+    raw = json.dumps([created_at, exercise_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
-    return recommended[:limit]
 
+def decode_history_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, exercise_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(created_at, str) or not isinstance(exercise_id, int):
+            raise TypeError
+    except (ValueError, TypeError):
+        raise ValueError("Invalid history cursor.")
+    return created_at, exercise_id
 
-def get_recent_exercises(child_id: int, limit: int = 20) -> List[Dict]:
-    """Get recent exercise history for a child."""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT word, exercise_type, score, correct, created_at
-            FROM exercises
-            WHERE child_id = ?
-            ORDER BY created_at DESC
-            LIMIT ?
-        """,
-            (child_id, limit),
-        )
 
-        return [
-            {
-                "word": row[0],
-                "exercise_type": row[1],
-                "score": row[2],
-                "correct": bool(row[3]),
-                "created_at": row[4],
-            }
-            for row in cursor.fetchall()
-        ]
+def _has_archive(conn, child_id: int) -> bool:
+    return (
+        conn.execute(
+            "SELECT 1 FROM exercise_archive_totals WHERE child_id = ? LIMIT 1",
+            (child_id,),
+        ).fetchone()
+        is not None
+    )
+
+
+def _history_rows(
+    conn,
+    child_id: int,
+    after: Optional[Tuple[str, int]],
+    descending: bool,
+    limit: int,
+) -> List[tuple]:
+    """Up to `limit` rows past the `(created_at, id)` keyset `after`.
+
+    Archived rows are merged in only for children that have some.
+    """
+    order = "DESC" if descending else "ASC"
+    where = "child_id = ?"
+    params: list = [child_id]
+    if after is not None:
+        where += f" AND (created_at, id) {'<' if descending else '>'} (?, ?)"
+        params.extend(after)
+    select = (
+        f"SELECT {_HISTORY_COLUMNS} FROM {{table}} WHERE {where} "
+        f"ORDER BY created_at {order}, id {order} LIMIT ?"
+    )
+    hot = select.format(table="exercises")
+    if not _has_archive(conn, child_id):
+        return conn.execute(hot, params + [limit]).fetchall()
+    archived = select.format(table="exercises_archive")
+    return conn.execute(
+        f"SELECT * FROM ({hot}) UNION ALL SELECT * FROM ({archived}) "
+        f"ORDER BY created_at {order}, id {order} LIMIT ?",
+        params + [limit] + params + [limit, limit],
+    ).fetchall()
+
+
+def get_exercise_history(
+    child_id: int, limit: int = 50, cursor: Optional[str] = None
+) -> Tuple[List[Dict], Optional[str]]:
+    """One page of exercises, newest first, and the cursor for the next page.
+
+    Pages are keyed on (created_at, id) rather than OFFSET, so every page
+    is an index range scan however deep the client has paged.
+    """
+    limit = max(1, min(limit, HISTORY_PAGE_MAX))
+    after = decode_history_cursor(cursor) if cursor else None
+    with get_connection() as conn:
+        # One extra row tells us whether another page exists.
+        rows = _history_rows(conn, child_id, after, True, limit + 1)
+    page = [_history_row(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = encode_history_cursor(last["created_at"], last["id"])
+    return page, next_cursor
+
+
+def iter_exercise_history(
+    child_id: int, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[Dict]:
+    """Yield every exercise for a child, oldest first, in constant memory.
+
+    Each batch is a fresh keyset query on its own short-lived connection, so
+    a slow client never pins a read transaction (or a connection bound to
+    one worker thread) for the length of the export.
+    """
+    last: Optional[Tuple[str, int]] = None
+    while True:
+        with get_connection() as conn:
+            rows = _history_rows(conn, child_id, last, False, batch_size)
+        for row in rows:
+            yield _history_row(row)
+        if len(rows) < batch_size:
+            return
+        last = (rows[-1][5], rows[-1][0])
 
 
 def get_daily_progress(child_id: int, daily_goal: int = 3, days: int = 30) -> Dict:
@@ -197,20 +313,50 @@ def get_daily_progress(child_id: int, daily_goal: int = 3, days: int = 30) -> Di
     end_str = today.isoformat()
 
     with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT SUBSTR(created_at, 1, 10) AS practice_date, COUNT(*)
+        counts = _daily_counts(conn.cursor(), [child_id], start_str, end_str)
+
+    return _daily_summary(
+        counts.get(child_id, {}), clamped_goal, start_date, clamped_days, today
+    )
+
+
+def _daily_counts(
+    cursor, child_ids: List[int], start_str: str, end_str: str
+) -> Dict[int, Dict[str, int]]:
+    """Exercises per child and day in [start, end], hot and archived."""
+    placeholders = ",".join("?" for _ in child_ids)
+    cursor.execute(
+        f"""
+        SELECT child_id, practice_date, SUM(completed)
+        FROM (
+            SELECT child_id, SUBSTR(created_at, 1, 10) AS practice_date, COUNT(*) AS completed
             FROM exercises
-            WHERE child_id = ?
+            WHERE child_id IN ({placeholders})
               AND SUBSTR(created_at, 1, 10) >= ?
               AND SUBSTR(created_at, 1, 10) <= ?
-            GROUP BY practice_date
-        """,
-            (child_id, start_str, end_str),
+            GROUP BY child_id, practice_date
+            UNION ALL
+            SELECT child_id, date, completed
+            FROM exercise_archive_daily
+            WHERE child_id IN ({placeholders}) AND date >= ? AND date <= ?
         )
-        count_by_date = {row[0]: int(row[1]) for row in cursor.fetchall()}
-
+        GROUP BY child_id, practice_date
+    """,
+        [*child_ids, start_str, end_str, *child_ids, start_str, end_str],
+    )
+    counts: Dict[int, Dict[str, int]] = {}
+    for child_id, practice_date, completed in cursor.fetchall():
+        counts.setdefault(child_id, {})[practice_date] = int(completed)
+    return counts
+
+
+def _daily_summary(
+    count_by_date: Dict[str, int],
+    clamped_goal: int,
+    start_date: date,
+    clamped_days: int,
+    today: date,
+) -> Dict:
     history = []
     best_streak = 0
     running_streak = 0
@@ -253,13 +399,75 @@ def get_daily_progress(child_id: int, daily_goal: int = 3, days: int = 30) -> Di
     }
 
 
-def clear_child_records(child_id: int) -> None:
-    """Clear all exercise records for a child."""
+def get_children_by_names(names: List[str]) -> Dict[str, int]:
+    """Look up existing children by name without creating missing ones."""
+    if not names:
+        return {}
+    placeholders = ",".join("?" for _ in names)
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM exercises WHERE child_id = ?", (child_id,))
-        cursor.execute("DELETE FROM children WHERE id = ?", (child_id,))
-        conn.commit()
+        cursor.execute(
+            f"SELECT name, id FROM children WHERE name IN ({placeholders})",
+            list(names),
+        )
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def get_bulk_progress(
+    child_ids: List[int],
+    daily_goal: int = 3,
+    days: int = 30,
+) -> Dict[int, Dict]:
+    """Progress summary and daily streaks for many children at once.
+
+    Runs one GROUP BY child_id query per aggregate on a single connection,
+    instead of the per-child queries of get_child_progress and
+    get_daily_progress. Returns the same shapes, keyed by child id.
+    """
+    clamped_goal = max(1, min(daily_goal, 50))
+    clamped_days = max(1, min(days, 365))
+    today = date.today()
+    start_date = today - timedelta(days=clamped_days - 1)
+    ids = list(dict.fromkeys(child_ids))
+    stats: Dict[int, List[tuple]] = {}
+    counts: Dict[int, Dict[str, int]] = {}
+    if ids:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            stats = _word_stats(cursor, ids)
+            counts = _daily_counts(cursor, ids, start_date.isoformat(), today.isoformat())
+
+    return {
+        child_id: {
+            "summary": _summary_from_word_stats(stats.get(child_id, [])),
+            "daily": _daily_summary(
+                counts.get(child_id, {}), clamped_goal, start_date, clamped_days, today
+            ),
+        }
+        for child_id in ids
+    }
+
+
+def empty_progress(daily_goal: int = 3, days: int = 30) -> Dict:
+    """The get_bulk_progress entry for a child with no exercises."""
+    clamped_goal = max(1, min(daily_goal, 50))
+    clamped_days = max(1, min(days, 365))
+    today = date.today()
+    start_date = today - timedelta(days=clamped_days - 1)
+    return {
+        "summary": _progress_summary(0, 0, {}, []),
+        "daily": _daily_summary({}, clamped_goal, start_date, clamped_days, today),
+    }
+
+
+def clear_child_records(child_id: int) -> None:
+    """Delete a child and all of their data before returning.
+
+    Runs the same chunked purge as the background job in `deletion`, in the
+    caller's thread.
+    """
+    request_child_deletion(child_id, background=False)
+    run_deletion(child_id)
 
 
 init_db()
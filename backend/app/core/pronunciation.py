@@ -0,0 +1,242 @@
+import re
+from functools import lru_cache
+from itertools import product
+from typing import Optional
+
+from .phonics import split_graphemes
+from ..vocab.loader import load_default_vocab, load_pronunciations
+
+Phonemes = tuple[str, ...]
+
+# Grapheme -> ARPAbet fallback, keyed by the chunks `split_graphemes` emits.
+_GRAPHEME_PHONEMES: dict[str, Phonemes] = {
+    "eigh": ("EY",),
+    "igh": ("AY",),
+    "tion": ("SH", "AH", "N"),
+    "sion": ("ZH", "AH", "N"),
+    "tch": ("CH",),
+    "ch": ("CH",),
+    "sh": ("SH",),
+    "th": ("TH",),
+    "ph": ("F",),
+    "wh": ("W",),
+    "ck": ("K",),
+    "ng": ("NG",),
+    "qu": ("K", "W"),
+    "ee": ("IY",),
+    "oo": ("UW",),
+    "ai": ("EY",),
+    "ay": ("EY",),
+    "ea": ("IY",),
+    "ie": ("AY",),
+    "oa": ("OW",),
+    "ou": ("AW",),
+    "ow": ("OW",),
+    "ar": ("AA", "R"),
+    "er": ("ER",),
+    "ir": ("ER",),
+    "or": ("AO", "R"),
+    "ur": ("ER",),
+    "oi": ("OY",),
+    "oy": ("OY",),
+    "au": ("AO",),
+    "aw": ("AO",),
+    "a": ("AE",),
+    "b": ("B",),
+    "c": ("K",),
+    "d": ("D",),
+    "e": ("EH",),
+    "f": ("F",),
+    "g": ("G",),
+    "h": ("HH",),
+    "i": ("IH",),
+    "j": ("JH",),
+    "k": ("K",),
+    "l": ("L",),
+    "m": ("M",),
+    "n": ("N",),
+    "o": ("AA",),
+    "p": ("P",),
+    "q": ("K",),
+    "r": ("R",),
+    "s": ("S",),
+    "t": ("T",),
+    "u": ("AH",),
+    "v": ("V",),
+    "w": ("W",),
+    "x": ("K", "S"),
+    "y": ("Y",),
+    "z": ("Z",),
+}
+_LONG_VOWELS: dict[str, Phonemes] = {
+    "a": ("EY",),
+    "e": ("IY",),
+    "i": ("AY",),
+    "o": ("OW",),
+    "u": ("UW",),
+}
+_VOWEL_LETTERS = frozenset("aeiou")
+_SILENT_PREFIXES = {"kn": "n", "wr": "r", "gn": "n"}
+
+_VOWELS = frozenset("AA AE AH AO AW AY EH ER EY IH IY OW OY UH UW".split())
+# Phoneme pairs children (and transcription) commonly confuse cost less to swap.
+_CLOSE_PAIRS = {
+    frozenset(pair)
+    for pair in (
+        ("P", "B"),
+        ("T", "D"),
+        ("K", "G"),
+        ("F", "V"),
+        ("S", "Z"),
+        ("SH", "ZH"),
+        ("CH", "JH"),
+        ("TH", "DH"),
+        ("TH", "F"),
+        ("M", "N"),
+        ("N", "NG"),
+        ("L", "R"),
+        ("W", "R"),
+        ("IH", "IY"),
+        ("UH", "UW"),
+        ("AA", "AO"),
+        ("AA", "AH"),
+        ("AH", "ER"),
+        ("EH", "AE"),
+        ("EH", "IH"),
+        ("OW", "AO"),
+    )
+}
+_CLOSE_COST = 0.3
+_VOWEL_COST = 0.6
+_CONSONANT_COST = 0.8
+_MISMATCH_COST = 1.0
+_INDEL_COST = 1.0
+
+_NON_WORD = re.compile(r"[^a-z'\s\-]")
+_TOKEN_SPLIT = re.compile(r"[\s\-]+")
+
+
+@lru_cache(maxsize=1)
+def _pronunciation_index() -> dict[str, list[Phonemes]]:
+    """Phonemes for the bundled dictionary and default vocabulary.
+
+    Built on the first phoneme-mode lookup, so spelling-only use never
+    parses the dictionary.
+    """
+    index = load_pronunciations()
+    for word in load_default_vocab():
+        for token in _tokens(word):
+            if token not in index:
+                index[token] = [grapheme_to_phonemes(token)]
+    return index
+
+
+def _tokens(text: str) -> list[str]:
+    cleaned = _NON_WORD.sub(" ", (text or "").lower())
+    tokens = (token.strip("'") for token in _TOKEN_SPLIT.split(cleaned))
+    return [token for token in tokens if token]
+
+
+def grapheme_to_phonemes(token: str) -> Phonemes:
+    """Rule-based phonemes for a word missing from the dictionary."""
+    token = token.lower().replace("'", "")
+    for prefix, replacement in _SILENT_PREFIXES.items():
+        if token.startswith(prefix):
+            token = replacement + token[len(prefix) :]
+    # Silent final e makes the previous single vowel long (n-i-t-e -> N AY T).
+    magic_e = None
+    tail = ""
+    if len(token) > 2 and token.endswith("e") and token[-2] not in _VOWEL_LETTERS:
+        magic_e = token[-3] if token[-3] in _VOWEL_LETTERS else None
+        token, tail = token[:-1], "e"
+    chunks = split_graphemes(token)
+    phonemes: list[str] = []
+    previous = None
+    for position, chunk in enumerate(chunks):
+        if chunk == previous and len(chunk) == 1:
+            continue
+        following = chunks[position + 1] if position + 1 < len(chunks) else tail
+        if magic_e and chunk == magic_e and position == len(chunks) - 2:
+            mapped = _LONG_VOWELS[chunk]
+        elif chunk in {"c", "g"} and following[:1] in {"e", "i", "y"}:
+            mapped = ("S",) if chunk == "c" else ("JH",)
+        elif chunk == "y" and position == len(chunks) - 1 and position > 0:
+            mapped = ("IY",)
+        else:
+            mapped = _GRAPHEME_PHONEMES.get(chunk, ())
+        phonemes.extend(mapped)
+        previous = chunk
+    return tuple(phonemes)
+
+
+@lru_cache(maxsize=4096)
+def word_phonemes(text: str) -> tuple[Phonemes, ...]:
+    """All candidate phoneme sequences for a word or short phrase."""
+    tokens = _tokens(text)
+    if not tokens:
+        return ()
+    index = _pronunciation_index()
+    if len(tokens) == 1:
+        token = tokens[0]
+        return tuple(index.get(token) or [grapheme_to_phonemes(token)])
+    # Phrases use the primary pronunciation of each token.
+    combined: list[str] = []
+    for token in tokens:
+        variants = index.get(token)
+        combined.extend(variants[0] if variants else grapheme_to_phonemes(token))
+    return (tuple(combined),)
+
+
+def _substitution_cost(a: str, b: str) -> float:
+    if a == b:
+        return 0.0
+    if frozenset((a, b)) in _CLOSE_PAIRS:
+        return _CLOSE_COST
+    a_vowel = a in _VOWELS
+    b_vowel = b in _VOWELS
+    if a_vowel and b_vowel:
+        return _VOWEL_COST
+    if not a_vowel and not b_vowel:
+        return _CONSONANT_COST
+    return _MISMATCH_COST
+
+
+def phoneme_distance(source: Phonemes, target: Phonemes) -> float:
+    """Weighted edit distance between two phoneme sequences."""
+    previous = [index * _INDEL_COST for index in range(len(target) + 1)]
+    for i, source_phoneme in enumerate(source, start=1):
+        current = [i * _INDEL_COST]
+        for j, target_phoneme in enumerate(target, start=1):
+            current.append(
+                min(
+                    previous[j] + _INDEL_COST,
+                    current[j - 1] + _INDEL_COST,
+                    previous[j - 1]
+                    + _substitution_cost(source_phoneme, target_phoneme),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def phoneme_similarity(source: Phonemes, target: Phonemes) -> float:
+    longest = max(len(source), len(target))
+    if not longest:
+        return 0.0
+    return max(0.0, 1.0 - phoneme_distance(source, target) / longest)
+
+
+def phoneme_score(user_input: str, correct_word: str) -> Optional[int]:
+    """Score how closely `user_input` sounds like `correct_word` (0-100).
+
+    Returns None when either side has no letters to pronounce.
+    """
+    spoken = word_phonemes(user_input)
+    expected = word_phonemes(correct_word)
+    if not spoken or not expected:
+        return None
+    best = max(
+        phoneme_similarity(source, target)
+        for source, target in product(spoken, expected)
+    )
+    return int(round(best * 100))
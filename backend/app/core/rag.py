@@ -4,6 +4,7 @@ import os
 from typing import Any, Iterable, Optional
 
 from .db import get_connection
+from .metrics import timed
 from ..llm.client import LLMUnavailable, embed_text
 
 
@@ -66,6 +67,7 @@ def _truncate_text(text: str, max_chars: int = 1200) -> str:
     return cleaned[:max_chars].rstrip()
 
 
+@timed("rag.store_document")
 def store_document(
     text: str,
     doc_type: str,
@@ -102,6 +104,7 @@ def store_document(
         conn.commit()
 
 
+@timed("rag.retrieve_context")
 def retrieve_context(
     query: str,
     child_id: Optional[int] = None,
@@ -1,7 +1,33 @@
 import re
+from typing import Iterable
 
 # Conservative whitelist: letters, spaces, hyphen, apostrophe, basic CJK
 _ALLOWED = re.compile(r"^[A-Za-z\u4e00-\u9fff\s\-']{1,32}$")
+_ALLOWED_CHARS = r"[A-Za-z\u4e00-\u9fff\s\-']"
+
+# One pass classification for bulk validation: the name of the matching
+# group is the outcome for the (already stripped) word.
+_CLASSIFY = re.compile(
+    r"(?P<empty>)"
+    rf"|(?P<ok>{_ALLOWED_CHARS}{{1,32}})"
+    rf"|(?P<too_long>{_ALLOWED_CHARS}{{33,}})"
+    r"|(?P<invalid_characters>.+)",
+    re.DOTALL,
+)
+
+ERROR_EMPTY = "empty"
+ERROR_TOO_LONG = "too_long"
+ERROR_INVALID_CHARACTERS = "invalid_characters"
+ERROR_DUPLICATE = "duplicate"
+
+_ERROR_MESSAGES = {
+    ERROR_EMPTY: "Word is empty.",
+    ERROR_TOO_LONG: "Word is longer than 32 characters.",
+    ERROR_INVALID_CHARACTERS: (
+        "Use only letters, Chinese characters, spaces, - or '."
+    ),
+    ERROR_DUPLICATE: "Word appears earlier in the list.",
+}
 
 
 def sanitize_word(word: str) -> str:
@@ -17,3 +43,38 @@ def sanitize_word(word: str) -> str:
             "Max 32 chars."
         )
     return w
+
+
+def validate_words(words: Iterable[str]) -> dict:
+    """Validate a whole word list in one pass.
+
+    Words are stripped and classified with a single combined regex, and
+    later case-insensitive duplicates are dropped. Valid words are kept in
+    input order so callers can accept part of a list.
+
+    Returns:
+        {"accepted": [...], "errors": [{index, word, code, message}, ...]}
+    """
+    accepted = []
+    errors = []
+    seen = set()
+    classify = _CLASSIFY.fullmatch
+    for index, raw in enumerate(words):
+        word = (raw or "").strip()
+        code = classify(word).lastgroup
+        if code == "ok":
+            key = word.casefold()
+            if key not in seen:
+                seen.add(key)
+                accepted.append(word)
+                continue
+            code = ERROR_DUPLICATE
+        errors.append(
+            {
+                "index": index,
+                "word": word,
+                "code": code,
+                "message": _ERROR_MESSAGES[code],
+            }
+        )
+    return {"accepted": accepted, "errors": errors}
@@ -0,0 +1,256 @@
+"""Spaced-repetition schedule (SM-2) for each child's practised words.
+
+Every saved exercise updates one `word_schedule` row in place, so picking
+the next words to practise reads the `(child_id, due_at)` index instead of
+re-aggregating the exercise history.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+
+from .db import get_connection
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# A missed word comes back in the same session rather than tomorrow.
+LAPSE_MINUTES = 10
+# Candidates checked per query when looking for never-practised words.
+_NEW_WORD_CHUNK = 200
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def init_scheduler() -> None:
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS word_schedule (
+                child_id INTEGER NOT NULL,
+                word TEXT NOT NULL,
+                ease REAL NOT NULL,
+                interval_days REAL NOT NULL,
+                repetitions INTEGER NOT NULL,
+                lapses INTEGER NOT NULL,
+                due_at TEXT NOT NULL,
+                last_score INTEGER NOT NULL,
+                last_seen_at TEXT NOT NULL,
+                PRIMARY KEY (child_id, word)
+            ) WITHOUT ROWID
+        """
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_word_schedule_due ON word_schedule(child_id, due_at)"
+        )
+        conn.commit()
+
+
+def _now() -> datetime:
+    # Matches SQLite's CURRENT_TIMESTAMP, which exercises.created_at uses.
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def quality_from_score(score: int, correct: bool) -> int:
+    """Map a 0-100 score to SM-2 quality 0-5; a wrong answer is at most 2."""
+    quality = max(0, min(5, round(score / 20)))
+    return quality if correct else min(quality, 2)
+
+
+def next_state(
+    state: Optional[tuple], score: int, correct: bool, reviewed_at: datetime
+) -> tuple:
+    """Apply one SM-2 review.
+
+    `state` is `(ease, interval_days, repetitions, lapses)` or None for a new
+    word. Returns the new state followed by its due time.
+    """
+    ease, interval, repetitions, lapses = state or (DEFAULT_EASE, 0.0, 0, 0)
+    quality = quality_from_score(score, correct)
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    if quality < 3:
+        repetitions = 0
+        interval = 0.0
+        lapses += 1
+        due_at = reviewed_at + timedelta(minutes=LAPSE_MINUTES)
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval = 1.0
+        elif repetitions == 2:
+            interval = 6.0
+        else:
+            interval = round(interval * ease, 2)
+        due_at = reviewed_at + timedelta(days=interval)
+    return ease, interval, repetitions, lapses, due_at
+
+
+_UPSERT = """
+    INSERT INTO word_schedule (
+        child_id, word, ease, interval_days, repetitions, lapses,
+        due_at, last_score, last_seen_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(child_id, word) DO UPDATE SET
+        ease = excluded.ease,
+        interval_days = excluded.interval_days,
+        repetitions = excluded.repetitions,
+        lapses = excluded.lapses,
+        due_at = excluded.due_at,
+        last_score = excluded.last_score,
+        last_seen_at = excluded.last_seen_at
+"""
+
+
+def record_review(
+    cursor,
+    child_id: int,
+    word: str,
+    score: int,
+    correct: bool,
+    reviewed_at: Optional[datetime] = None,
+) -> None:
+    """Update one word's schedule inside the caller's transaction."""
+    reviewed_at = reviewed_at or _now()
+    cursor.execute(
+        """
+        SELECT ease, interval_days, repetitions, lapses
+        FROM word_schedule WHERE child_id = ? AND word = ?
+    """,
+        (child_id, word),
+    )
+    ease, interval, repetitions, lapses, due_at = next_state(
+        cursor.fetchone(), score, correct, reviewed_at
+    )
+    cursor.execute(
+        _UPSERT,
+        (
+            child_id,
+            word,
+            ease,
+            interval,
+            repetitions,
+            lapses,
+            due_at.strftime(_TIME_FORMAT),
+            score,
+            reviewed_at.strftime(_TIME_FORMAT),
+        ),
+    )
+
+
+def rebuild_schedule(cursor) -> None:
+    """Replay the whole exercise history into `word_schedule`."""
+    cursor.execute("DELETE FROM word_schedule")
+    rows = cursor.execute(
+        """
+        SELECT child_id, word, score, correct, created_at, id FROM exercises
+        WHERE child_id IS NOT NULL
+        UNION ALL
+        SELECT child_id, word, score, correct, created_at, id FROM exercises_archive
+        ORDER BY child_id, word, created_at, id
+    """
+    )
+    batch = []
+    current_key, state, last = None, None, None
+    for child_id, word, score, correct, created_at, _ in rows:
+        if (child_id, word) != current_key:
+            if current_key is not None:
+                batch.append(current_key + last)
+            current_key, state = (child_id, word), None
+        reviewed_at = datetime.fromisoformat(created_at)
+        ease, interval, repetitions, lapses, due_at = next_state(
+            state, score, bool(correct), reviewed_at
+        )
+        state = (ease, interval, repetitions, lapses)
+        last = state + (due_at.strftime(_TIME_FORMAT), score, created_at)
+    if current_key is not None:
+        batch.append(current_key + last)
+    cursor.executemany(_UPSERT, batch)
+
+
+def next_words(child_id: int, candidates: Iterable[str], limit: int = 10) -> List[str]:
+    """The next words to practise from `candidates`.
+
+    Due words come first (most overdue first), then never-practised words in
+    list order, then words that are not yet due, soonest first.
+    """
+    limit = max(1, limit)
+    candidates = list(dict.fromkeys(word for word in candidates if word))
+    allowed = set(candidates)
+    now = _now().strftime(_TIME_FORMAT)
+    picked: List[str] = []
+    with get_connection() as conn:
+        due = conn.execute(
+            """
+            SELECT word FROM word_schedule
+            WHERE child_id = ? AND due_at <= ?
+            ORDER BY due_at
+        """,
+            (child_id, now),
+        )
+        while len(picked) < limit:
+            rows = due.fetchmany(limit)
+            if not rows:
+                break
+            picked.extend(row[0] for row in rows if row[0] in allowed)
+        picked = picked[:limit]
+
+        for offset in range(0, len(candidates), _NEW_WORD_CHUNK):
+            if len(picked) >= limit:
+                break
+            chunk = candidates[offset : offset + _NEW_WORD_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            scheduled = {
+                row[0]
+                for row in conn.execute(
+                    f"SELECT word FROM word_schedule WHERE child_id = ? AND word IN ({placeholders})",
+                    (child_id, *chunk),
+                )
+            }
+            picked.extend(word for word in chunk if word not in scheduled)
+        picked = picked[:limit]
+
+        if len(picked) < limit:
+            upcoming = conn.execute(
+                """
+                SELECT word FROM word_schedule
+                WHERE child_id = ? AND due_at > ?
+                ORDER BY due_at
+            """,
+                (child_id, now),
+            )
+            while len(picked) < limit:
+                rows = upcoming.fetchmany(limit)
+                if not rows:
+                    break
+                picked.extend(row[0] for row in rows if row[0] in allowed)
+    return picked[:limit]
+
+
+def get_word_schedule(child_id: int, limit: int = 50) -> List[dict]:
+    """Scheduled words for a child, soonest due first."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT word, ease, interval_days, repetitions, lapses, due_at, last_score
+            FROM word_schedule
+            WHERE child_id = ?
+            ORDER BY due_at
+            LIMIT ?
+        """,
+            (child_id, limit),
+        ).fetchall()
+    return [
+        {
+            "word": row[0],
+            "ease": round(row[1], 2),
+            "interval_days": row[2],
+            "repetitions": row[3],
+            "lapses": row[4],
+            "due_at": row[5],
+            "last_score": row[6],
+        }
+        for row in rows
+    ]
+
+
+init_scheduler()
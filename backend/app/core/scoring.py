@@ -1,4 +1,15 @@
-from rapidfuzz import fuzz
+import os
+from typing import Iterable, Sequence
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from .config import env_int
+from .pronunciation import phoneme_score
+
+SCORING_MODES = ("spelling", "phoneme")
+# Below this many comparisons, thread start-up costs more than it saves.
+_PARALLEL_MIN_CELLS = 10_000
 
 
 def check_answer(selected: str, correct: str) -> bool:
@@ -6,9 +17,102 @@ def check_answer(selected: str, correct: str) -> bool:
     return (selected or "").strip().upper() == (correct or "").strip().upper()
 
 
-def calculate_pronunciation_score(user_input: str, correct_word: str) -> int:
-    """Calculate pronunciation score based on text similarity (0-100)."""
+def default_scoring_mode() -> str:
+    mode = os.getenv("GOGOHANNAH_PRONUNCIATION_MODE", "spelling").strip().lower()
+    return mode if mode in SCORING_MODES else "spelling"
+
+
+def calculate_pronunciation_score(
+    user_input: str,
+    correct_word: str,
+    mode: str | None = None,
+) -> int:
+    """Calculate pronunciation score (0-100).
+
+    `spelling` compares the text; `phoneme` compares how the words sound, so
+    "nite" matches "night". Phoneme mode falls back to spelling when a word
+    has no English letters (e.g. Chinese targets).
+    """
     if not user_input.strip():
         return 0
+    if (mode or default_scoring_mode()) == "phoneme":
+        score = phoneme_score(user_input, correct_word)
+        if score is not None:
+            return score
     score = fuzz.ratio(user_input.strip().lower(), correct_word.lower())
     return int(score)
+
+
+def scoring_workers() -> int:
+    """Worker threads for batch scoring (`-1` uses every core)."""
+    return env_int("GOGOHANNAH_SCORING_WORKERS", -1)
+
+
+def _workers_for(cells: int) -> int:
+    return scoring_workers() if cells >= _PARALLEL_MIN_CELLS else 1
+
+
+def score_pronunciation_pairs(
+    pairs: Iterable[Sequence[str]],
+    mode: str | None = None,
+) -> list[int]:
+    """Score many (user_input, correct_word) pairs at once.
+
+    Matches `calculate_pronunciation_score` for every pair.
+    """
+    if (mode or default_scoring_mode()) == "phoneme":
+        return [
+            calculate_pronunciation_score(user_input, correct_word, "phoneme")
+            for user_input, correct_word in pairs
+        ]
+    user_inputs = []
+    targets = []
+    for user_input, correct_word in pairs:
+        user_inputs.append(user_input.strip().lower())
+        targets.append(correct_word.lower())
+    if not user_inputs:
+        return []
+    scores = process.cpdist(
+        user_inputs,
+        targets,
+        scorer=fuzz.ratio,
+        dtype=np.float64,
+        workers=_workers_for(len(user_inputs)),
+    )
+    return [
+        int(score) if user_input else 0
+        for user_input, score in zip(user_inputs, scores)
+    ]
+
+
+def score_pronunciation_matrix(
+    user_inputs: Sequence[str],
+    correct_words: Sequence[str],
+    mode: str | None = None,
+) -> list[list[int]]:
+    """Score every user input against every candidate word.
+
+    Row `i`, column `j` equals
+    `calculate_pronunciation_score(user_inputs[i], correct_words[j])`.
+    """
+    if (mode or default_scoring_mode()) == "phoneme":
+        return [
+            [
+                calculate_pronunciation_score(user_input, correct_word, "phoneme")
+                for correct_word in correct_words
+            ]
+            for user_input in user_inputs
+        ]
+    if not user_inputs or not correct_words:
+        return [[] for _ in user_inputs]
+    cleaned = [text.strip().lower() for text in user_inputs]
+    scores = process.cdist(
+        cleaned,
+        [word.lower() for word in correct_words],
+        scorer=fuzz.ratio,
+        dtype=np.float64,
+        workers=_workers_for(len(user_inputs) * len(correct_words)),
+    )
+    scores = scores.astype(np.int64)
+    scores[[not text for text in cleaned]] = 0
+    return scores.tolist()
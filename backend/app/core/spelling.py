@@ -0,0 +1,135 @@
+import re
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+from rapidfuzz import process
+from rapidfuzz.distance import OSA
+
+from ..vocab.loader import load_default_vocab, load_english_words
+
+_CJK = re.compile(r"[\u4e00-\u9fff]")
+_TOKEN_SPLIT = re.compile(r"([\s\-]+)")
+
+
+@lru_cache(maxsize=1)
+def _lexicon() -> tuple[dict[str, int], dict[int, list[str]]]:
+    """Each known word's correction rank, plus candidates bucketed by length.
+
+    Rank is the correction priority across every bucket: default vocabulary
+    first, then the bundled English list in frequency order. Buckets list
+    their words in rank order.
+    """
+    ranks: dict[str, int] = {}
+    by_length: dict[int, list[str]] = {}
+    for word in [*load_default_vocab(), *load_english_words()]:
+        for token in _TOKEN_SPLIT.split(word.lower())[::2]:
+            if token and token not in ranks:
+                ranks[token] = len(ranks)
+                by_length.setdefault(len(token), []).append(token)
+    return ranks, by_length
+
+
+def _max_edits(token: str) -> int:
+    return 1 if len(token) <= 4 else 2
+
+
+def _closest(tokens: set[str]) -> dict[str, Optional[str]]:
+    """Best correction for each unknown token, or None when nothing is close.
+
+    Tokens of one length share their candidate buckets, so each pair of
+    token length and candidate length is a single `process.cdist` call.
+    Fewer edits win; ties go to the lower rank.
+    """
+    ranks, by_length = _lexicon()
+    groups: dict[int, list[str]] = {}
+    for token in sorted(tokens):
+        groups.setdefault(len(token), []).append(token)
+    best: dict[str, tuple[int, int, str]] = {}
+    for length, group in groups.items():
+        max_edits = _max_edits(group[0])
+        for candidate_length in range(length - max_edits, length + max_edits + 1):
+            candidates = by_length.get(candidate_length)
+            if not candidates:
+                continue
+            distances = process.cdist(
+                group,
+                candidates,
+                scorer=OSA.distance,
+                score_cutoff=max_edits,
+                dtype=np.int32,
+            )
+            # Buckets are in rank order, so argmin picks the lowest rank
+            # among this bucket's closest candidates.
+            columns = distances.argmin(axis=1)
+            for token, row, column in zip(group, distances, columns):
+                distance = int(row[column])
+                if distance > max_edits:
+                    continue
+                word = candidates[column]
+                key = (distance, ranks[word], word)
+                if token not in best or key < best[token]:
+                    best[token] = key
+    return {token: best[token][2] if token in best else None for token in tokens}
+
+
+def _match_case(original: str, corrected: str) -> str:
+    if original.isupper() and len(original) > 1:
+        return corrected.upper()
+    if original[:1].isupper():
+        return corrected[:1].upper() + corrected[1:]
+    return corrected
+
+
+def _split(word: str) -> tuple[str, Optional[list[str]]]:
+    """The stripped word and its token/separator parts, or None to keep it."""
+    cleaned = (word or "").strip()
+    if not cleaned or _CJK.search(cleaned):
+        return cleaned, None
+    return cleaned, _TOKEN_SPLIT.split(cleaned)
+
+
+def _unknown_tokens(parts: list[str]) -> set[str]:
+    ranks, _ = _lexicon()
+    lowered = (token.lower() for token in parts[::2])
+    return {token for token in lowered if token and token not in ranks}
+
+
+def _apply(parts: list[str], corrections: dict[str, Optional[str]]) -> Optional[str]:
+    parts = list(parts)
+    for index in range(0, len(parts), 2):
+        lowered = parts[index].lower()
+        if lowered not in corrections:
+            continue
+        corrected = corrections[lowered]
+        if corrected is None:
+            return None
+        parts[index] = _match_case(parts[index], corrected)
+    return "".join(parts)
+
+
+def correct_word(word: str) -> Optional[str]:
+    """Correct the spelling of one vocabulary word or phrase locally.
+
+    Returns the word unchanged when every token is known (or Chinese), the
+    corrected spelling when each unknown token has a close match, and None
+    when some token cannot be resolved.
+    """
+    return correct_words([word])[0]
+
+
+def correct_words(words: list[str]) -> list[Optional[str]]:
+    """Correct a list of words locally; unresolved entries are None.
+
+    Unknown tokens from every word are matched together in one batch.
+    """
+    split = [_split(word) for word in words]
+    unknown: set[str] = set()
+    for _, parts in split:
+        if parts is not None:
+            unknown |= _unknown_tokens(parts)
+    corrections = _closest(unknown) if unknown else {}
+    return [
+        cleaned if parts is None else _apply(parts, corrections)
+        for cleaned, parts in split
+    ]
@@ -1,7 +1,13 @@
+import atexit
+import threading
+import uuid
 from datetime import date as date_type
 from datetime import timedelta
+from typing import Callable, Iterable, Optional, TypeVar
 
+from .config import env_float
 from .db import get_connection
+from .versions import bump_child_versions
 
 
 def init_study_time() -> None:
@@ -22,15 +28,116 @@ def init_study_time() -> None:
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_study_time_child_date ON study_time(child_id, date)"
         )
+        # Week (Monday start), month and lifetime totals, kept in step with
+        # study_time by _write_increments.
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS study_time_rollups (
+                child_id INTEGER NOT NULL,
+                period TEXT NOT NULL,
+                period_start TEXT NOT NULL,
+                total_seconds INTEGER NOT NULL,
+                PRIMARY KEY (child_id, period, period_start)
+            ) WITHOUT ROWID
+        """
+        )
+        # Last flush generation committed by each worker process.
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS study_time_flushes (
+                owner TEXT PRIMARY KEY,
+                generation INTEGER NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+        cursor.execute("SELECT 1 FROM study_time_rollups LIMIT 1")
+        if cursor.fetchone() is None:
+            _rebuild_rollups(cursor)
+        conn.commit()
 
 
-def add_study_time(child_id: int, date: date_type, seconds: int) -> int:
-    if seconds <= 0:
-        return get_study_time(child_id, date)
-    date_str = date.isoformat()
+ROLLUP_WEEK = "week"
+ROLLUP_MONTH = "month"
+ROLLUP_ALL = "all"
+
+
+def _rebuild_rollups(cursor) -> None:
+    """Recompute every rollup row from the daily table."""
+    cursor.execute("DELETE FROM study_time_rollups")
+    cursor.execute(
+        """
+        INSERT INTO study_time_rollups (child_id, period, period_start, total_seconds)
+        SELECT child_id, 'week', date(date, '-6 days', 'weekday 1'), SUM(total_seconds)
+        FROM study_time GROUP BY child_id, date(date, '-6 days', 'weekday 1')
+        UNION ALL
+        SELECT child_id, 'month', date(date, 'start of month'), SUM(total_seconds)
+        FROM study_time GROUP BY child_id, date(date, 'start of month')
+        UNION ALL
+        SELECT child_id, 'all', '', SUM(total_seconds)
+        FROM study_time GROUP BY child_id
+    """
+    )
+
+
+def rebuild_study_time_rollups() -> None:
+    with get_connection() as conn:
+        _rebuild_rollups(conn.cursor())
+        conn.commit()
+
+
+def flush_interval() -> float:
+    """Seconds between buffered study-time flushes (0 writes through)."""
+    return max(0.0, env_float("GOGOHANNAH_STUDY_TIME_FLUSH_SECONDS", 5.0))
+
+
+# Unflushed heartbeat seconds, child_id -> {ISO date: seconds}. A flush
+# moves the buffer to _in_flight under _flush_lock and writes it after
+# releasing the lock. Each flush gets a generation, committed to
+# study_time_flushes in the same transaction. A reader can then tell whether
+# the rows it read include the in-flight batch (see _read_with_buffer), so no
+# delta is counted twice or missed.
+_pending: dict[int, dict[str, int]] = {}
+_in_flight: dict[int, dict[str, int]] = {}
+_generation = 0
+_flush_lock = threading.Lock()
+# Keeps at most one batch in flight.
+_write_lock = threading.Lock()
+# Generations are per process; every worker keeps its own row.
+_FLUSH_OWNER = uuid.uuid4().hex
+_flusher: threading.Thread | None = None
+_flusher_stop = threading.Event()
+
+T = TypeVar("T")
+
+
+def _merge(target: dict[int, dict[str, int]], source: dict[int, dict[str, int]]) -> None:
+    for child_id, days in source.items():
+        merged = target.setdefault(child_id, {})
+        for day, seconds in days.items():
+            merged[day] = merged.get(day, 0) + seconds
+
+
+def _write_increments(
+    increments: dict[int, dict[str, int]], generation: Optional[int] = None
+) -> None:
+    rows = [
+        (child_id, day, seconds)
+        for child_id, days in increments.items()
+        for day, seconds in days.items()
+    ]
+    rollups: dict[tuple[int, str, str], int] = {}
+    for child_id, day, seconds in rows:
+        parsed = date_type.fromisoformat(day)
+        for key in (
+            (child_id, ROLLUP_WEEK, week_range(parsed)[0].isoformat()),
+            (child_id, ROLLUP_MONTH, parsed.replace(day=1).isoformat()),
+            (child_id, ROLLUP_ALL, ""),
+        ):
+            rollups[key] = rollups.get(key, 0) + seconds
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(
+        cursor.executemany(
             """
             INSERT INTO study_time (child_id, date, total_seconds)
             VALUES (?, ?, ?)
@@ -38,33 +145,246 @@ def add_study_time(child_id: int, date: date_type, seconds: int) -> int:
             DO UPDATE SET total_seconds = total_seconds + excluded.total_seconds,
                          updated_at = CURRENT_TIMESTAMP
         """,
-            (child_id, date_str, seconds),
+            rows,
+        )
+        cursor.executemany(
+            """
+            INSERT INTO study_time_rollups (child_id, period, period_start, total_seconds)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(child_id, period, period_start)
+            DO UPDATE SET total_seconds = total_seconds + excluded.total_seconds
+        """,
+            [key + (seconds,) for key, seconds in rollups.items()],
         )
+        if generation is not None:
+            cursor.execute(
+                """
+                INSERT INTO study_time_flushes (owner, generation) VALUES (?, ?)
+                ON CONFLICT(owner) DO UPDATE SET
+                    generation = excluded.generation, updated_at = CURRENT_TIMESTAMP
+            """,
+                (_FLUSH_OWNER, generation),
+            )
+            # Rows of workers that stopped long ago.
+            cursor.execute(
+                "DELETE FROM study_time_flushes WHERE updated_at < datetime('now', '-1 day')"
+            )
+        bump_child_versions(cursor, increments)
         conn.commit()
+
+
+def flush_study_time() -> int:
+    """Write buffered increments in one transaction; returns rows touched.
+
+    Heartbeats and readers wait only for the buffer swap, not for the write.
+    """
+    global _generation
+    with _write_lock:
+        with _flush_lock:
+            if not _pending:
+                return 0
+            _generation += 1
+            generation = _generation
+            _merge(_in_flight, _pending)
+            _pending.clear()
+            batch = {child_id: dict(days) for child_id, days in _in_flight.items()}
+        try:
+            _write_increments(batch, generation)
+        except BaseException:
+            # Nothing was committed; buffer the batch again for the next flush.
+            with _flush_lock:
+                _merge(_pending, _in_flight)
+                _in_flight.clear()
+            raise
+        with _flush_lock:
+            _in_flight.clear()
+        return sum(len(days) for days in batch.values())
+
+
+def _flush_loop() -> None:
+    while not _flusher_stop.wait(flush_interval() or 1.0):
+        try:
+            flush_study_time()
+        except Exception:
+            # Keep buffering; the next tick (or shutdown) retries the write.
+            continue
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _flush_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher_stop.clear()
+            _flusher = threading.Thread(
+                target=_flush_loop, name="study-time-flush", daemon=True
+            )
+            _flusher.start()
+
+
+def stop_study_time_flusher() -> None:
+    """Stop the background flusher and write anything still buffered."""
+    _flusher_stop.set()
+    if _flusher is not None:
+        _flusher.join(timeout=5)
+    flush_study_time()
+
+
+def discard_pending_study_time(child_id: int) -> None:
+    """Drop a deleted child's buffered increments instead of writing them.
+
+    The child also leaves the in-flight batch, so a write that fails is not
+    buffered again with it. A write that succeeds lands before the purge,
+    which flushes first and so waits for it.
+    """
+    with _flush_lock:
+        _pending.pop(child_id, None)
+        _in_flight.pop(child_id, None)
+
+
+def _read_with_buffer(
+    child_ids: Iterable[int], read: Callable[..., T]
+) -> tuple[T, dict[int, dict[str, int]]]:
+    """Run `read(cursor)` and return its result plus the buffered seconds it lacks.
+
+    The buffer is copied under _flush_lock. The query then runs without the
+    lock, in one read transaction that also reads this process's committed
+    flush generation.
+    """
+    with _flush_lock:
+        in_flight_generation = _generation
+        pending = {
+            child_id: dict(_pending[child_id]) for child_id in child_ids if child_id in _pending
+        }
+        in_flight = {
+            child_id: dict(_in_flight[child_id])
+            for child_id in child_ids
+            if child_id in _in_flight
+        }
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN")
+        result = read(conn.cursor())
+        row = conn.execute(
+            "SELECT generation FROM study_time_flushes WHERE owner = ?", (_FLUSH_OWNER,)
+        ).fetchone()
+    finally:
+        conn.rollback()
+        conn.close()
+    committed = row[0] if row else 0
+    unflushed: dict[int, dict[str, int]] = {}
+    if committed < in_flight_generation:
+        _merge(unflushed, in_flight)
+    # Whatever was pending goes out in a later generation than the in-flight one.
+    if committed <= in_flight_generation:
+        _merge(unflushed, pending)
+    return result, unflushed
+
+
+def _pending_seconds(
+    days: Optional[dict[str, int]],
+    start: str | None = None,
+    end: str | None = None,
+) -> int:
+    return sum(
+        seconds
+        for day, seconds in (days or {}).items()
+        if (start is None or day >= start) and (end is None or day <= end)
+    )
+
+
+def add_study_time(child_id: int, date: date_type, seconds: int) -> int:
+    if seconds <= 0:
+        return get_study_time(child_id, date)
+    date_str = date.isoformat()
+    if flush_interval() <= 0:
+        _write_increments({child_id: {date_str: seconds}})
+        return get_study_time(child_id, date)
+    with _flush_lock:
+        days = _pending.setdefault(child_id, {})
+        days[date_str] = days.get(date_str, 0) + seconds
+    _ensure_flusher()
     return get_study_time(child_id, date)
 
 
 def get_study_time(child_id: int, date: date_type) -> int:
     date_str = date.isoformat()
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
+    row, unflushed = _read_with_buffer(
+        [child_id],
+        lambda cursor: cursor.execute(
             "SELECT total_seconds FROM study_time WHERE child_id = ? AND date = ?",
             (child_id, date_str),
-        )
-        row = cursor.fetchone()
-        return int(row[0]) if row else 0
+        ).fetchone(),
+    )
+    stored = int(row[0]) if row else 0
+    return stored + unflushed.get(child_id, {}).get(date_str, 0)
 
 
 def get_total_study_time(child_id: int) -> int:
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT COALESCE(SUM(total_seconds), 0) FROM study_time WHERE child_id = ?",
+    row, unflushed = _read_with_buffer(
+        [child_id],
+        lambda cursor: cursor.execute(
+            """
+            SELECT total_seconds FROM study_time_rollups
+            WHERE child_id = ? AND period = 'all' AND period_start = ''
+        """,
             (child_id,),
+        ).fetchone(),
+    )
+    stored = int(row[0]) if row else 0
+    return stored + _pending_seconds(unflushed.get(child_id))
+
+
+def _next_month(start: date_type) -> date_type:
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1, day=1)
+    return start.replace(month=start.month + 1, day=1)
+
+
+def _split_weeks(
+    start: date_type, end: date_type
+) -> tuple[list[tuple[str, str, str]], list[tuple[date_type, date_type]]]:
+    """Cover [start, end] with whole calendar weeks plus leftover day spans."""
+    first_week = start + timedelta(days=(7 - start.weekday()) % 7)
+    last_sunday = end - timedelta(days=(end.weekday() + 1) % 7)
+    last_week = last_sunday - timedelta(days=6)
+    if first_week > last_week:
+        return [], [(start, end)]
+    days = [(start, first_week - timedelta(days=1)), (last_week + timedelta(days=7), end)]
+    spans = [(ROLLUP_WEEK, first_week.isoformat(), last_week.isoformat())]
+    return spans, [(lo, hi) for lo, hi in days if lo <= hi]
+
+
+def _decompose_range(
+    start: date_type, end: date_type
+) -> tuple[list[tuple[str, str, str]], list[tuple[date_type, date_type]]]:
+    """Split a date range into rollup spans and the daily spans left over.
+
+    Whole months come from month rollups, whole weeks at either edge from
+    week rollups, and at most six days per edge from daily rows, so the
+    rows read grow with the number of months, not days.
+    """
+    first_month = start if start.day == 1 else _next_month(start)
+    after_last_month = end.replace(day=1)
+    if end == month_range(end)[1]:
+        after_last_month = _next_month(after_last_month)
+    if first_month >= after_last_month:
+        return _split_weeks(start, end)
+    spans = [
+        (
+            ROLLUP_MONTH,
+            first_month.isoformat(),
+            (after_last_month - timedelta(days=1)).replace(day=1).isoformat(),
         )
-        row = cursor.fetchone()
-        return int(row[0]) if row else 0
+    ]
+    days: list[tuple[date_type, date_type]] = []
+    for lo, hi in ((start, first_month - timedelta(days=1)), (after_last_month, end)):
+        if lo <= hi:
+            week_spans, day_spans = _split_weeks(lo, hi)
+            spans.extend(week_spans)
+            days.extend(day_spans)
+    return spans, days
 
 
 def get_study_time_range(
@@ -72,18 +392,137 @@ def get_study_time_range(
     start_date: date_type,
     end_date: date_type,
 ) -> int:
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
+    if end_date < start_date:
+        return 0
+    rollup_spans, day_spans = _decompose_range(start_date, end_date)
+    parts = []
+    params: list = []
+    for period, first, last in rollup_spans:
+        parts.append(
+            "SELECT total_seconds FROM study_time_rollups "
+            "WHERE child_id = ? AND period = ? AND period_start BETWEEN ? AND ?"
+        )
+        params.extend([child_id, period, first, last])
+    for first, last in day_spans:
+        parts.append(
+            "SELECT total_seconds FROM study_time "
+            "WHERE child_id = ? AND date BETWEEN ? AND ?"
+        )
+        params.extend([child_id, first.isoformat(), last.isoformat()])
+    start, end = start_date.isoformat(), end_date.isoformat()
+    row, unflushed = _read_with_buffer(
+        [child_id],
+        lambda cursor: cursor.execute(
+            "SELECT COALESCE(SUM(total_seconds), 0) FROM ("
+            + " UNION ALL ".join(parts)
+            + ")",
+            params,
+        ).fetchone(),
+    )
+    stored = int(row[0]) if row else 0
+    return stored + _pending_seconds(unflushed.get(child_id), start, end)
+
+
+def get_study_time_summary(child_id: int, target: date_type) -> dict:
+    """Week, month and lifetime totals around `target` in one indexed lookup."""
+    week_start, week_end = week_range(target)
+    month_start, month_end = month_range(target)
+    totals = {ROLLUP_WEEK: 0, ROLLUP_MONTH: 0, ROLLUP_ALL: 0}
+    rows, unflushed = _read_with_buffer(
+        [child_id],
+        lambda cursor: cursor.execute(
             """
-            SELECT COALESCE(SUM(total_seconds), 0)
-            FROM study_time
-            WHERE child_id = ? AND date >= ? AND date <= ?
+            SELECT period, total_seconds FROM study_time_rollups
+            WHERE child_id = ? AND (
+                (period = 'week' AND period_start = ?)
+                OR (period = 'month' AND period_start = ?)
+                OR (period = 'all' AND period_start = '')
+            )
+        """,
+            (child_id, week_start.isoformat(), month_start.isoformat()),
+        ).fetchall(),
+    )
+    for period, seconds in rows:
+        totals[period] = int(seconds)
+    days = unflushed.get(child_id)
+    totals[ROLLUP_WEEK] += _pending_seconds(days, week_start.isoformat(), week_end.isoformat())
+    totals[ROLLUP_MONTH] += _pending_seconds(
+        days, month_start.isoformat(), month_end.isoformat()
+    )
+    totals[ROLLUP_ALL] += _pending_seconds(days)
+    return _summary_payload(totals, week_start, week_end, month_start, month_end)
+
+
+def get_bulk_study_time_summary(
+    child_ids: list[int], target: date_type
+) -> dict[int, dict]:
+    """get_study_time_summary for many children in one rollup query."""
+    ids = list(dict.fromkeys(child_ids))
+    if not ids:
+        return {}
+    week_start, week_end = week_range(target)
+    month_start, month_end = month_range(target)
+    totals = {
+        child_id: {ROLLUP_WEEK: 0, ROLLUP_MONTH: 0, ROLLUP_ALL: 0} for child_id in ids
+    }
+    placeholders = ",".join("?" for _ in ids)
+    rows, unflushed = _read_with_buffer(
+        ids,
+        lambda cursor: cursor.execute(
+            f"""
+            SELECT child_id, period, total_seconds FROM study_time_rollups
+            WHERE child_id IN ({placeholders}) AND (
+                (period = 'week' AND period_start = ?)
+                OR (period = 'month' AND period_start = ?)
+                OR (period = 'all' AND period_start = '')
+            )
         """,
-            (child_id, start_date.isoformat(), end_date.isoformat()),
+            ids + [week_start.isoformat(), month_start.isoformat()],
+        ).fetchall(),
+    )
+    for child_id, period, seconds in rows:
+        totals[child_id][period] = int(seconds)
+    for child_id, days in unflushed.items():
+        totals[child_id][ROLLUP_WEEK] += _pending_seconds(
+            days, week_start.isoformat(), week_end.isoformat()
+        )
+        totals[child_id][ROLLUP_MONTH] += _pending_seconds(
+            days, month_start.isoformat(), month_end.isoformat()
         )
-        row = cursor.fetchone()
-        return int(row[0]) if row else 0
+        totals[child_id][ROLLUP_ALL] += _pending_seconds(days)
+    return {
+        child_id: _summary_payload(values, week_start, week_end, month_start, month_end)
+        for child_id, values in totals.items()
+    }
+
+
+def empty_study_time_summary(target: date_type) -> dict:
+    week_start, week_end = week_range(target)
+    month_start, month_end = month_range(target)
+    totals = {ROLLUP_WEEK: 0, ROLLUP_MONTH: 0, ROLLUP_ALL: 0}
+    return _summary_payload(totals, week_start, week_end, month_start, month_end)
+
+
+def _summary_payload(
+    totals: dict,
+    week_start: date_type,
+    week_end: date_type,
+    month_start: date_type,
+    month_end: date_type,
+) -> dict:
+    return {
+        "week": {
+            "start_date": week_start.isoformat(),
+            "end_date": week_end.isoformat(),
+            "total_seconds": totals[ROLLUP_WEEK],
+        },
+        "month": {
+            "start_date": month_start.isoformat(),
+            "end_date": month_end.isoformat(),
+            "total_seconds": totals[ROLLUP_MONTH],
+        },
+        "total_seconds": totals[ROLLUP_ALL],
+    }
 
 
 def week_range(target: date_type) -> tuple[date_type, date_type]:
@@ -103,3 +542,4 @@ def month_range(target: date_type) -> tuple[date_type, date_type]:
 
 
 init_study_time()
+atexit.register(stop_study_time_flusher)
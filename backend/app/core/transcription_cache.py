@@ -0,0 +1,145 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .config import env_int
+from .db import get_connection
+
+
+def cache_size() -> int:
+    return max(0, env_int("GOGOHANNAH_TRANSCRIPTION_CACHE_SIZE", 1024))
+
+
+def persist_enabled() -> bool:
+    return os.getenv("GOGOHANNAH_TRANSCRIPTION_CACHE_PERSIST", "false").lower() in {
+        "1",
+        "true",
+        "yes",
+    }
+
+
+def init_transcription_cache() -> None:
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS transcription_cache (
+                cache_key TEXT PRIMARY KEY,
+                transcription TEXT NOT NULL,
+                backend TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_used_at REAL NOT NULL DEFAULT 0
+            )
+        """
+        )
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(transcription_cache)")}
+        if "last_used_at" not in columns:
+            # Tables from before LRU trimming; their rows go first.
+            cursor.execute(
+                "ALTER TABLE transcription_cache "
+                "ADD COLUMN last_used_at REAL NOT NULL DEFAULT 0"
+            )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_transcription_cache_last_used
+            ON transcription_cache (last_used_at)
+        """
+        )
+        conn.commit()
+
+
+def cache_key(audio_digest: str, target_word: str, model_id: str) -> str:
+    """Key a transcription by audio content, target word and model."""
+    raw = f"{audio_digest}\n{target_word.strip().lower()}\n{model_id}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+_memory: "OrderedDict[str, tuple[str, str]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _remember(key: str, value: tuple[str, str]) -> None:
+    limit = cache_size()
+    if limit == 0:
+        return
+    with _lock:
+        _memory[key] = value
+        _memory.move_to_end(key)
+        while len(_memory) > limit:
+            _memory.popitem(last=False)
+
+
+def _touch(conn, key: str) -> None:
+    """Mark a persisted entry as just used, so trimming keeps it longest."""
+    conn.execute(
+        "UPDATE transcription_cache SET last_used_at = ? WHERE cache_key = ?",
+        (time.time(), key),
+    )
+    conn.commit()
+
+
+def get_cached_transcription(key: str) -> Optional[tuple[str, str]]:
+    """Return `(transcription, backend)` for a key, or None on a miss."""
+    with _lock:
+        value = _memory.get(key)
+        if value is not None:
+            _memory.move_to_end(key)
+    if not persist_enabled():
+        return value
+    if value is not None:
+        with get_connection() as conn:
+            _touch(conn, key)
+        return value
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT transcription, backend FROM transcription_cache WHERE cache_key = ?",
+            (key,),
+        )
+        row = cursor.fetchone()
+        if row is not None:
+            _touch(conn, key)
+    if row is None:
+        return None
+    value = (row[0], row[1])
+    _remember(key, value)
+    return value
+
+
+def store_transcription(key: str, transcription: str, backend: str) -> None:
+    _remember(key, (transcription, backend))
+    if not persist_enabled():
+        return
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO transcription_cache
+                (cache_key, transcription, backend, last_used_at)
+            VALUES (?, ?, ?, ?)
+        """,
+            (key, transcription, backend, time.time()),
+        )
+        # Keep the persisted cache bounded by dropping the least recently used.
+        cursor.execute(
+            """
+            DELETE FROM transcription_cache WHERE cache_key IN (
+                SELECT cache_key FROM transcription_cache
+                ORDER BY last_used_at DESC, rowid DESC
+                LIMIT -1 OFFSET ?
+            )
+        """,
+            (max(0, env_int("GOGOHANNAH_TRANSCRIPTION_CACHE_PERSIST_SIZE", 10000)),),
+        )
+        conn.commit()
+
+
+def clear_transcription_cache() -> None:
+    with _lock:
+        _memory.clear()
+
+
+init_transcription_cache()
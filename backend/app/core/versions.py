@@ -0,0 +1,65 @@
+"""Per-child data versions, used as ETags for conditional GETs.
+
+Every write to a child's exercises, study time or custom vocabulary bumps
+the child's version in the same transaction, so a matching ETag proves the
+stored data has not changed without running the aggregate queries.
+"""
+
+from typing import Iterable, Optional
+
+from .db import get_connection
+
+
+def init_versions() -> None:
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS child_versions (
+                child_id INTEGER PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        """
+        )
+        conn.commit()
+
+
+def bump_child_versions(cursor, child_ids: Iterable[int]) -> None:
+    """Increment versions inside the caller's transaction."""
+    cursor.executemany(
+        """
+        INSERT INTO child_versions (child_id, version) VALUES (?, 1)
+        ON CONFLICT(child_id) DO UPDATE SET version = version + 1
+    """,
+        [(child_id,) for child_id in set(child_ids)],
+    )
+
+
+def get_child_version(child_id: int) -> int:
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT version FROM child_versions WHERE child_id = ?", (child_id,)
+        ).fetchone()
+    return row[0] if row else 0
+
+
+def make_etag(resource: str, child_id: int, version: int, *variant: object) -> str:
+    """Weak ETag: the same data may be sent with different content codings."""
+    suffix = "".join(f"-{part}" for part in variant)
+    return f'W/"{resource}-{child_id}-{version}{suffix}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+init_versions()
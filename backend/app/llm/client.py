@@ -3,12 +3,23 @@
 import json
 import os
 import re
-from typing import Any, Dict
+from io import BytesIO
+from typing import Any, BinaryIO, Dict
 
 from dotenv import load_dotenv
 from openai import OpenAI
 
-from .prompts import build_system_prompt, build_story_system_prompt, build_task_prompt
+from ..core.metrics import timed
+from .prompt_budget import fit_context, record_prompt
+from .prompts import (
+    STORY_TASK_INSTRUCTIONS,
+    TASK_INSTRUCTIONS,
+    build_story_system_prompt,
+    build_story_task_prompt,
+    build_system_prompt,
+    build_task_prompt,
+)
+from .resilience import call_llm
 
 load_dotenv()
 
@@ -28,7 +39,8 @@ def get_client() -> OpenAI:
     global _client
     if _client is None:
         api_key = get_api_key()
-        _client = OpenAI(api_key=api_key)
+        # Retries are handled by call_llm so they share one deadline and breaker.
+        _client = OpenAI(api_key=api_key, max_retries=0)
     return _client
 
 
@@ -95,6 +107,7 @@ def _has_low_quality_quiz(result: dict, word: str) -> bool:
     return _is_low_quality_quiz_choice(correct_choice, word)
 
 
+@timed("llm.suggest_vocab_corrections")
 def suggest_vocab_corrections(words: list[str]) -> list[str]:
     """Suggest spelling corrections for a list of vocabulary words."""
     if not words:
@@ -112,18 +125,22 @@ Input words:
 {joined}
 """
     try:
-        response = get_client().chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a careful spelling assistant for children vocabulary.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.2,
-            max_tokens=300,
+        response = call_llm(
+            "suggest_corrections",
+            lambda timeout: get_client().chat.completions.create(
+                model=MODEL_NAME,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a careful spelling assistant for children vocabulary.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.2,
+                max_tokens=300,
+                timeout=timeout,
+            ),
         )
         result = json.loads(response.choices[0].message.content.strip())
         suggested = result.get("suggested")
@@ -137,6 +154,7 @@ Input words:
         raise LLMUnavailable(f"Failed to suggest corrections: {str(exc)}")
 
 
+@timed("llm.generate_vocab_exercise")
 def generate_vocab_exercise(
     word: str,
     context: list[str] | None = None,
@@ -145,6 +163,12 @@ def generate_vocab_exercise(
 ) -> Dict[str, Any]:
     """Generate a vocab exercise for `word` using OpenAI."""
     try:
+        context, context_stats = fit_context(context)
+        system_prompt = build_system_prompt(
+            learning_direction=learning_direction,
+            output_style=output_style,
+        )
+        task_prompt = build_task_prompt(word, context=context)
         for attempt in range(2):
             extra_quality_rule = ""
             if attempt == 1:
@@ -158,25 +182,26 @@ def generate_vocab_exercise(
                     "- Never use template quiz choices like 'the meaning of ...'.\n"
                     "- If bilingual, Chinese definition must clearly translate the English meaning.\n"
                 )
-            response = get_client().chat.completions.create(
-                model=MODEL_NAME,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": build_system_prompt(
-                            learning_direction=learning_direction,
-                            output_style=output_style,
-                        ),
-                    },
-                    {
-                        "role": "user",
-                        "content": build_task_prompt(word, context=context)
-                        + extra_quality_rule,
-                    },
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.7,
-                max_tokens=300,
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": task_prompt + extra_quality_rule},
+            ]
+            record_prompt(
+                "vocab_exercise",
+                system_prompt + TASK_INSTRUCTIONS,
+                messages,
+                context_stats,
+            )
+            response = call_llm(
+                "vocab_exercise",
+                lambda timeout: get_client().chat.completions.create(
+                    model=MODEL_NAME,
+                    messages=messages,
+                    response_format={"type": "json_object"},
+                    temperature=0.7,
+                    max_tokens=300,
+                    timeout=timeout,
+                ),
             )
 
             result = json.loads(response.choices[0].message.content.strip())
@@ -221,6 +246,7 @@ def generate_vocab_exercise(
         raise LLMUnavailable(f"Failed to generate exercise: {str(exc)}")
 
 
+@timed("llm.translate_to_chinese")
 def translate_to_chinese(text: str) -> str:
     """Translate a short meaning sentence into natural Chinese."""
     if not text.strip():
@@ -233,17 +259,21 @@ Do not include labels, notes, or quotes.
 Sentence:
 {text}
 """
-        response = get_client().chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a precise English-to-Chinese translator for children.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-            max_tokens=120,
+        response = call_llm(
+            "translate",
+            lambda timeout: get_client().chat.completions.create(
+                model=MODEL_NAME,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a precise English-to-Chinese translator for children.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.2,
+                max_tokens=120,
+                timeout=timeout,
+            ),
         )
         translated = response.choices[0].message.content.strip()
         # Keep only one concise line if the model returns multiple lines.
@@ -255,6 +285,7 @@ Sentence:
         raise LLMUnavailable(f"Failed to translate definition: {str(exc)}")
 
 
+@timed("llm.translate_to_english")
 def translate_to_english(text: str) -> str:
     """Translate a short sentence into natural child-friendly English."""
     if not text.strip():
@@ -267,17 +298,21 @@ Do not include labels, notes, or quotes.
 Sentence:
 {text}
 """
-        response = get_client().chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a precise Chinese-to-English translator for children.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-            max_tokens=120,
+        response = call_llm(
+            "translate",
+            lambda timeout: get_client().chat.completions.create(
+                model=MODEL_NAME,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a precise Chinese-to-English translator for children.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.2,
+                max_tokens=120,
+                timeout=timeout,
+            ),
         )
         translated = response.choices[0].message.content.strip()
         translated = re.split(r"\r?\n", translated)[0].strip()
@@ -288,6 +323,7 @@ Sentence:
         raise LLMUnavailable(f"Failed to translate sentence: {str(exc)}")
 
 
+@timed("llm.generate_example_sentence")
 def generate_example_sentence(word: str, definition: str) -> str:
     """Generate one natural example sentence for a target word."""
     if not word.strip():
@@ -302,17 +338,21 @@ Requirements:
 
 Target word: {word}
 """
-        response = get_client().chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You write short, child-friendly English examples.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-            max_tokens=80,
+        response = call_llm(
+            "example_sentence",
+            lambda timeout: get_client().chat.completions.create(
+                model=MODEL_NAME,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You write short, child-friendly English examples.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.3,
+                max_tokens=80,
+                timeout=timeout,
+            ),
         )
         sentence = response.choices[0].message.content.strip()
         sentence = re.split(r"\r?\n", sentence)[0].strip()
@@ -431,6 +471,7 @@ def _normalize_comprehension_questions(raw_questions: Any, block_count: int) ->
     return normalized
 
 
+@timed("llm.generate_comprehension_exercise")
 def generate_comprehension_exercise(
     theme: str = None,
     level: str = "intermediate",
@@ -460,78 +501,33 @@ def generate_comprehension_exercise(
     config = level_configs.get(level, level_configs["intermediate"])
 
     try:
-        context_block = ""
-        if context:
-            context_lines = "\n".join(f"- {item}" for item in context)
-            context_block = (
-                "\nReference context (use for consistency only; do not copy verbatim):\n"
-                f"{context_lines}\n"
-            )
-
-        prompt = f"""Generate a short, engaging children's story for ages 5-9, followed by 3 multiple-choice comprehension questions.
-
-Requirements:
-- Story should be {config['word_count']} words, {config['complexity']}
-- Story should be split into 4-6 short blocks for early readers
-- Each story block must have:
-  - "english": one short English line
-  - "chinese": one direct Chinese translation line
-- Include 3 key vocabulary words from the story with EN/ZH meaning
-- Questions: {config['question_complexity']}
-- Each question has 3 choices (A, B, C)
-- Each question must include:
-  - "question_type": literal | vocabulary | inference
-  - "explanation_en": one short reason for the answer
-  - "explanation_zh": Chinese translation of the reason
-  - "evidence_block_index": integer index pointing to supporting story block
-- Provide a detailed image description for an illustration of the main scene
-{context_block}
-
-{"Focus on theme: " + theme if theme else "Choose an appropriate theme like animals, family, school, adventure, or friendship."}
+        context, context_stats = fit_context(context)
+        prompt = build_story_task_prompt(config, theme=theme, context=context)
+        system_prompt = build_story_system_prompt(
+            learning_direction=learning_direction,
+            output_style=output_style,
+        )
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt},
+        ]
+        record_prompt(
+            "comprehension_exercise",
+            system_prompt + STORY_TASK_INSTRUCTIONS,
+            messages,
+            context_stats,
+        )
 
-Return JSON with:
-{{
-  "story_title": "Story Title",
-  "story_text": "Optional full story text...",
-  "story_blocks": [
-    {{"english": "Line 1", "chinese": "第1句翻译"}},
-    {{"english": "Line 2", "chinese": "第2句翻译"}}
-  ],
-  "key_vocabulary": [
-    {{"word": "brave", "meaning_en": "showing courage", "meaning_zh": "有勇气的"}},
-    {{"word": "pond", "meaning_en": "a small body of water", "meaning_zh": "池塘"}},
-    {{"word": "proud", "meaning_en": "happy about doing well", "meaning_zh": "自豪的"}}
-  ],
-  "image_description": "Detailed description for illustration...",
-  "questions": [
-    {{
-      "question": "Question 1?",
-      "choices": {{"A": "Option A", "B": "Option B", "C": "Option C"}},
-      "answer": "A",
-      "question_type": "literal",
-      "explanation_en": "Short reason",
-      "explanation_zh": "中文原因",
-      "evidence_block_index": 0
-    }},
-    ...
-  ]
-}}"""
-
-        response = get_client().chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {
-                    "role": "system",
-                    "content": build_story_system_prompt(
-                        learning_direction=learning_direction,
-                        output_style=output_style,
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.8,
-            max_tokens=1000,
+        response = call_llm(
+            "comprehension_exercise",
+            lambda timeout: get_client().chat.completions.create(
+                model=MODEL_NAME,
+                messages=messages,
+                response_format={"type": "json_object"},
+                temperature=0.8,
+                max_tokens=1000,
+                timeout=timeout,
+            ),
         )
 
         result = json.loads(response.choices[0].message.content.strip())
@@ -573,71 +569,96 @@ Return JSON with:
         raise LLMUnavailable(f"Failed to generate comprehension exercise: {str(exc)}")
 
 
-def transcribe_audio(audio_bytes: bytes, filename: str | None = None) -> str:
-    """Transcribe audio using OpenAI Whisper."""
-    try:
-        from io import BytesIO
+@timed("llm.transcribe_audio")
+def transcribe_audio(audio: bytes | BinaryIO, filename: str | None = None) -> str:
+    """Transcribe audio using OpenAI Whisper.
 
-        audio_file = BytesIO(audio_bytes)
-        audio_file.name = filename or "audio.wav"
+    `audio` may be raw bytes or a readable binary file positioned at the start.
+    """
+    try:
+        if isinstance(audio, (bytes, bytearray)):
+            audio = BytesIO(audio)
+
+        start = audio.tell()
+
+        def attempt(timeout: float):
+            # A retry must resend the upload from the beginning.
+            audio.seek(start)
+            return get_client().audio.transcriptions.create(
+                model=TRANSCRIBE_MODEL,
+                file=(filename or "audio.wav", audio),
+                response_format="text",
+                language="en",
+                prompt="Transcribe the spoken words exactly in English. Do not translate.",
+                timeout=timeout,
+            )
 
-        transcript = get_client().audio.transcriptions.create(
-            model=TRANSCRIBE_MODEL,
-            file=audio_file,
-            response_format="text",
-            language="en",
-            prompt="Transcribe the spoken words exactly in English. Do not translate.",
-        )
+        transcript = call_llm("transcribe", attempt)
         return transcript.strip()
     except Exception as exc:
         raise LLMUnavailable(f"Failed to transcribe audio: {str(exc)}")
 
 
+@timed("llm.embed_text")
 def embed_text(text: str) -> list[float]:
     """Create embeddings for a text snippet."""
     try:
-        response = get_client().embeddings.create(
-            model=EMBEDDING_MODEL,
-            input=text,
+        response = call_llm(
+            "embed",
+            lambda timeout: get_client().embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=text,
+                timeout=timeout,
+            ),
         )
         return response.data[0].embedding
     except Exception as exc:
         raise LLMUnavailable(f"Failed to embed text: {str(exc)}")
 
 
+@timed("llm.generate_story_image")
 def generate_story_image(description: str) -> str:
     """Generate an image for a story scene using OpenAI DALL-E."""
     try:
-        response = get_client().images.generate(
-            model=IMAGE_MODEL,
-            prompt=(
-                "Create a colorful, child-friendly illustration for a children's story: "
-                f"{description}. Style: cartoon, bright colors, suitable for ages 5-9."
+        response = call_llm(
+            "image",
+            lambda timeout: get_client().images.generate(
+                model=IMAGE_MODEL,
+                prompt=(
+                    "Create a colorful, child-friendly illustration for a children's story: "
+                    f"{description}. Style: cartoon, bright colors, suitable for ages 5-9."
+                ),
+                size="1024x1024",
+                quality="standard",
+                n=1,
+                timeout=timeout,
             ),
-            size="1024x1024",
-            quality="standard",
-            n=1,
         )
         return response.data[0].url
     except Exception as exc:
         raise LLMUnavailable(f"Failed to generate image: {str(exc)}")
 
 
+@timed("llm.generate_vocab_image")
 def generate_vocab_image(word: str, definition: str) -> str:
     """Generate an educational hint image for a vocabulary word."""
     try:
-        response = get_client().images.generate(
-            model=IMAGE_MODEL,
-            prompt=(
-                "Create a clear, child-friendly picture that helps explain a vocabulary word. "
-                f'Word: "{word}". Meaning: "{definition}". '
-                "Show a concrete scene that represents the meaning. "
-                "Use bright colors and simple composition for ages 5-9. "
-                "Do not include letters, labels, or text in the image."
+        response = call_llm(
+            "image",
+            lambda timeout: get_client().images.generate(
+                model=IMAGE_MODEL,
+                prompt=(
+                    "Create a clear, child-friendly picture that helps explain a vocabulary word. "
+                    f'Word: "{word}". Meaning: "{definition}". '
+                    "Show a concrete scene that represents the meaning. "
+                    "Use bright colors and simple composition for ages 5-9. "
+                    "Do not include letters, labels, or text in the image."
+                ),
+                size="1024x1024",
+                quality="standard",
+                n=1,
+                timeout=timeout,
             ),
-            size="1024x1024",
-            quality="standard",
-            n=1,
         )
         return response.data[0].url
     except Exception as exc:
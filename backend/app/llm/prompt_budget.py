@@ -0,0 +1,168 @@
+"""Token counting and context budgeting for LLM prompts."""
+
+import re
+import threading
+from collections import deque
+from typing import Optional
+
+from ..core.config import env_int
+
+# Snippets that would have to be cut below this size are dropped instead.
+MIN_SNIPPET_TOKENS = 24
+_RECENT_LIMIT = 50
+_FALLBACK_TOKEN = re.compile(r"[A-Za-z]+|\d+|[\u4e00-\u9fff]|[^\sA-Za-z\d]")
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """Return a tiktoken encoding when tiktoken is installed, else None."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+
+                    _encoding = tiktoken.get_encoding("o200k_base")
+                except Exception:
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Count prompt tokens locally.
+
+    Uses tiktoken when available. Otherwise approximates BPE: one token per
+    Chinese character or punctuation mark, and one per four letters of a word.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    total = 0
+    for piece in _FALLBACK_TOKEN.findall(text):
+        total += (len(piece) + 3) // 4 if piece[0].isascii() and piece[0].isalnum() else 1
+    return total
+
+
+def context_token_budget() -> int:
+    return max(0, env_int("GOGOHANNAH_PROMPT_CONTEXT_TOKENS", 300))
+
+
+def _trim_to_tokens(text: str, limit: int) -> str:
+    """Longest prefix of `text` within `limit` tokens, cut at a word boundary."""
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle]) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    cut = text[:low]
+    boundary = cut.rfind(" ")
+    if low < len(text) and boundary > len(cut) * 0.8:
+        cut = cut[:boundary]
+    return cut.rstrip()
+
+
+def fit_context(
+    context: Optional[list[str]],
+    budget: Optional[int] = None,
+) -> tuple[list[str], dict]:
+    """Keep the most relevant RAG snippets that fit within `budget` tokens.
+
+    `context` is expected in relevance order, as returned by
+    `retrieve_context`. Duplicates are dropped, whole snippets are kept while
+    they fit, and the first one that does not fit is trimmed if enough budget
+    remains. Returns the kept snippets and token stats for the request.
+    """
+    limit = context_token_budget() if budget is None else budget
+    snippets = [item.strip() for item in context or [] if item and item.strip()]
+    tokens_in = sum(count_tokens(item) for item in snippets)
+    kept: list[str] = []
+    seen: set[str] = set()
+    used = 0
+    for snippet in snippets:
+        key = " ".join(snippet.casefold().split())
+        if key in seen:
+            continue
+        seen.add(key)
+        size = count_tokens(snippet)
+        remaining = limit - used
+        if size <= remaining:
+            kept.append(snippet)
+            used += size
+            continue
+        if remaining >= MIN_SNIPPET_TOKENS:
+            trimmed = _trim_to_tokens(snippet, remaining)
+            if trimmed:
+                kept.append(trimmed)
+                used += count_tokens(trimmed)
+        break
+    return kept, {
+        "context_snippets_in": len(snippets),
+        "context_snippets_used": len(kept),
+        "context_tokens_in": tokens_in,
+        "context_tokens_used": used,
+        "tokens_saved": tokens_in - used,
+    }
+
+
+_totals: dict[str, dict[str, int]] = {}
+_recent: "deque[dict]" = deque(maxlen=_RECENT_LIMIT)
+_metrics_lock = threading.Lock()
+
+
+def record_prompt(
+    operation: str,
+    static_prefix: str,
+    messages: list[dict],
+    context_stats: dict,
+) -> dict:
+    """Record token usage for one assembled request and return its stats."""
+    stats = {
+        "operation": operation,
+        "prompt_tokens": sum(count_tokens(m.get("content", "")) for m in messages),
+        "static_prefix_tokens": count_tokens(static_prefix),
+        **context_stats,
+    }
+    with _metrics_lock:
+        totals = _totals.setdefault(
+            operation,
+            {
+                "requests": 0,
+                "prompt_tokens": 0,
+                "static_prefix_tokens": 0,
+                "context_tokens_used": 0,
+                "tokens_saved": 0,
+            },
+        )
+        totals["requests"] += 1
+        for field in ("prompt_tokens", "static_prefix_tokens"):
+            totals[field] += stats[field]
+        for field in ("context_tokens_used", "tokens_saved"):
+            totals[field] += stats.get(field, 0)
+        _recent.append(stats)
+    return stats
+
+
+def prompt_metrics() -> dict:
+    """Per-operation token totals and stats for the most recent requests."""
+    with _metrics_lock:
+        return {
+            "tokenizer": "tiktoken" if _get_encoding() is not None else "approximate",
+            "context_token_budget": context_token_budget(),
+            "operations": {name: dict(values) for name, values in _totals.items()},
+            "recent": list(_recent),
+        }
+
+
+def reset_prompt_metrics() -> None:
+    with _metrics_lock:
+        _totals.clear()
+        _recent.clear()
@@ -97,18 +97,89 @@ def _format_context(context: list[str] | None) -> str:
     return f"\nReference context (use for consistency only; do not copy verbatim):\n{lines}\n"
 
 
-def build_task_prompt(word: str, context: list[str] | None = None) -> str:
-    return f"""Target word: "{word}"
-{_format_context(context)}
-Create:
+# Static instructions come first and per-request values last, so the prefix
+# is byte-identical across calls and provider-side prompt caching applies.
+TASK_INSTRUCTIONS = """Create, for the target word given at the end:
 1) a short, simple definition (max 12 words) that explains the real meaning
 2) one example sentence (max 12 words)
 3) a multiple-choice quiz question that asks for the meaning of the target word
 4) 3 choices (A/B/C) where only one choice matches the target word's meaning, and include the correct answer letter
 Important:
-- Do not write placeholder definitions like "{word} is a word to learn."
-- Do not write placeholder examples like "I can use the word {word} today."
-- Make quiz choices meaningful and specific (not templates like "the meaning of {word}").
+- Do not write placeholder definitions like "<word> is a word to learn."
+- Do not write placeholder examples like "I can use the word <word> today."
+- Make quiz choices meaningful and specific (not templates like "the meaning of <word>").
 - In bilingual mode, Chinese definition must clearly translate the English meaning.
 - In bilingual mode, Chinese example and quiz text must clearly translate the English lines.
 """
+
+
+def build_task_prompt(word: str, context: list[str] | None = None) -> str:
+    return f"""{TASK_INSTRUCTIONS}{_format_context(context)}
+Target word: "{word}"
+"""
+
+
+STORY_TASK_INSTRUCTIONS = """Generate a short, engaging children's story for ages 5-9, followed by 3 multiple-choice comprehension questions.
+
+Requirements:
+- Follow the story length, style, question mix and theme in "Story settings" at the end
+- Story should be split into 4-6 short blocks for early readers
+- Each story block must have:
+  - "english": one short English line
+  - "chinese": one direct Chinese translation line
+- Include 3 key vocabulary words from the story with EN/ZH meaning
+- Each question has 3 choices (A, B, C)
+- Each question must include:
+  - "question_type": literal | vocabulary | inference
+  - "explanation_en": one short reason for the answer
+  - "explanation_zh": Chinese translation of the reason
+  - "evidence_block_index": integer index pointing to supporting story block
+- Provide a detailed image description for an illustration of the main scene
+
+Return JSON with:
+{
+  "story_title": "Story Title",
+  "story_text": "Optional full story text...",
+  "story_blocks": [
+    {"english": "Line 1", "chinese": "第1句翻译"},
+    {"english": "Line 2", "chinese": "第2句翻译"}
+  ],
+  "key_vocabulary": [
+    {"word": "brave", "meaning_en": "showing courage", "meaning_zh": "有勇气的"},
+    {"word": "pond", "meaning_en": "a small body of water", "meaning_zh": "池塘"},
+    {"word": "proud", "meaning_en": "happy about doing well", "meaning_zh": "自豪的"}
+  ],
+  "image_description": "Detailed description for illustration...",
+  "questions": [
+    {
+      "question": "Question 1?",
+      "choices": {"A": "Option A", "B": "Option B", "C": "Option C"},
+      "answer": "A",
+      "question_type": "literal",
+      "explanation_en": "Short reason",
+      "explanation_zh": "中文原因",
+      "evidence_block_index": 0
+    },
+    ...
+  ]
+}
+"""
+
+
+def build_story_task_prompt(
+    config: dict,
+    theme: str | None = None,
+    context: list[str] | None = None,
+) -> str:
+    theme_line = (
+        f"Focus on theme: {theme}"
+        if theme
+        else "Choose an appropriate theme like animals, family, school, adventure, or friendship."
+    )
+    return f"""{STORY_TASK_INSTRUCTIONS}{_format_context(context)}
+Story settings:
+- Length: {config['word_count']} words
+- Style: {config['complexity']}
+- Questions: {config['question_complexity']}
+- {theme_line}
+"""
@@ -0,0 +1,339 @@
+"""Deadlines, retries, circuit breaking and hedging for upstream LLM calls."""
+
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Optional, TypeVar
+
+import openai
+
+from ..core.config import env_float, env_int
+
+T = TypeVar("T")
+
+# Seconds allowed for one logical call, including every retry.
+DEFAULT_DEADLINES = {
+    "suggest_corrections": 15.0,
+    "vocab_exercise": 25.0,
+    "translate": 10.0,
+    "example_sentence": 10.0,
+    "comprehension_exercise": 45.0,
+    "transcribe": 30.0,
+    "embed": 8.0,
+    "image": 60.0,
+}
+# Operations sharing an upstream endpoint share a breaker.
+OPERATION_UPSTREAMS = {
+    "suggest_corrections": "chat",
+    "vocab_exercise": "chat",
+    "translate": "chat",
+    "example_sentence": "chat",
+    "comprehension_exercise": "chat",
+    "transcribe": "audio",
+    "embed": "embeddings",
+    "image": "images",
+}
+# Image generation is slow and billed per call, and audio uploads read a
+# shared file object, so neither is hedged.
+_HEDGEABLE_UPSTREAMS = {"chat", "embeddings"}
+
+_TRANSIENT_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    TimeoutError,
+    ConnectionError,
+)
+
+
+class CircuitOpen(Exception):
+    """Raised without calling upstream while its breaker is open."""
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def operation_deadline(operation: str) -> float:
+    default = DEFAULT_DEADLINES.get(operation, 20.0)
+    return env_float(f"GOGOHANNAH_LLM_DEADLINE_{operation.upper()}", default)
+
+
+def max_retries() -> int:
+    return max(0, int(env_float("GOGOHANNAH_LLM_MAX_RETRIES", 2)))
+
+
+def hedge_delay() -> Optional[float]:
+    """Seconds before a hedged duplicate request is sent (None = disabled)."""
+    delay_ms = env_float("GOGOHANNAH_LLM_HEDGE_AFTER_MS", 0)
+    return delay_ms / 1000 if delay_ms > 0 else None
+
+
+def hedge_max_in_flight() -> int:
+    """Hedged duplicates allowed in flight at once, across the process."""
+    return max(1, env_int("GOGOHANNAH_LLM_HEDGE_MAX_IN_FLIGHT", 4))
+
+
+def is_transient(exc: BaseException) -> bool:
+    return isinstance(exc, _TRANSIENT_ERRORS)
+
+
+def backoff_delay(attempt: int, base: float = 0.25, cap: float = 4.0) -> float:
+    """Full-jitter exponential backoff for retry `attempt` (0-based)."""
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.times_opened = 0
+        self.short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.times_opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "times_opened": self.times_opened,
+                "short_circuited": self.short_circuited,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_metrics: dict[str, dict[str, int]] = {}
+_state_lock = threading.Lock()
+_hedge_slots: Optional[threading.BoundedSemaphore] = None
+
+
+def get_breaker(upstream: str) -> CircuitBreaker:
+    with _state_lock:
+        breaker = _breakers.get(upstream)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                upstream,
+                failure_threshold=max(
+                    1, int(env_float("GOGOHANNAH_LLM_BREAKER_FAILURES", 5))
+                ),
+                reset_timeout=env_float("GOGOHANNAH_LLM_BREAKER_RESET_SECONDS", 30),
+            )
+            _breakers[upstream] = breaker
+        return breaker
+
+
+def _count(operation: str, field: str, amount: int = 1) -> None:
+    with _state_lock:
+        counters = _metrics.setdefault(
+            operation,
+            {
+                "calls": 0,
+                "successes": 0,
+                "failures": 0,
+                "retries": 0,
+                "short_circuited": 0,
+                "deadline_exceeded": 0,
+                "hedges": 0,
+                "hedge_wins": 0,
+                "hedges_skipped": 0,
+            },
+        )
+        counters[field] += amount
+
+
+def llm_metrics() -> dict:
+    """Per-operation call/retry counters and per-upstream breaker state."""
+    with _state_lock:
+        operations = {name: dict(values) for name, values in _metrics.items()}
+        breakers = list(_breakers.values())
+    return {
+        "operations": operations,
+        "breakers": {breaker.name: breaker.snapshot() for breaker in breakers},
+    }
+
+
+def reset_llm_state() -> None:
+    global _hedge_slots
+    with _state_lock:
+        _breakers.clear()
+        _metrics.clear()
+        _hedge_slots = None
+
+
+def _get_hedge_slots() -> threading.BoundedSemaphore:
+    global _hedge_slots
+    with _state_lock:
+        if _hedge_slots is None:
+            _hedge_slots = threading.BoundedSemaphore(hedge_max_in_flight())
+        return _hedge_slots
+
+
+def _start(func: Callable[[float], T], timeout: float, on_done=None) -> Future:
+    """Run `func(timeout)` on a new daemon thread that starts immediately."""
+    future: Future = Future()
+
+    def run() -> None:
+        try:
+            future.set_result(func(timeout))
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            if on_done is not None:
+                on_done()
+
+    threading.Thread(target=run, name="llm-call", daemon=True).start()
+    return future
+
+
+def _hedged(operation: str, func: Callable[[float], T], timeout: float, delay: float) -> T:
+    """Run `func`, racing a second copy if the first is slower than `delay`.
+
+    Each copy gets its own thread, so neither waits in a queue and the delay
+    and deadline count from when the primary starts. Hedges are capped by
+    `hedge_max_in_flight()`: when every slot is taken, as it is while the
+    upstream is saturated, the call waits on the primary instead of adding
+    load.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    primary = _start(func, timeout)
+    done, _ = wait([primary], timeout=min(delay, timeout))
+    if done:
+        return primary.result()
+    slots = _get_hedge_slots()
+    pending = {primary}
+    hedge = None
+    if slots.acquire(blocking=False):
+        _count(operation, "hedges")
+        hedge = _start(func, max(0.001, deadline - time.monotonic()), slots.release)
+        pending.add(hedge)
+    else:
+        _count(operation, "hedges_skipped")
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(
+            pending,
+            timeout=max(0.0, deadline - time.monotonic()),
+            return_when=FIRST_COMPLETED,
+        )
+        if not done:
+            break
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    _count(operation, "hedge_wins")
+                return future.result()
+            error = future.exception()
+    if error is not None:
+        raise error
+    raise DeadlineExceeded(f"{operation} exceeded its deadline.")
+
+
+def call_llm(operation: str, func: Callable[[float], T]) -> T:
+    """Call upstream through the shared resilience policy.
+
+    `func` receives the per-attempt timeout in seconds and should pass it to
+    the OpenAI client. Transient errors are retried with jittered
+    exponential backoff while the operation deadline allows; other errors
+    propagate immediately. Raises CircuitOpen without calling upstream when
+    the breaker for the operation's upstream is open.
+    """
+    upstream = OPERATION_UPSTREAMS.get(operation, operation)
+    breaker = get_breaker(upstream)
+    _count(operation, "calls")
+    if not breaker.allow():
+        _count(operation, "short_circuited")
+        raise CircuitOpen(f"{upstream} upstream is unavailable (circuit open).")
+
+    deadline = time.monotonic() + operation_deadline(operation)
+    delay = hedge_delay() if upstream in _HEDGEABLE_UPSTREAMS else None
+    attempt = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            _count(operation, "deadline_exceeded")
+            _count(operation, "failures")
+            breaker.record_failure()
+            raise DeadlineExceeded(f"{operation} exceeded its deadline.")
+        try:
+            if delay is not None:
+                result = _hedged(operation, func, remaining, delay)
+            else:
+                result = func(remaining)
+        except Exception as exc:
+            transient = is_transient(exc) or isinstance(exc, DeadlineExceeded)
+            sleep_for = backoff_delay(attempt)
+            can_retry = (
+                transient
+                and attempt < max_retries()
+                and time.monotonic() + sleep_for < deadline
+            )
+            if not can_retry:
+                _count(operation, "failures")
+                if transient:
+                    breaker.record_failure()
+                else:
+                    # The upstream answered; only the request or payload was bad.
+                    breaker.record_success()
+                raise
+            _count(operation, "retries")
+            attempt += 1
+            time.sleep(sleep_for)
+            continue
+        _count(operation, "successes")
+        breaker.record_success()
+        return result
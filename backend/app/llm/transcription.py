@@ -0,0 +1,188 @@
+"""Pluggable speech-to-text backends for pronunciation assessment."""
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional
+
+from ..core.audio_preprocess import TARGET_SAMPLE_RATE, decode_mono
+from .client import TRANSCRIBE_MODEL, LLMUnavailable, transcribe_audio
+
+
+class TranscriptionBackend(ABC):
+    """A speech-to-text engine.
+
+    Implementations raise LLMUnavailable when they cannot transcribe, so the
+    next backend in the configured order is tried.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def model_id(self) -> str:
+        """Identifies the model behind this backend (used for caching)."""
+
+    @abstractmethod
+    def transcribe(
+        self,
+        audio: BinaryIO,
+        filename: str,
+        target_word: Optional[str] = None,
+    ) -> str:
+        """Return the text spoken in `audio`."""
+
+
+class OpenAITranscriptionBackend(TranscriptionBackend):
+    """Remote Whisper API via llm/client.py."""
+
+    name = "openai"
+
+    def model_id(self) -> str:
+        return f"{self.name}:{TRANSCRIBE_MODEL}"
+
+    def transcribe(
+        self,
+        audio: BinaryIO,
+        filename: str,
+        target_word: Optional[str] = None,
+    ) -> str:
+        return transcribe_audio(audio, filename=filename)
+
+
+class VoskTranscriptionBackend(TranscriptionBackend):
+    """Local CPU recognition with an on-disk Vosk model.
+
+    The model is loaded once and shared; each call gets its own recognizer,
+    so calls can run concurrently on the transcription thread pool. When the
+    target word is known, a grammar restricted to that word is tried first;
+    only if it is not recognized does the open-vocabulary pass run, so the
+    result still reflects what the child actually said.
+    """
+
+    name = "vosk"
+    _UNKNOWN = "[unk]"
+
+    def __init__(self, model_path: Optional[str] = None) -> None:
+        self.model_path = model_path or os.getenv("GOGOHANNAH_VOSK_MODEL_PATH", "")
+        self._model = None
+        self._lock = threading.Lock()
+
+    def model_id(self) -> str:
+        return f"{self.name}:{os.path.basename(self.model_path.rstrip(os.sep))}"
+
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    if not self.model_path or not os.path.isdir(self.model_path):
+                        raise LLMUnavailable("Local speech model is not configured.")
+                    try:
+                        import vosk
+                    except ImportError:
+                        raise LLMUnavailable("Local speech engine is not installed.")
+                    vosk.SetLogLevel(-1)
+                    try:
+                        self._model = vosk.Model(self.model_path)
+                    except Exception as exc:
+                        raise LLMUnavailable(
+                            f"Failed to load local speech model: {str(exc)}"
+                        )
+        return self._model
+
+    def _recognize(self, pcm: bytes, grammar: Optional[list[str]] = None) -> str:
+        import vosk
+
+        model = self._get_model()
+        if grammar:
+            recognizer = vosk.KaldiRecognizer(
+                model, TARGET_SAMPLE_RATE, json.dumps(grammar)
+            )
+        else:
+            recognizer = vosk.KaldiRecognizer(model, TARGET_SAMPLE_RATE)
+        recognizer.AcceptWaveform(pcm)
+        result = json.loads(recognizer.FinalResult())
+        return str(result.get("text", "")).replace(self._UNKNOWN, "").strip()
+
+    def transcribe(
+        self,
+        audio: BinaryIO,
+        filename: str,
+        target_word: Optional[str] = None,
+    ) -> str:
+        model = self._get_model()
+        samples = decode_mono(audio)
+        if samples is None:
+            raise LLMUnavailable("Local speech engine needs PCM WAV audio.")
+        pcm = (samples.clip(-1.0, 1.0) * 32767).astype("<i2").tobytes()
+        try:
+            target = (target_word or "").strip().lower()
+            if target and all(
+                model.find_word(token) != -1 for token in target.split()
+            ):
+                text = self._recognize(pcm, grammar=[target, self._UNKNOWN])
+                if text == target:
+                    return text
+            return self._recognize(pcm)
+        except LLMUnavailable:
+            raise
+        except Exception as exc:
+            raise LLMUnavailable(f"Local transcription failed: {str(exc)}")
+
+
+_BACKEND_TYPES = {
+    OpenAITranscriptionBackend.name: OpenAITranscriptionBackend,
+    VoskTranscriptionBackend.name: VoskTranscriptionBackend,
+}
+_backends: dict[str, TranscriptionBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def configured_backend_names() -> list[str]:
+    """Backend order from `GOGOHANNAH_TRANSCRIBE_BACKENDS` (default `openai`)."""
+    raw = os.getenv("GOGOHANNAH_TRANSCRIBE_BACKENDS", "openai")
+    names = []
+    for name in raw.split(","):
+        name = name.strip().lower()
+        if name in _BACKEND_TYPES and name not in names:
+            names.append(name)
+    return names or ["openai"]
+
+
+def get_backend(name: str) -> TranscriptionBackend:
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            backend = _BACKEND_TYPES[name]()
+            _backends[name] = backend
+        return backend
+
+
+def configured_backends() -> list[TranscriptionBackend]:
+    return [get_backend(name) for name in configured_backend_names()]
+
+
+def configured_model_id() -> str:
+    """Identifies the configured backend chain, for cache keys."""
+    return ",".join(backend.model_id() for backend in configured_backends())
+
+
+def transcribe(
+    audio: BinaryIO,
+    filename: str,
+    target_word: Optional[str] = None,
+) -> tuple[str, str]:
+    """Transcribe with the first configured backend that succeeds.
+
+    Returns the transcription and the name of the backend that produced it.
+    Raises LLMUnavailable when every backend fails.
+    """
+    start = audio.tell()
+    errors = []
+    for backend in configured_backends():
+        audio.seek(start)
+        try:
+            return backend.transcribe(audio, filename, target_word), backend.name
+        except LLMUnavailable as exc:
+            errors.append(f"{backend.name}: {exc}")
+    raise LLMUnavailable("All transcription backends failed. " + "; ".join(errors))
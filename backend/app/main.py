@@ -1,41 +1,105 @@
+import asyncio
 import base64
+import hashlib
 import os
+import time
 import urllib.request
+from contextlib import asynccontextmanager
 from datetime import date
-
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from itertools import islice
+
+from fastapi import (
+    FastAPI,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
 from fastapi.middleware.cors import CORSMiddleware
-
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from .core.audio import (
+    TranscriptionBusy,
+    UploadLimitMiddleware,
+    hash_upload,
+    max_audio_bytes,
+    run_transcription,
+)
+from .core.audio_preprocess import preprocess_audio, preprocess_enabled
+from .core.backup import start_backup_scheduler, stop_backup_scheduler
 from .core.exercise import (
     simple_comprehension_exercise,
     simple_exercise,
     vocab_image_hint_status,
 )
+from .core.metrics import (
+    REQUEST_SECONDS,
+    finish_request,
+    metrics_enabled,
+    render_metrics,
+    server_timing_header,
+    start_request,
+    timed,
+)
 from .core.phonics import phonics_hint
+from .core.scheduler import get_word_schedule, next_words
+from .core.responses import CompressionMiddleware, FastJSONResponse, dumps
+from .core.profiling import (
+    profiler,
+    start_tracemalloc,
+    stop_tracemalloc,
+    take_snapshot,
+    tracemalloc_status,
+)
 from .core.custom_vocab import (
     get_custom_vocab,
     replace_custom_vocab,
     save_custom_vocab,
 )
+from .core.deletion import (
+    get_deletion_status,
+    request_child_deletion,
+    start_deletion_worker,
+    stop_deletion_worker,
+)
 from .core.progress import (
+    EXPORT_BATCH_SIZE,
+    empty_progress,
+    get_bulk_progress,
+    get_children_by_names,
     get_daily_progress,
     get_child_progress,
     get_or_create_child,
+    get_exercise_history,
     get_recent_exercises,
-    get_recommended_words,
+    iter_exercise_history,
     save_exercise,
 )
 from .core.study_time import (
     add_study_time,
+    empty_study_time_summary,
     get_study_time,
+    get_bulk_study_time_summary,
     get_study_time_range,
+    get_study_time_summary,
     get_total_study_time,
-    month_range,
-    week_range,
+    stop_study_time_flusher,
 )
+from .core.versions import etag_matches, get_child_version, make_etag
+from .core.transcription_cache import cache_key as transcription_cache_key
+from .core.transcription_cache import get_cached_transcription, store_transcription
 from .core.rag import debug_enabled, rag_enabled, retrieve_context, store_document
-from .core.safety import sanitize_word
-from .core.scoring import calculate_pronunciation_score
+from .core.safety import sanitize_word, validate_words
+from .core.spelling import correct_words
+from .core.scoring import (
+    SCORING_MODES,
+    calculate_pronunciation_score,
+    score_pronunciation_matrix,
+    score_pronunciation_pairs,
+)
 from .llm.client import (
     LLMUnavailable,
     generate_comprehension_exercise,
@@ -45,9 +109,13 @@ from .llm.client import (
     suggest_vocab_corrections,
     translate_to_chinese,
     translate_to_english,
-    transcribe_audio,
 )
+from .llm.prompt_budget import prompt_metrics
+from .llm.resilience import llm_metrics
+from .llm.transcription import configured_model_id, transcribe
 from .schemas import (
+    BulkProgressRequest,
+    BulkProgressResponse,
     ComprehensionExerciseRequest,
     ComprehensionExerciseResponse,
     CustomVocabAddRequest,
@@ -55,15 +123,21 @@ from .schemas import (
     CustomVocabSuggestRequest,
     CustomVocabSuggestResponse,
     DailyProgressResponse,
+    ExerciseHistoryResponse,
+    ProfileStartRequest,
     PronunciationAudioResponse,
+    PronunciationBatchScoreRequest,
+    PronunciationBatchScoreResponse,
     PronunciationScoreRequest,
     PronunciationScoreResponse,
     RecentExercisesResponse,
     StudyTimeAddRequest,
+    StudyTimePeriodSummary,
     StudyTimeResponse,
     StudyTimeSummaryResponse,
     StudyTimeTotalResponse,
     SaveExerciseRequest,
+    TracemallocStartRequest,
     VocabExerciseRequest,
     VocabExerciseResponse,
     VocabImageHintRequest,
@@ -71,7 +145,19 @@ from .schemas import (
 )
 from .vocab.loader import load_default_vocab
 
-app = FastAPI(title="GoGoHannah API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_backup_scheduler()
+    # Resumes child deletions interrupted by the last shutdown.
+    start_deletion_worker()
+    yield
+    await asyncio.to_thread(stop_backup_scheduler)
+    await asyncio.to_thread(stop_deletion_worker)
+    # Persist buffered study-time heartbeats before the worker exits.
+    await asyncio.to_thread(stop_study_time_flusher)
+
+
+app = FastAPI(title="GoGoHannah API", version="0.1.0", lifespan=lifespan)
 
 
 def _cors_origins() -> list[str]:
@@ -88,6 +174,33 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(UploadLimitMiddleware, paths=["/v1/pronunciation/assess"])
+
+
+@app.middleware("http")
+async def request_timing(request: Request, call_next):
+    token = start_request()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - started
+        spans = finish_request(token)
+        profiler.request_finished(request.url.path)
+        route = request.scope.get("route")
+        # Label by route template so path parameters do not explode cardinality.
+        REQUEST_SECONDS.observe(
+            elapsed,
+            request.method,
+            getattr(route, "path", "unmatched"),
+            str(status),
+        )
+    if debug_enabled():
+        response.headers["Server-Timing"] = server_timing_header(spans, elapsed)
+    return response
 
 
 def _generate_vocab_result(
@@ -140,6 +253,7 @@ def _split_bilingual_lines(text: str) -> tuple[str | None, str | None]:
     return english, chinese
 
 
+@timed("repair.ensure_bilingual")
 def _ensure_bilingual_text(
     text: str,
     fallback_text: str,
@@ -176,6 +290,7 @@ def _looks_template_definition(text: str) -> bool:
     return any(pattern in normalized for pattern in template_patterns)
 
 
+@timed("repair.definition")
 def _repair_definition_text(
     definition_text: str,
     quiz_choices: dict,
@@ -252,6 +367,7 @@ def _format_bilingual_output(
     return f"{english}\n{chinese}"
 
 
+@timed("repair.example")
 def _repair_example_text(
     example_text: str,
     definition_text: str,
@@ -298,6 +414,7 @@ def _repair_example_text(
     return _format_bilingual_output(english, chinese, learning_direction)
 
 
+@timed("repair.quiz")
 def _repair_quiz_text(
     word: str,
     quiz_question: str,
@@ -417,6 +534,7 @@ def _normalize_bilingual_line(
     return _format_bilingual_output(english, chinese, learning_direction)
 
 
+@timed("repair.story_blocks")
 def _normalize_story_blocks(
     raw_blocks: list | None,
     story_text: str,
@@ -484,6 +602,7 @@ def _default_question_explanation(question_type: str) -> str:
     return "Find the exact clue sentence in the story."
 
 
+@timed("repair.questions")
 def _normalize_comprehension_questions(
     raw_questions: list | None,
     fallback_questions: list,
@@ -586,6 +705,7 @@ def _normalize_comprehension_questions(
     return normalized
 
 
+@timed("repair.key_vocabulary")
 def _normalize_key_vocabulary(
     raw_vocab: list | None,
     fallback_vocab: list,
@@ -617,6 +737,15 @@ def _normalize_key_vocabulary(
     return normalized
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    if not metrics_enabled():
+        raise HTTPException(status_code=404, detail="Metrics disabled.")
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.get("/healthz")
 def healthz() -> dict:
     return {"status": "ok"}
@@ -627,28 +756,47 @@ def vocab_default() -> dict:
     return {"words": load_default_vocab()}
 
 
+def _check_etag(request: Request, response: Response, etag: str):
+    """Tag the response, or return a 304 when the client already has it.
+
+    Callers read the version before the data, so a write landing in between
+    pairs newer data with an older tag; the next poll then refetches.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    response.headers.update(headers)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return None
+
+
 @app.get("/v1/vocab/custom", response_model=CustomVocabResponse)
-def vocab_custom(child_name: str) -> dict:
+def vocab_custom(child_name: str, request: Request, response: Response):
     child_id = get_or_create_child(child_name.strip())
+    etag = make_etag("vocab", child_id, get_child_version(child_id))
+    not_modified = _check_etag(request, response, etag)
+    if not_modified is not None:
+        return not_modified
     words = get_custom_vocab(child_id)
     return {"words": words, "count": len(words)}
 
 
 @app.post("/v1/vocab/custom/add", response_model=CustomVocabResponse)
 def vocab_custom_add(payload: CustomVocabAddRequest) -> dict:
+    validation = validate_words(payload.words)
+    sanitized = validation["accepted"]
+    if not sanitized:
+        raise HTTPException(
+            status_code=400,
+            detail="No valid words. Use only letters, Chinese characters, spaces, - or '. "
+            "Max 32 chars.",
+        )
     child_id = get_or_create_child(payload.child_name.strip())
-    sanitized = []
-    for word in payload.words:
-        try:
-            sanitized.append(sanitize_word(word))
-        except ValueError as exc:
-            raise HTTPException(status_code=400, detail=str(exc))
     mode = (payload.mode or "append").lower()
     if mode == "replace":
         saved = replace_custom_vocab(child_id, sanitized, payload.list_name)
     else:
         saved = save_custom_vocab(child_id, sanitized, payload.list_name)
-    return {"words": saved, "count": len(saved)}
+    return {"words": saved, "count": len(saved), "rejected": validation["errors"]}
 
 
 @app.post("/v1/vocab/custom/suggest", response_model=CustomVocabSuggestResponse)
@@ -656,12 +804,19 @@ def vocab_custom_suggest(payload: CustomVocabSuggestRequest) -> dict:
     words = [word.strip() for word in payload.words if word.strip()]
     if not words:
         return {"original": [], "suggested": [], "changed": False}
-    try:
-        suggested = suggest_vocab_corrections(words)
-    except LLMUnavailable:
-        suggested = words
-    if len(suggested) != len(words):
-        suggested = words
+    suggested = correct_words(words)
+    unresolved = [index for index, word in enumerate(suggested) if word is None]
+    if unresolved:
+        # Only words the local engine cannot resolve are sent to the LLM.
+        pending = [words[index] for index in unresolved]
+        try:
+            llm_suggested = suggest_vocab_corrections(pending)
+        except LLMUnavailable:
+            llm_suggested = pending
+        if len(llm_suggested) != len(pending):
+            llm_suggested = pending
+        for index, word in zip(unresolved, llm_suggested):
+            suggested[index] = word
     changed = any(orig != new for orig, new in zip(words, suggested))
     return {
         "original": words,
@@ -865,11 +1020,11 @@ def comprehension_exercise(payload: ComprehensionExerciseRequest) -> dict:
     )
 
     response = {
-        "story_title": result["story_title"],
+        "story_title": str(result["story_title"]),
         "story_text": composed_story_text or cleaned_story_text,
         "story_blocks": story_blocks,
         "key_vocabulary": key_vocabulary,
-        "image_description": result["image_description"],
+        "image_description": str(result["image_description"]),
         "image_url": None,
         "questions": questions,
         "source": source,
@@ -886,7 +1041,8 @@ def comprehension_exercise(payload: ComprehensionExerciseRequest) -> dict:
         metadata={"level": payload.level, "theme": payload.theme, "source": source},
     )
 
-    return response
+    # Every field above is normalized already; skip response_model re-validation.
+    return FastJSONResponse(response)
 
 
 def _inline_image_data(url: str) -> str | None:
@@ -915,6 +1071,67 @@ def rag_debug(query: str, child_name: str | None = None, limit: int = 5) -> dict
         "message": None if rag_enabled() else "RAG disabled.",
     }
 
+@app.get("/v1/debug/llm")
+def llm_debug() -> dict:
+    if not debug_enabled():
+        raise HTTPException(status_code=404, detail="Debug endpoint disabled.")
+    return {**llm_metrics(), "prompts": prompt_metrics()}
+
+
+def _require_debug() -> None:
+    if not debug_enabled():
+        raise HTTPException(status_code=404, detail="Debug endpoint disabled.")
+
+
+@app.post("/v1/debug/profile/start")
+def profile_start(payload: ProfileStartRequest) -> dict:
+    _require_debug()
+    try:
+        return profiler.start(
+            seconds=payload.seconds,
+            requests=payload.requests,
+            interval_ms=payload.interval_ms,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.post("/v1/debug/profile/stop")
+def profile_stop() -> dict:
+    _require_debug()
+    return profiler.stop()
+
+
+@app.get("/v1/debug/profile")
+def profile_result(
+    output_format: str = Query("json", alias="format"), limit: int = 20
+):
+    """Current or last profile; `format=collapsed` returns folded stacks."""
+    _require_debug()
+    if output_format == "collapsed":
+        return PlainTextResponse(profiler.collapsed())
+    return {**profiler.status(), "top_functions": profiler.top_functions(limit)}
+
+
+@app.post("/v1/debug/tracemalloc/start")
+def tracemalloc_start(payload: TracemallocStartRequest) -> dict:
+    _require_debug()
+    return start_tracemalloc(payload.frames)
+
+
+@app.post("/v1/debug/tracemalloc/stop")
+def tracemalloc_stop() -> dict:
+    _require_debug()
+    return stop_tracemalloc()
+
+
+@app.get("/v1/debug/tracemalloc")
+def tracemalloc_snapshot(limit: int = 20) -> dict:
+    _require_debug()
+    if not tracemalloc_status()["tracing"]:
+        raise HTTPException(status_code=400, detail="tracemalloc is not running.")
+    return take_snapshot(limit)
+
 @app.post("/v1/progress/exercise")
 def progress_save(payload: SaveExerciseRequest) -> dict:
     try:
@@ -935,19 +1152,64 @@ def progress_save(payload: SaveExerciseRequest) -> dict:
 
 
 @app.get("/v1/progress/summary")
-def progress_summary(child_name: str) -> dict:
+def progress_summary(child_name: str, request: Request, response: Response):
     child_id = get_or_create_child(child_name.strip())
-    return get_child_progress(child_id)
+    etag = make_etag("summary", child_id, get_child_version(child_id))
+    not_modified = _check_etag(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+    return FastJSONResponse(get_child_progress(child_id), headers=response.headers)
 
 
 @app.get("/v1/progress/recent", response_model=RecentExercisesResponse)
-def progress_recent(child_name: str, limit: int = 20) -> dict:
+def progress_recent(child_name: str, request: Request, response: Response, limit: int = 20):
     child_id = get_or_create_child(child_name.strip())
+    etag = make_etag("recent", child_id, get_child_version(child_id), limit)
+    not_modified = _check_etag(request, response, etag)
+    if not_modified is not None:
+        return not_modified
     return {"exercises": get_recent_exercises(child_id, limit)}
 
 
+@app.get("/v1/progress/history", response_model=ExerciseHistoryResponse)
+def progress_history(child_name: str, limit: int = 50, cursor: str | None = None) -> dict:
+    """Exercise history, newest first. Pass `next_cursor` back for the next page."""
+    child_id = get_or_create_child(child_name.strip())
+    try:
+        exercises, next_cursor = get_exercise_history(child_id, limit, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"exercises": exercises, "next_cursor": next_cursor}
+
+
+@app.get("/v1/progress/history/export")
+def progress_history_export(child_name: str):
+    """Full exercise history as NDJSON, oldest first, one exercise per line."""
+    child_id = get_or_create_child(child_name.strip())
+
+    def lines():
+        # One chunk per batch: each chunk is a threadpool hop for a sync iterator.
+        rows = iter_exercise_history(child_id)
+        while batch := list(islice(rows, EXPORT_BATCH_SIZE)):
+            yield b"".join(dumps(row) + b"\n" for row in batch)
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="history-{child_id}.ndjson"'
+        },
+    )
+
+
 @app.get("/v1/progress/daily", response_model=DailyProgressResponse)
-def progress_daily(child_name: str, days: int = 30, daily_goal: int = 3) -> dict:
+def progress_daily(
+    child_name: str,
+    request: Request,
+    response: Response,
+    days: int = 30,
+    daily_goal: int = 3,
+):
     if days < 1 or days > 365:
         raise HTTPException(status_code=400, detail="days must be between 1 and 365.")
     if daily_goal < 1 or daily_goal > 50:
@@ -955,7 +1217,94 @@ def progress_daily(child_name: str, days: int = 30, daily_goal: int = 3) -> dict
             status_code=400, detail="daily_goal must be between 1 and 50."
         )
     child_id = get_or_create_child(child_name.strip())
-    return get_daily_progress(child_id=child_id, daily_goal=daily_goal, days=days)
+    # Streaks and the history window move at midnight even without writes.
+    etag = make_etag(
+        "daily",
+        child_id,
+        get_child_version(child_id),
+        days,
+        daily_goal,
+        date.today().isoformat(),
+    )
+    not_modified = _check_etag(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+    # Built from typed SQL aggregates, so skip response_model re-validation.
+    return FastJSONResponse(
+        get_daily_progress(child_id=child_id, daily_goal=daily_goal, days=days),
+        headers=response.headers,
+    )
+
+
+BULK_STREAM_THRESHOLD = 50
+BULK_CHUNK_SIZE = 50
+
+
+def _bulk_progress_chunks(
+    names: list[str],
+    payload: BulkProgressRequest,
+    study_date: date,
+):
+    """Yield per-child progress rows, computing BULK_CHUNK_SIZE children at a time."""
+    # Unknown names get zeroed shapes; a read never creates a child.
+    empty = empty_progress(daily_goal=payload.daily_goal, days=payload.days)
+    empty_study = empty_study_time_summary(study_date)
+    for offset in range(0, len(names), BULK_CHUNK_SIZE):
+        chunk = names[offset : offset + BULK_CHUNK_SIZE]
+        ids = get_children_by_names(chunk)
+        known_ids = list(ids.values())
+        progress = get_bulk_progress(
+            known_ids, daily_goal=payload.daily_goal, days=payload.days
+        )
+        study = get_bulk_study_time_summary(known_ids, study_date)
+        rows = []
+        for name in chunk:
+            child_id = ids.get(name)
+            entry = progress.get(child_id, empty)
+            daily = dict(entry["daily"])
+            if not payload.include_history:
+                daily["history"] = []
+            rows.append(
+                {
+                    "child_name": name,
+                    "known": child_id is not None,
+                    "summary": entry["summary"],
+                    "daily": daily,
+                    "study_time": study.get(child_id, empty_study),
+                }
+            )
+        yield rows
+
+
+@app.post("/v1/progress/bulk", response_model=BulkProgressResponse)
+def progress_bulk(payload: BulkProgressRequest):
+    """Progress, streaks and study time for a whole class.
+
+    Large classes (or `stream: true`) get NDJSON, one child per line.
+    """
+    if payload.date:
+        try:
+            study_date = date.fromisoformat(payload.date)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format.")
+    else:
+        study_date = date.today()
+    names = list(dict.fromkeys(name.strip() for name in payload.child_names if name.strip()))
+    if not names:
+        raise HTTPException(status_code=400, detail="No child names given.")
+
+    stream = payload.stream
+    if stream is None:
+        stream = len(names) > BULK_STREAM_THRESHOLD
+    if not stream:
+        chunks = _bulk_progress_chunks(names, payload, study_date)
+        return {"children": [row for chunk in chunks for row in chunk]}
+
+    def lines():
+        for chunk in _bulk_progress_chunks(names, payload, study_date):
+            yield b"".join(dumps(row) + b"\n" for row in chunk)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @app.post("/v1/progress/time", response_model=StudyTimeResponse)
@@ -998,30 +1347,77 @@ def progress_time_summary(child_name: str, date_str: str | None = None) -> dict:
         study_date = date.today()
         date_str = study_date.isoformat()
     child_id = get_or_create_child(child_name.strip())
-    week_start, week_end = week_range(study_date)
-    month_start, month_end = month_range(study_date)
-    week_total = get_study_time_range(child_id, week_start, week_end)
-    month_total = get_study_time_range(child_id, month_start, month_end)
+    return {"date": date_str, **get_study_time_summary(child_id, study_date)}
+
+
+@app.get("/v1/progress/time/range", response_model=StudyTimePeriodSummary)
+def progress_time_range(child_name: str, start_date: str, end_date: str) -> dict:
+    try:
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format.")
+    if end < start:
+        raise HTTPException(status_code=400, detail="end_date is before start_date.")
+    child_id = get_or_create_child(child_name.strip())
     return {
-        "date": date_str,
-        "week": {
-            "start_date": week_start.isoformat(),
-            "end_date": week_end.isoformat(),
-            "total_seconds": week_total,
-        },
-        "month": {
-            "start_date": month_start.isoformat(),
-            "end_date": month_end.isoformat(),
-            "total_seconds": month_total,
-        },
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "total_seconds": get_study_time_range(child_id, start, end),
     }
 
 
 @app.get("/v1/progress/recommended")
-def progress_recommended(child_name: str, limit: int = 10) -> dict:
+def progress_recommended(
+    child_name: str,
+    limit: int = 10,
+    source: str = "default",
+    list_name: str | None = None,
+) -> dict:
+    """Next words to practise from the spaced-repetition schedule.
+
+    `source` picks the candidates: `default` vocabulary, the child's `custom`
+    words (optionally one `list_name`), or `all` (custom first).
+    """
+    if source not in {"default", "custom", "all"}:
+        raise HTTPException(
+            status_code=400, detail="source must be default, custom or all."
+        )
+    if limit < 1 or limit > 100:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 100.")
+    child_id = get_or_create_child(child_name.strip())
+    words: list[str] = []
+    if source in {"custom", "all"}:
+        words.extend(get_custom_vocab(child_id, list_name))
+    if source in {"default", "all"}:
+        words.extend(load_default_vocab())
+    return {"words": next_words(child_id, words, limit)}
+
+
+@app.get("/v1/progress/schedule")
+def progress_schedule(child_name: str, limit: int = 50) -> dict:
+    """Scheduled words with their ease, interval and due time, soonest first."""
     child_id = get_or_create_child(child_name.strip())
-    words = load_default_vocab()
-    return {"words": get_recommended_words(child_id, words, limit)}
+    return {"words": get_word_schedule(child_id, max(1, min(limit, 500)))}
+
+
+@app.delete("/v1/progress/child", status_code=202)
+def progress_delete_child(child_name: str) -> dict:
+    """Delete a child and all their data; the purge finishes in the background."""
+    name = child_name.strip()
+    child_id = get_children_by_names([name]).get(name)
+    if child_id is None:
+        raise HTTPException(status_code=404, detail="Unknown child.")
+    return request_child_deletion(child_id)
+
+
+@app.get("/v1/progress/deletion")
+def progress_deletion_status(child_id: int) -> dict:
+    """Progress of a deletion job, by the child id the delete returned."""
+    status = get_deletion_status(child_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="No deletion for this child.")
+    return status
 
 
 @app.post("/v1/pronunciation/score", response_model=PronunciationScoreResponse)
@@ -1031,29 +1427,141 @@ def pronunciation_score(payload: PronunciationScoreRequest) -> dict:
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    score = calculate_pronunciation_score(payload.user_text, target_word)
+    score = calculate_pronunciation_score(
+        payload.user_text, target_word, mode=payload.mode
+    )
     return {"score": score}
 
 
+@app.post(
+    "/v1/pronunciation/score:batch", response_model=PronunciationBatchScoreResponse
+)
+def pronunciation_score_batch(payload: PronunciationBatchScoreRequest) -> dict:
+    matrix_mode = payload.user_texts is not None or payload.target_words is not None
+    if (payload.items is None) == (not matrix_mode):
+        raise HTTPException(
+            status_code=400,
+            detail="Provide either items or user_texts with target_words.",
+        )
+    if payload.items is not None:
+        # Each item's own mode wins over the batch default; score each mode
+        # as one batch and put the results back in request order.
+        groups: dict[str | None, list[tuple[int, tuple[str, str]]]] = {}
+        for index, item in enumerate(payload.items):
+            try:
+                pair = (item.user_text, sanitize_word(item.target_word))
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=f"items[{index}]: {exc}")
+            groups.setdefault(item.mode or payload.mode, []).append((index, pair))
+        scores = [0] * len(payload.items)
+        for mode, entries in groups.items():
+            group_scores = score_pronunciation_pairs(
+                [pair for _, pair in entries], mode=mode
+            )
+            for (index, _), score in zip(entries, group_scores):
+                scores[index] = score
+        return {"scores": scores}
+
+    if not payload.user_texts or not payload.target_words:
+        raise HTTPException(
+            status_code=400,
+            detail="user_texts and target_words must both be non-empty.",
+        )
+    target_words = []
+    for index, target_word in enumerate(payload.target_words):
+        try:
+            target_words.append(sanitize_word(target_word))
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=400, detail=f"target_words[{index}]: {exc}"
+            )
+    return {
+        "matrix": score_pronunciation_matrix(
+            payload.user_texts, target_words, mode=payload.mode
+        )
+    }
+
+
 @app.post("/v1/pronunciation/assess", response_model=PronunciationAudioResponse)
 async def pronunciation_assess(
+    request: Request,
     target_word: str = Form(...),
     audio: UploadFile = File(...),
+    mode: str | None = Form(None),
 ) -> dict:
     try:
         word = sanitize_word(target_word)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
-
-    audio_bytes = await audio.read()
-    if not audio_bytes:
+    if mode and mode not in SCORING_MODES:
+        raise HTTPException(status_code=400, detail="Invalid scoring mode.")
+
+    # UploadLimitMiddleware has already capped the body; this trims the
+    # allowance it leaves for the multipart framing.
+    if audio.size is not None and audio.size > max_audio_bytes():
+        raise HTTPException(status_code=413, detail="Audio file is too large.")
+
+    timings = {}
+    # Receiving and spooling the body happens before this handler runs;
+    # UploadLimitMiddleware times it.
+    upload_ms = getattr(request.state, "upload_ms", None)
+    if upload_ms is not None:
+        timings["upload"] = upload_ms
+    started = time.perf_counter()
+    digest = hashlib.sha256()
+    size = await asyncio.to_thread(hash_upload, audio.file, digest)
+    timings["hash"] = _elapsed_ms(started)
+    if not size:
         raise HTTPException(status_code=400, detail="Audio file is empty.")
 
+    # Client retries re-upload identical audio; reuse the transcription.
+    key = transcription_cache_key(digest.hexdigest(), word, configured_model_id())
+    cached = await asyncio.to_thread(get_cached_transcription, key)
+    if cached is not None:
+        transcription, backend = cached
+        score = calculate_pronunciation_score(transcription, word, mode=mode)
+        return {
+            "transcription": transcription,
+            "score": score,
+            "timings_ms": timings,
+            "transcription_backend": backend,
+            "cached": True,
+        }
+
+    started = time.perf_counter()
+    payload = audio.file
+    filename = audio.filename or "audio.wav"
+    if preprocess_enabled():
+        # Non-WAV uploads (e.g. web recordings) come back as None and
+        # are forwarded unchanged.
+        processed = await asyncio.to_thread(preprocess_audio, audio.file)
+        if processed is not None:
+            payload = processed
+            filename = "audio.wav"
+    timings["transcode"] = _elapsed_ms(started)
+
+    started = time.perf_counter()
     try:
-        transcription = transcribe_audio(audio_bytes, filename=audio.filename)
+        transcription, backend = await run_transcription(
+            transcribe, payload, filename, word
+        )
+    except TranscriptionBusy as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
     except LLMUnavailable as exc:
         raise HTTPException(status_code=503, detail=str(exc))
+    timings["transcribe"] = _elapsed_ms(started)
+    await asyncio.to_thread(store_transcription, key, transcription, backend)
+
+    score = calculate_pronunciation_score(transcription, word, mode=mode)
+
+    return {
+        "transcription": transcription,
+        "score": score,
+        "timings_ms": timings,
+        "transcription_backend": backend,
+        "cached": False,
+    }
 
-    score = calculate_pronunciation_score(transcription, word)
 
-    return {"transcription": transcription, "score": score}
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
@@ -1,4 +1,4 @@
-from typing import Dict, Optional, Literal
+from typing import Any, Dict, Optional, Literal
 
 from pydantic import BaseModel, Field
 
@@ -32,9 +32,17 @@ class VocabImageHintResponse(BaseModel):
     image_url: Optional[str] = None
 
 
+class CustomVocabRejectedWord(BaseModel):
+    index: int
+    word: str
+    code: Literal["empty", "too_long", "invalid_characters", "duplicate"]
+    message: str
+
+
 class CustomVocabResponse(BaseModel):
     words: list[str]
     count: int
+    rejected: list[CustomVocabRejectedWord] = Field(default_factory=list)
 
 
 class CustomVocabAddRequest(BaseModel):
@@ -105,6 +113,15 @@ class RecentExercisesResponse(BaseModel):
     exercises: list[RecentExercise]
 
 
+class ExerciseHistoryItem(RecentExercise):
+    id: int
+
+
+class ExerciseHistoryResponse(BaseModel):
+    exercises: list[ExerciseHistoryItem]
+    next_cursor: Optional[str] = None
+
+
 class DailyProgressEntry(BaseModel):
     date: str
     completed: int
@@ -142,10 +159,36 @@ class StudyTimePeriodSummary(BaseModel):
     total_seconds: int
 
 
-class StudyTimeSummaryResponse(BaseModel):
-    date: str
+class StudyTimeTotals(BaseModel):
     week: StudyTimePeriodSummary
     month: StudyTimePeriodSummary
+    total_seconds: int = 0
+
+
+class StudyTimeSummaryResponse(StudyTimeTotals):
+    date: str
+
+
+class BulkProgressRequest(BaseModel):
+    child_names: list[str] = Field(..., min_items=1, max_items=1000)
+    daily_goal: int = Field(3, ge=1, le=50)
+    days: int = Field(30, ge=1, le=365)
+    date: Optional[str] = Field(None, max_length=10)
+    include_history: bool = False
+    # None streams automatically for large classes.
+    stream: Optional[bool] = None
+
+
+class BulkChildProgress(BaseModel):
+    child_name: str
+    known: bool
+    summary: Dict[str, Any]
+    daily: DailyProgressResponse
+    study_time: StudyTimeTotals
+
+
+class BulkProgressResponse(BaseModel):
+    children: list[BulkChildProgress]
 
 
 class SaveExerciseRequest(BaseModel):
@@ -159,12 +202,42 @@ class SaveExerciseRequest(BaseModel):
 class PronunciationScoreRequest(BaseModel):
     target_word: str = Field(..., min_length=1, max_length=32)
     user_text: str = Field(..., min_length=1, max_length=128)
+    mode: Optional[Literal["spelling", "phoneme"]] = None
 
 
 class PronunciationScoreResponse(BaseModel):
     score: int
 
 
+class PronunciationBatchScoreRequest(BaseModel):
+    """Either `items` (pairwise) or `user_texts` x `target_words` (matrix)."""
+
+    items: Optional[list[PronunciationScoreRequest]] = Field(None, max_items=1000)
+    user_texts: Optional[list[str]] = Field(None, max_items=1000)
+    target_words: Optional[list[str]] = Field(None, max_items=100)
+    mode: Optional[Literal["spelling", "phoneme"]] = None
+
+
+class PronunciationBatchScoreResponse(BaseModel):
+    scores: Optional[list[int]] = None
+    matrix: Optional[list[list[int]]] = None
+
+
 class PronunciationAudioResponse(BaseModel):
     transcription: str
     score: int
+    timings_ms: Optional[Dict[str, float]] = None
+    transcription_backend: Optional[str] = None
+    cached: bool = False
+
+
+class ProfileStartRequest(BaseModel):
+    """Profile for `seconds`, or until `requests` more requests finish."""
+
+    seconds: Optional[float] = Field(None, gt=0, le=300)
+    requests: Optional[int] = Field(None, ge=1, le=10000)
+    interval_ms: float = Field(5.0, ge=1, le=1000)
+
+
+class TracemallocStartRequest(BaseModel):
+    frames: int = Field(10, ge=1, le=50)
@@ -1,29 +1,122 @@
+import codecs
+import csv
+import io
 from pathlib import Path
-
-import pandas as pd
+from typing import Iterable, Iterator, Optional
 
 from ..core.safety import sanitize_word
 
 DEFAULT_VOCAB_PATH = Path(__file__).parent / "default_vocab.csv"
+ENGLISH_WORDS_PATH = Path(__file__).parent / "english_words.txt"
+PRONUNCIATIONS_PATH = Path(__file__).parent / "pronunciations.txt"
+HEADER_NAME = "word"
 
 
 def load_default_vocab() -> list[str]:
     """Load the built-in vocabulary list."""
-    df = pd.read_csv(DEFAULT_VOCAB_PATH)
-    words = df["word"].dropna().astype(str).str.strip().tolist()
-    return [sanitize_word(word) for word in words]
+    return load_vocab_from_csv(DEFAULT_VOCAB_PATH)
+
+
+def load_english_words() -> list[str]:
+    """Load the bundled common-English word list, most frequent first."""
+    with open(ENGLISH_WORDS_PATH, encoding="utf-8") as handle:
+        return [
+            line.strip()
+            for line in handle
+            if line.strip() and not line.startswith("#")
+        ]
+
+
+def load_pronunciations() -> dict[str, list[tuple[str, ...]]]:
+    """Load the bundled pronunciation dictionary as word -> phoneme sequences."""
+    pronunciations: dict[str, list[tuple[str, ...]]] = {}
+    with open(PRONUNCIATIONS_PATH, encoding="utf-8") as handle:
+        for line in handle:
+            if line.startswith("#"):
+                continue
+            parts = line.split()
+            if len(parts) >= 2:
+                pronunciations.setdefault(parts[0], []).append(tuple(parts[1:]))
+    return pronunciations
 
 
 def load_vocab_from_csv(uploaded_file) -> list[str]:
     """Load vocabulary list from an uploaded CSV.
 
     Accepts either a 'word' header column or a single-column headerless CSV.
+
+    Raises:
+        ValueError on the first row holding an invalid word.
+    """
+    words = []
+    for row in iter_vocab_csv(uploaded_file):
+        if row["error"]:
+            raise ValueError(f"Row {row['row']}: {row['error']}")
+        words.append(row["word"])
+    return words
+
+
+def load_vocab_from_csv_report(uploaded_file) -> tuple[list[str], list[dict]]:
+    """Load an uploaded CSV, collecting invalid rows instead of failing.
+
+    Returns the accepted words and a list of `{row, value, error}` entries.
+    """
+    words = []
+    errors = []
+    for row in iter_vocab_csv(uploaded_file):
+        if row["error"]:
+            errors.append(
+                {"row": row["row"], "value": row["value"], "error": row["error"]}
+            )
+        else:
+            words.append(row["word"])
+    return words, errors
+
+
+def iter_vocab_csv(uploaded_file) -> Iterator[dict]:
+    """Stream vocabulary rows from a CSV path or file object.
+
+    Yields one `{row, value, word, error}` dict per non-empty cell, where
+    `row` is the 1-based line in the file, `word` is the sanitized word (or
+    None) and `error` is the validation message (or None). Rows are read
+    and sanitized one at a time, so memory use does not grow with file size.
     """
-    df = pd.read_csv(uploaded_file)
-    if "word" in df.columns:
-        words = df["word"].dropna().astype(str).str.strip().tolist()
-    elif len(df.columns) >= 1:
-        words = df.iloc[:, 0].dropna().astype(str).str.strip().tolist()
-    else:
-        raise ValueError("CSV must include at least one column of words.")
-    return [sanitize_word(word) for word in words]
+    if isinstance(uploaded_file, (str, Path)):
+        with open(uploaded_file, newline="", encoding="utf-8-sig") as handle:
+            yield from _iter_rows(handle)
+        return
+    yield from _iter_rows(_as_text_stream(uploaded_file))
+
+
+def _as_text_stream(uploaded_file) -> Iterable[str]:
+    if isinstance(uploaded_file, (bytes, bytearray)):
+        uploaded_file = io.BytesIO(uploaded_file)
+    if hasattr(uploaded_file, "read") and isinstance(uploaded_file.read(0), bytes):
+        # Decode line by line so binary uploads never load fully into memory.
+        return codecs.iterdecode(uploaded_file, "utf-8-sig")
+    return uploaded_file
+
+
+def _iter_rows(lines: Iterable[str]) -> Iterator[dict]:
+    reader = csv.reader(lines)
+    column: Optional[int] = None
+    for cells in reader:
+        cells = [cell.strip() for cell in cells]
+        if column is None:
+            if not any(cells):
+                continue
+            lowered = [cell.lower() for cell in cells]
+            if HEADER_NAME in lowered:
+                column = lowered.index(HEADER_NAME)
+                continue
+            column = 0
+        value = cells[column] if column < len(cells) else ""
+        if not value:
+            continue
+        try:
+            word = sanitize_word(value)
+            error = None
+        except ValueError as exc:
+            word = None
+            error = str(exc)
+        yield {"row": reader.line_num, "value": value, "word": word, "error": error}
@@ -0,0 +1,131 @@
+"""Online snapshot and restore cost, with a writer running alongside.
+
+Run from the repository root:
+    python -m benchmarks.bench_backup [--size-mb 2048] [--json results.json]
+
+Seeds a temporary database to roughly `--size-mb`, then takes a snapshot and
+restores it while a thread keeps saving exercises. Reports copy, verify and
+restore time, plus the writer's save latency and errors with nothing else
+running, during the snapshot and during the restore. Set
+GOGOHANNAH_SQLITE_WAL=false to compare against rollback-journal mode.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.bench_hot_paths import seed_database
+from benchmarks.load_test import percentile
+
+# Roughly what one synthetic exercise row plus its index entries costs.
+_BYTES_PER_EXERCISE = 110
+
+
+class Writer(threading.Thread):
+    """Saves exercises in a loop and records each save's latency."""
+
+    def __init__(self, child_id: int, interval: float) -> None:
+        super().__init__(daemon=True)
+        self.child_id = child_id
+        self.interval = interval
+        self.samples: list[float] = []
+        self.errors = 0
+        self.stop = threading.Event()
+
+    def run(self) -> None:
+        from backend.app.core.progress import save_exercise
+
+        count = 0
+        while not self.stop.is_set():
+            begin = time.perf_counter()
+            try:
+                save_exercise(self.child_id, f"word{count % 50}", "vocab", count % 101, True)
+            except Exception:
+                self.errors += 1
+            self.samples.append((time.perf_counter() - begin) * 1000)
+            count += 1
+            self.stop.wait(self.interval)
+
+
+def _latency(samples: list[float]) -> dict:
+    return {
+        "saves": len(samples),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "max_ms": round(max(samples, default=0.0), 3),
+    }
+
+
+def _measure_writer(child_id: int, interval: float, action) -> tuple:
+    writer = Writer(child_id, interval)
+    writer.start()
+    try:
+        result = action()
+    finally:
+        writer.stop.set()
+        writer.join()
+    return result, {**_latency(writer.samples), "errors": writer.errors}
+
+
+def _describe(latency: dict) -> str:
+    return (
+        f"writer p50 {latency['p50_ms']} ms p99 {latency['p99_ms']} ms "
+        f"max {latency['max_ms']} ms, {latency['saves']} saves, {latency['errors']} errors"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=2048)
+    parser.add_argument("--write-interval", type=float, default=0.005)
+    parser.add_argument("--json", dest="json_path", help="write results here")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp())
+    os.environ["GOGOHANNAH_DB_PATH"] = str(workdir / "bench.db")
+    from backend.app.core import backup
+    from backend.app.core.db import database_path
+
+    exercises = int(args.size_mb * 1024 * 1024 / _BYTES_PER_EXERCISE)
+    started = time.perf_counter()
+    ids = seed_database(children=200, exercises=exercises, documents=0, dim=8, seed=7)
+    child_id = ids["child_id"]
+    size = database_path().stat().st_size
+    print(
+        f"database: {size / 1024 / 1024:.1f} MB, {exercises} exercises "
+        f"(seeded in {time.perf_counter() - started:.0f}s)"
+    )
+
+    results = {"database_bytes": size}
+    _, idle = _measure_writer(child_id, args.write_interval, lambda: time.sleep(3))
+    results["writer_idle"] = idle
+    print(f"idle:     {_describe(idle)}")
+
+    snapshot, latency = _measure_writer(
+        child_id, args.write_interval, lambda: backup.create_snapshot(workdir / "backups")
+    )
+    results["snapshot"] = {**snapshot, "writer": latency}
+    print(
+        f"snapshot: copy {snapshot['copy_seconds']:.2f}s verify "
+        f"{snapshot['verify_seconds']:.2f}s ({snapshot['journal_mode']}) | {_describe(latency)}"
+    )
+
+    restored, latency = _measure_writer(
+        child_id,
+        args.write_interval,
+        lambda: backup.restore_snapshot(Path(snapshot["path"]), safety_snapshot=False),
+    )
+    results["restore"] = {**restored, "writer": latency}
+    print(f"restore:  {restored['seconds']:.2f}s | {_describe(latency)}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Micro-benchmarks for backend hot paths, with baseline regression checks.
+
+Run from the repository root:
+    python -m benchmarks.bench_hot_paths [--json results.json]
+    python -m benchmarks.bench_hot_paths --compare benchmarks/baseline.json
+    python -m benchmarks.bench_hot_paths --save-baseline benchmarks/baseline.json
+
+Seeds a temporary database with synthetic children, exercises and RAG
+documents, then times each hot function. `--compare` exits with status 1
+when a benchmark's median is slower than the baseline by more than its
+threshold (the baseline's per-benchmark `thresholds`, else `--threshold`).
+Baselines are machine-specific; regenerate them on the machine that
+compares against them.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from benchmarks.load_test import percentile
+from benchmarks.mock_llm import fake_embedding
+
+WORDS = [
+    "apple", "river", "garden", "rocket", "pencil", "turtle", "window", "bridge",
+    "night", "teacher", "butterfly", "station", "kitchen", "thunder", "whisper",
+    "elephant", "shadow", "pumpkin", "blanket", "squirrel",
+]
+EXERCISE_TYPES = ["vocab", "spelling", "pronunciation", "comprehension"]
+# Seeding parameters that change what the benchmarks measure.
+WORKLOAD_KEYS = ("children", "exercises", "documents", "dim")
+
+
+def seed_database(children: int, exercises: int, documents: int, dim: int, seed: int) -> dict:
+    """Insert synthetic rows and return the ids the benchmarks query."""
+    # Importing these modules creates their tables.
+    from backend.app.core import progress, rag, scheduler  # noqa: F401
+    from backend.app.core.db import get_connection
+
+    rng = random.Random(seed)
+    now = datetime.now()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            "INSERT INTO children (name) VALUES (?)",
+            [(f"bench-child-{index}",) for index in range(children)],
+        )
+        child_ids = [row[0] for row in cursor.execute("SELECT id FROM children")]
+        cursor.executemany(
+            """
+            INSERT INTO exercises (child_id, word, exercise_type, score, correct, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            (
+                (
+                    rng.choice(child_ids),
+                    rng.choice(WORDS),
+                    rng.choice(EXERCISE_TYPES),
+                    score,
+                    score >= 70,
+                    (now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))).strftime(
+                        "%Y-%m-%d %H:%M:%S"
+                    ),
+                )
+                for score in (rng.randint(0, 100) for _ in range(exercises))
+            ),
+        )
+        for index in range(documents):
+            text = f"Story {index} about {rng.choice(WORDS)} and {rng.choice(WORDS)}."
+            cursor.execute(
+                "INSERT INTO documents (child_id, doc_type, text) VALUES (?, ?, ?)",
+                (None if rng.random() < 0.5 else rng.choice(child_ids), "story", text),
+            )
+            cursor.execute(
+                "INSERT INTO embeddings (doc_id, vector_json) VALUES (?, ?)",
+                (cursor.lastrowid, json.dumps(fake_embedding(text, dim))),
+            )
+        # Rows were inserted directly, so replay them into the word schedule.
+        scheduler.rebuild_schedule(cursor)
+        conn.commit()
+    busiest = (
+        get_connection()
+        .execute(
+            "SELECT child_id FROM exercises GROUP BY child_id ORDER BY COUNT(*) DESC LIMIT 1"
+        )
+        .fetchone()[0]
+    )
+    return {"child_id": busiest}
+
+
+def _story_blocks(count: int) -> list:
+    blocks = []
+    for index in range(count):
+        blocks.append({"english": f"  Line {index} of the story. ", "chinese": f"第{index}句 "})
+        blocks.append("not a block")
+        blocks.append({"english": "", "chinese": ""})
+    return blocks
+
+
+def build_benchmarks(ids: dict, dim: int) -> dict[str, Callable[[], object]]:
+    from backend.app.core import rag
+    from backend.app.core.phonics import phonics_hint
+    from backend.app.core.progress import get_child_progress, get_daily_progress
+    from backend.app.core.scheduler import next_words
+    from backend.app.vocab.loader import load_default_vocab
+    from backend.app.core.scoring import calculate_pronunciation_score
+    from backend.app.llm.client import _normalize_story_blocks
+
+    # Embed locally so the benchmark measures retrieval, not the network.
+    rag.embed_text = lambda text: fake_embedding(text, dim)
+    child_id = ids["child_id"]
+    blocks = _story_blocks(200)
+    vocabulary = WORDS + load_default_vocab()
+    return {
+        "retrieve_context": lambda: rag.retrieve_context("a story about a turtle"),
+        "retrieve_context_child": lambda: rag.retrieve_context(
+            "a story about a turtle", child_id=child_id
+        ),
+        "get_child_progress": lambda: get_child_progress(child_id),
+        "get_daily_progress": lambda: get_daily_progress(child_id, days=90),
+        "next_words": lambda: next_words(child_id, vocabulary, limit=10),
+        "phonics_hint": lambda: [phonics_hint(word) for word in WORDS],
+        "normalize_story_blocks": lambda: _normalize_story_blocks(blocks),
+        "pronunciation_score_spelling": lambda: [
+            calculate_pronunciation_score(word[::-1], word, mode="spelling") for word in WORDS
+        ],
+        "pronunciation_score_phoneme": lambda: [
+            calculate_pronunciation_score(word[::-1], word, mode="phoneme") for word in WORDS
+        ],
+    }
+
+
+def time_function(func: Callable[[], object], min_time: float, max_runs: int) -> dict:
+    """Run `func` repeatedly for at least `min_time` seconds (after one warm-up)."""
+    func()
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_runs and (
+        len(samples) < 5 or time.perf_counter() - started < min_time
+    ):
+        begin = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - begin) * 1000)
+    return {
+        "runs": len(samples),
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(percentile(samples, 95), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+    }
+
+
+def workload_mismatch(current: dict, baseline: dict) -> dict:
+    """Seeding parameters that differ between two result documents."""
+    current_meta = current.get("meta", {})
+    baseline_meta = baseline.get("meta", {})
+    return {
+        key: (baseline_meta[key], current_meta[key])
+        for key in WORKLOAD_KEYS
+        if key in baseline_meta
+        and key in current_meta
+        and baseline_meta[key] != current_meta[key]
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Compare medians against a baseline document.
+
+    Returns one row per benchmark present in both, with the slowdown ratio
+    and whether it exceeds the allowed threshold. Raises ValueError when the
+    two runs seeded different workloads, since their timings are not
+    comparable.
+    """
+    mismatch = workload_mismatch(current, baseline)
+    if mismatch:
+        details = ", ".join(
+            f"{key} {before} -> {after}" for key, (before, after) in mismatch.items()
+        )
+        raise ValueError(f"Baseline was recorded with a different workload: {details}")
+    thresholds = baseline.get("thresholds", {})
+    rows = []
+    for name, result in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if not reference or not reference.get("median_ms"):
+            continue
+        ratio = result["median_ms"] / reference["median_ms"]
+        allowed = float(thresholds.get(name, threshold))
+        rows.append(
+            {
+                "name": name,
+                "baseline_ms": reference["median_ms"],
+                "current_ms": result["median_ms"],
+                "ratio": round(ratio, 3),
+                "threshold": allowed,
+                "regressed": ratio > 1 + allowed,
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--children", type=int, default=200)
+    parser.add_argument("--exercises", type=int, default=50_000)
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=1536, help="embedding size")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per benchmark")
+    parser.add_argument("--max-runs", type=int, default=1000)
+    parser.add_argument("--only", action="append", help="run only these benchmarks")
+    parser.add_argument("--json", dest="json_path", help="write results here")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", help="write results as a new baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)"
+    )
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gogohannah-bench-")
+    os.environ["GOGOHANNAH_DB_PATH"] = os.path.join(workdir, "bench.db")
+    os.environ["GOGOHANNAH_RAG_ENABLED"] = "true"
+
+    ids = seed_database(args.children, args.exercises, args.documents, args.dim, args.seed)
+    benchmarks = build_benchmarks(ids, args.dim)
+    results = {}
+    for name, func in benchmarks.items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = time_function(func, args.min_time, args.max_runs)
+        print(
+            f"{name:<32}{results[name]['median_ms']:>12.3f} ms median"
+            f"{results[name]['p95_ms']:>12.3f} ms p95  ({results[name]['runs']} runs)"
+        )
+
+    document = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "children": args.children,
+            "exercises": args.exercises,
+            "documents": args.documents,
+            "dim": args.dim,
+        },
+        "results": results,
+    }
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(document, handle, indent=2)
+    if args.save_baseline:
+        thresholds = {}
+        if os.path.exists(args.save_baseline):
+            with open(args.save_baseline, encoding="utf-8") as handle:
+                thresholds = json.load(handle).get("thresholds", {})
+        with open(args.save_baseline, "w", encoding="utf-8") as handle:
+            json.dump({**document, "thresholds": thresholds}, handle, indent=2)
+            handle.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        try:
+            rows = compare_results(document, baseline, args.threshold)
+        except ValueError as exc:
+            sys.exit(f"{exc}. Rerun with the baseline's settings or save a new baseline.")
+        print()
+        for row in rows:
+            flag = "REGRESSION" if row["regressed"] else "ok"
+            print(
+                f"{row['name']:<32}{row['baseline_ms']:>10.3f} -> {row['current_ms']:>10.3f} ms"
+                f"  x{row['ratio']:<7} {flag}"
+            )
+        if any(row["regressed"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Serialization CPU time and bytes on the wire for the largest responses.
+
+Run from the repository root:
+    python -m benchmarks.bench_serialization [--json results.json]
+
+Compares, per payload, the paths a FastAPI response can take:
+`pydantic` (response_model validation plus pydantic-core JSON, FastAPI's
+default for typed routes), `jsonable+json` (jsonable_encoder plus the
+standard library, the default for untyped routes) and `fast`
+(FastJSONResponse: no re-validation, orjson when installed). Then reports
+body size and compression time for identity, gzip and brotli.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import zlib
+from datetime import date, timedelta
+
+from benchmarks.bench_hot_paths import time_function
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def build_payloads() -> dict:
+    from backend.app.core.exercise import simple_comprehension_exercise
+    from backend.app.core.progress import _daily_summary
+    from backend.app.schemas import ComprehensionExerciseResponse, DailyProgressResponse
+
+    today = date.today()
+    start = today - timedelta(days=364)
+    counts = {
+        (start + timedelta(days=offset)).isoformat(): offset % 7 for offset in range(365)
+    }
+    daily = _daily_summary(counts, 3, start, 365, today)
+    comprehension = {
+        **simple_comprehension_exercise(level="beginner", output_style="bilingual"),
+        "image_url": None,
+        "source": "fallback",
+    }
+    return {
+        "daily_365": (DailyProgressResponse, daily),
+        "comprehension": (ComprehensionExerciseResponse, comprehension),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per case")
+    parser.add_argument("--max-runs", type=int, default=5000)
+    parser.add_argument("--json", dest="json_path", help="write results here")
+    args = parser.parse_args()
+
+    # Importing the app modules creates tables; keep them out of the real database.
+    os.environ.setdefault(
+        "GOGOHANNAH_DB_PATH", os.path.join(tempfile.mkdtemp(), "bench.db")
+    )
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    from backend.app.core import responses
+
+    results = {"orjson": responses.orjson is not None, "payloads": {}}
+    for name, (model, payload) in build_payloads().items():
+        adapter = TypeAdapter(model)
+        encoders = {
+            "pydantic": lambda: adapter.dump_json(adapter.validate_python(payload)),
+            "jsonable+json": lambda: json.dumps(
+                jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8"),
+            "fast": lambda: responses.dumps(payload),
+        }
+        body = responses.dumps(payload)
+        compressors = {
+            "identity": lambda: body,
+            "gzip-6": lambda: _gzip(body, 6),
+            "gzip-9": lambda: _gzip(body, 9),
+        }
+        if responses.brotli is not None:
+            compressors["br-4"] = lambda: responses.brotli.compress(body, quality=4)
+            compressors["br-11"] = lambda: responses.brotli.compress(body, quality=11)
+
+        row = {"encode": {}, "wire": {}}
+        print(f"{name} ({len(body)} bytes)")
+        for label, func in encoders.items():
+            timing = time_function(func, args.min_time, args.max_runs)
+            row["encode"][label] = timing
+            print(f"  encode {label:<16}{timing['median_ms']:>10.4f} ms median")
+        for label, func in compressors.items():
+            timing = time_function(func, args.min_time, args.max_runs)
+            size = len(func())
+            row["wire"][label] = {**timing, "bytes": size}
+            print(
+                f"  wire   {label:<16}{timing['median_ms']:>10.4f} ms median"
+                f"{size:>10} bytes ({size / len(body):.0%})"
+            )
+        results["payloads"][name] = row
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Import-time and memory benchmark for the vocabulary CSV loader.
+
+Run from the repository root:
+    python -m benchmarks.bench_vocab_loader [--rows 1000000]
+
+Each measurement runs in a fresh interpreter so import costs and peak RSS
+are not polluted by earlier imports.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+_IMPORT_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"import_ms": elapsed * 1000, "max_rss_kb": rss_kb}}))
+"""
+
+_STREAM_PROBE = """
+import json, resource, sys, time
+from backend.app.vocab.loader import iter_vocab_csv
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+accepted = rejected = 0
+for row in iter_vocab_csv(sys.argv[1]):
+    if row["error"]:
+        rejected += 1
+    else:
+        accepted += 1
+elapsed = time.perf_counter() - start
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "parse_ms": elapsed * 1000,
+    "accepted": accepted,
+    "rejected": rejected,
+    "rss_growth_kb": after - before,
+}))
+"""
+
+
+def _run_probe(source: str, *args: str) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", source, *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=os.getcwd(),
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _median_probe(source: str, repeat: int) -> dict:
+    runs = [_run_probe(source) for _ in range(repeat)]
+    runs.sort(key=lambda item: item["import_ms"])
+    return runs[len(runs) // 2]
+
+
+def _write_csv(path: str, rows: int) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("word\n")
+        for index in range(rows):
+            # Every 1000th row is invalid so the error path is exercised too.
+            if index % 1000 == 0:
+                handle.write("bad#word\n")
+            else:
+                handle.write(f"word {_letters(index)}\n")
+
+
+def _letters(index: int) -> str:
+    chars = []
+    while True:
+        index, rem = divmod(index, 26)
+        chars.append(chr(ord("a") + rem))
+        if not index:
+            return "".join(chars)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {
+        "baseline": _median_probe(_IMPORT_PROBE.format(module="json"), args.repeat),
+        "loader": _median_probe(
+            _IMPORT_PROBE.format(module="backend.app.vocab.loader"), args.repeat
+        ),
+    }
+    try:
+        results["pandas"] = _median_probe(
+            _IMPORT_PROBE.format(module="pandas"), args.repeat
+        )
+    except subprocess.CalledProcessError:
+        results["pandas"] = None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        small_path = os.path.join(tmp, "small.csv")
+        large_path = os.path.join(tmp, "large.csv")
+        _write_csv(small_path, max(1, args.rows // 100))
+        _write_csv(large_path, args.rows)
+        results["stream_small"] = _run_probe(_STREAM_PROBE, small_path)
+        results["stream_large"] = _run_probe(_STREAM_PROBE, large_path)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
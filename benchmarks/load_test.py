@@ -0,0 +1,228 @@
+"""End-to-end load test of the FastAPI app against the mock LLM server.
+
+Run from the repository root:
+    python -m benchmarks.load_test [--concurrency 16] [--duration 20] [--json out.json]
+
+Starts `benchmarks.mock_llm` on a free local port, points the backend at it
+through OPENAI_BASE_URL, and drives the app in-process over ASGI with a
+weighted mix of routes. Use `--target http://host:port` to load an already
+running server instead (start it with OPENAI_BASE_URL set to a mock).
+Reports requests, errors, throughput and p50/p95/p99 latency per route.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+from benchmarks.mock_llm import add_mock_arguments, build_config, create_app
+
+WORDS = ["apple", "river", "garden", "rocket", "pencil", "turtle", "window", "bridge"]
+CHILDREN = [f"child{index}" for index in range(20)]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (0 for an empty list)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _wav_bytes(seconds: float = 0.6, rate: int = 16000) -> bytes:
+    buffer = io.BytesIO()
+    frames = int(seconds * rate)
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(
+            b"".join(
+                int(8000 * ((index // 40) % 2 * 2 - 1)).to_bytes(2, "little", signed=True)
+                for index in range(frames)
+            )
+        )
+    return buffer.getvalue()
+
+
+def _route_mix(rng: random.Random, audio: bytes):
+    """Yield (route label, request kwargs) pairs following the weighted mix."""
+    routes = [
+        (30, "POST /v1/vocab/exercise", lambda: {
+            "method": "POST", "url": "/v1/vocab/exercise",
+            "json": {"word": rng.choice(WORDS)},
+        }),
+        (5, "POST /v1/comprehension/exercise", lambda: {
+            "method": "POST", "url": "/v1/comprehension/exercise",
+            "json": {"level": "beginner", "theme": "animals"},
+        }),
+        (20, "POST /v1/progress/exercise", lambda: {
+            "method": "POST", "url": "/v1/progress/exercise",
+            "json": {
+                "child_name": rng.choice(CHILDREN), "word": rng.choice(WORDS),
+                "exercise_type": "vocab", "score": rng.randint(0, 100),
+                "correct": rng.random() < 0.7,
+            },
+        }),
+        (15, "GET /v1/progress/summary", lambda: {
+            "method": "GET", "url": "/v1/progress/summary",
+            "params": {"child_name": rng.choice(CHILDREN)},
+        }),
+        (10, "GET /v1/progress/daily", lambda: {
+            "method": "GET", "url": "/v1/progress/daily",
+            "params": {"child_name": rng.choice(CHILDREN)},
+        }),
+        (15, "POST /v1/pronunciation/score", lambda: {
+            "method": "POST", "url": "/v1/pronunciation/score",
+            "json": {"target_word": rng.choice(WORDS), "user_text": rng.choice(WORDS)},
+        }),
+        (5, "POST /v1/pronunciation/assess", lambda: {
+            "method": "POST", "url": "/v1/pronunciation/assess",
+            "data": {"target_word": rng.choice(WORDS)},
+            "files": {"audio": ("take.wav", audio, "audio/wav")},
+        }),
+    ]
+    weights = [weight for weight, _, _ in routes]
+    while True:
+        _, label, build = rng.choices(routes, weights=weights)[0]
+        yield label, build()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_mock(args: argparse.Namespace) -> str:
+    import uvicorn
+
+    port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_app(build_config(args)), host="127.0.0.1", port=port, log_level="warning"
+        )
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Mock LLM server did not start.")
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/v1"
+
+
+async def _run_load(client, args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    mix = _route_mix(rng, _wav_bytes())
+    latencies: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    issued = 0
+    stop_at = time.monotonic() + args.duration
+
+    async def worker() -> None:
+        nonlocal issued
+        while time.monotonic() < stop_at and (not args.requests or issued < args.requests):
+            issued += 1
+            label, request = next(mix)
+            started = time.perf_counter()
+            try:
+                response = await client.request(**request)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            latencies.setdefault(label, []).append(elapsed_ms)
+            if failed:
+                errors[label] = errors.get(label, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    wall = time.perf_counter() - started
+
+    routes = {}
+    for label in sorted(latencies):
+        samples = latencies[label]
+        routes[label] = {
+            "requests": len(samples),
+            "errors": errors.get(label, 0),
+            "rps": round(len(samples) / wall, 2),
+            "p50_ms": round(percentile(samples, 50), 2),
+            "p95_ms": round(percentile(samples, 95), 2),
+            "p99_ms": round(percentile(samples, 99), 2),
+        }
+    total = sum(len(samples) for samples in latencies.values())
+    return {
+        "concurrency": args.concurrency,
+        "wall_seconds": round(wall, 2),
+        "requests": total,
+        "errors": sum(errors.values()),
+        "rps": round(total / wall, 2) if wall else 0.0,
+        "routes": routes,
+    }
+
+
+def _print_report(report: dict) -> None:
+    print(
+        f"{report['requests']} requests, {report['errors']} errors, "
+        f"{report['rps']} req/s over {report['wall_seconds']} s "
+        f"(concurrency {report['concurrency']})"
+    )
+    header = f"{'route':<36}{'reqs':>7}{'errs':>6}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+    print(header)
+    for label, row in report["routes"].items():
+        print(
+            f"{label:<36}{row['requests']:>7}{row['errors']:>6}{row['rps']:>8}"
+            f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds")
+    parser.add_argument("--requests", type=int, default=0, help="stop after N requests")
+    parser.add_argument("--target", help="base URL of a running backend")
+    parser.add_argument("--json", dest="json_path", help="also write the report here")
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    import httpx
+
+    if args.target:
+        client = httpx.AsyncClient(base_url=args.target, timeout=120)
+    else:
+        os.environ["OPENAI_BASE_URL"] = _start_mock(args)
+        os.environ.setdefault("OPENAI_API_KEY", "mock")
+        os.environ.setdefault(
+            "GOGOHANNAH_DB_PATH", os.path.join(tempfile.mkdtemp(), "load.db")
+        )
+        from backend.app.main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://app", timeout=120
+        )
+
+    async def run() -> dict:
+        async with client:
+            return await _run_load(client, args)
+
+    report = asyncio.run(run())
+    _print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""Deterministic local stand-in for the OpenAI endpoints used by the backend.
+
+Run from the repository root:
+    python -m benchmarks.mock_llm [--port 8900] [--latency chat=lognormal:400:0.5]
+
+Then point the backend at it:
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=mock
+
+Serves chat completions, embeddings, audio transcriptions and image
+generation. Chat responses are schema-valid JSON for vocabulary, spelling
+and comprehension prompts, and plain text for translations and example
+sentences. Latency and error injection are seeded, so runs are repeatable.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+ENDPOINTS = ("chat", "embeddings", "audio", "images")
+_TARGET_WORD = re.compile(r'Target word: "([^"]+)"')
+_INPUT_WORDS = re.compile(r"Input words:\n(.+)", re.S)
+
+
+@dataclass
+class Latency:
+    """Per-request delay: `fixed`, `uniform` (0..2x) or `lognormal` around a median."""
+
+    distribution: str = "lognormal"
+    median_ms: float = 0.0
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        if self.distribution == "fixed":
+            return self.median_ms
+        if self.distribution == "uniform":
+            return rng.uniform(0, 2 * self.median_ms)
+        return self.median_ms * math.exp(rng.gauss(0, self.sigma))
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        """Parse `distribution:median_ms[:sigma]`, e.g. `lognormal:400:0.6`."""
+        parts = spec.split(":")
+        latency = cls(distribution=parts[0])
+        if latency.distribution not in {"fixed", "uniform", "lognormal"}:
+            raise ValueError(f"Unknown latency distribution: {parts[0]}")
+        if len(parts) > 1:
+            latency.median_ms = float(parts[1])
+        if len(parts) > 2:
+            latency.sigma = float(parts[2])
+        return latency
+
+
+@dataclass
+class MockConfig:
+    latency: dict = field(
+        default_factory=lambda: {
+            "chat": Latency(median_ms=400),
+            "embeddings": Latency(median_ms=40),
+            "audio": Latency(median_ms=600),
+            "images": Latency(median_ms=2000),
+        }
+    )
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    transcript: str = "apple"
+    embedding_dim: int = 256
+    seed: int = 7
+
+
+class _Injector:
+    def __init__(self, config: MockConfig) -> None:
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+
+    def draw(self, endpoint: str) -> tuple[float, Optional[int]]:
+        """Return the delay in seconds and an injected status code, if any."""
+        with self._lock:
+            delay = self.config.latency[endpoint].sample(self._rng) / 1000
+            roll = self._rng.random()
+        if roll < self.config.rate_limit_rate:
+            return delay, 429
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            return delay, 500
+        return delay, None
+
+
+def _vocab_payload(word: str) -> dict:
+    return {
+        "definition": f"A thing called {word} that you can see or use.",
+        "example_sentence": f"We looked at the {word} together after lunch.",
+        "quiz_question": f'What does "{word}" mean?',
+        "quiz_choices": {
+            "A": f"A thing called {word}",
+            "B": "A loud noise at night",
+            "C": "A kind of weather",
+        },
+        "quiz_answer": "A",
+    }
+
+
+def _story_payload(seed: str) -> dict:
+    lines = [
+        ("A small fox lived near a quiet pond.", "一只小狐狸住在安静的池塘边。"),
+        ("One day she saw a duck stuck in the reeds.", "有一天她看见一只鸭子被困在芦苇里。"),
+        ("The brave fox pulled the reeds apart.", "勇敢的狐狸把芦苇拉开。"),
+        ("The duck swam free and thanked her.", "鸭子自由地游走并感谢她。"),
+        ("The fox felt proud all afternoon.", "狐狸整个下午都很自豪。"),
+    ]
+    return {
+        "story_title": f"The Fox and the Duck ({seed})",
+        "story_text": " ".join(english for english, _ in lines),
+        "story_blocks": [{"english": en, "chinese": zh} for en, zh in lines],
+        "key_vocabulary": [
+            {"word": "brave", "meaning_en": "showing courage", "meaning_zh": "勇敢的"},
+            {"word": "pond", "meaning_en": "a small body of water", "meaning_zh": "池塘"},
+            {"word": "proud", "meaning_en": "happy about doing well", "meaning_zh": "自豪的"},
+        ],
+        "image_description": "A fox at a pond helping a duck out of tall reeds.",
+        "questions": [
+            {
+                "question": "Where did the fox live?",
+                "choices": {"A": "Near a pond", "B": "In a city", "C": "On a boat"},
+                "answer": "A",
+                "question_type": "literal",
+                "explanation_en": "The story says she lived near a pond.",
+                "explanation_zh": "故事说她住在池塘边。",
+                "evidence_block_index": 0,
+            },
+            {
+                "question": "What does 'brave' mean?",
+                "choices": {"A": "Sleepy", "B": "Showing courage", "C": "Hungry"},
+                "answer": "B",
+                "question_type": "vocabulary",
+                "explanation_en": "The fox helped even though it was hard.",
+                "explanation_zh": "狐狸即使困难也去帮忙。",
+                "evidence_block_index": 2,
+            },
+            {
+                "question": "Why did the fox feel proud?",
+                "choices": {"A": "She found food", "B": "She won a race", "C": "She helped the duck"},
+                "answer": "C",
+                "question_type": "inference",
+                "explanation_en": "She felt proud after helping.",
+                "explanation_zh": "她帮助后感到自豪。",
+                "evidence_block_index": 4,
+            },
+        ],
+    }
+
+
+def _chat_content(body: dict) -> str:
+    messages = body.get("messages") or []
+    system = " ".join(str(m.get("content", "")) for m in messages if m.get("role") == "system")
+    user = str(messages[-1].get("content", "")) if messages else ""
+    wants_json = (body.get("response_format") or {}).get("type") == "json_object"
+    if wants_json and "spelling assistant" in system:
+        match = _INPUT_WORDS.search(user)
+        words = [line.lstrip("- ").strip() for line in match.group(1).splitlines()] if match else []
+        return json.dumps({"suggested": [word for word in words if word]})
+    if wants_json and "children's book author" in system:
+        digest = hashlib.sha256(user.encode("utf-8")).hexdigest()[:6]
+        return json.dumps(_story_payload(digest), ensure_ascii=False)
+    if wants_json:
+        match = _TARGET_WORD.search(user)
+        return json.dumps(_vocab_payload(match.group(1) if match else "word"))
+    if "Chinese-to-English" in system:
+        return "The little fox is happy."
+    if "English-to-Chinese" in system:
+        return "小狐狸很开心。"
+    return "The children read a story together."
+
+
+def fake_embedding(text: str, dim: int) -> list[float]:
+    """Unit vector derived from the text, so equal inputs embed equally."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+    vector = [rng.gauss(0, 1) for _ in range(dim)]
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def create_app(config: Optional[MockConfig] = None) -> FastAPI:
+    config = config or MockConfig()
+    injector = _Injector(config)
+    app = FastAPI(title="GoGoHannah mock LLM")
+    app.state.config = config
+    app.state.calls = {endpoint: 0 for endpoint in ENDPOINTS}
+
+    async def _simulate(endpoint: str) -> Optional[JSONResponse]:
+        app.state.calls[endpoint] += 1
+        delay, status = injector.draw(endpoint)
+        if delay:
+            await asyncio.sleep(delay)
+        if status is None:
+            return None
+        kind = "rate_limit_exceeded" if status == 429 else "server_error"
+        return JSONResponse(
+            status_code=status,
+            content={"error": {"message": f"Injected {kind}.", "type": kind}},
+        )
+
+    @app.post("/v1/chat/completions")
+    async def chat(request: Request):
+        body = await request.json()
+        error = await _simulate("chat")
+        if error is not None:
+            return error
+        content = _chat_content(body)
+        return {
+            "id": f"chatcmpl-mock-{app.state.calls['chat']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        error = await _simulate("embeddings")
+        if error is not None:
+            return error
+        inputs = body.get("input")
+        inputs = inputs if isinstance(inputs, list) else [inputs]
+        return {
+            "object": "list",
+            "model": body.get("model", "mock"),
+            "data": [
+                {
+                    "object": "embedding",
+                    "index": index,
+                    "embedding": fake_embedding(str(text), config.embedding_dim),
+                }
+                for index, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+
+    @app.post("/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        form = await request.form()
+        error = await _simulate("audio")
+        if error is not None:
+            return error
+        if form.get("response_format") == "text":
+            return PlainTextResponse(config.transcript + "\n")
+        return {"text": config.transcript}
+
+    @app.post("/v1/images/generations")
+    async def images(request: Request):
+        await request.json()
+        error = await _simulate("images")
+        if error is not None:
+            return error
+        return {
+            "created": int(time.time()),
+            "data": [{"url": "https://example.invalid/mock-image.png"}],
+        }
+
+    @app.get("/stats")
+    def stats() -> dict:
+        return {"calls": dict(app.state.calls)}
+
+    return app
+
+
+def parse_latency_overrides(specs: list[str], config: MockConfig) -> None:
+    """Apply `endpoint=distribution:median_ms[:sigma]` overrides."""
+    for spec in specs:
+        endpoint, _, value = spec.partition("=")
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {endpoint!r}; expected one of {ENDPOINTS}.")
+        config.latency[endpoint] = Latency.parse(value)
+
+
+def build_config(args: argparse.Namespace) -> MockConfig:
+    config = MockConfig(
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        transcript=args.transcript,
+        seed=args.seed,
+    )
+    parse_latency_overrides(args.latency or [], config)
+    return config
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--latency",
+        action="append",
+        metavar="ENDPOINT=DIST:MEDIAN_MS[:SIGMA]",
+        help="e.g. chat=lognormal:400:0.5, embeddings=fixed:30 (repeatable)",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction answered 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction answered 429")
+    parser.add_argument("--transcript", default="apple")
+    parser.add_argument("--seed", type=int, default=7)
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(build_config(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# Point the SQLite database at a throwaway file before any backend module
+# is imported (they create their tables at import time).
+os.environ.setdefault(
+    "GOGOHANNAH_DB_PATH",
+    os.path.join(tempfile.mkdtemp(prefix="gogohannah-tests-"), "progress.db"),
+)
@@ -0,0 +1,60 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from backend.app.core import progress
+from backend.app.core.archive import archive_exercises
+from backend.app.core.db import get_connection
+
+
+def _snapshot(child_id: int) -> dict:
+    return {
+        "summary": progress.get_child_progress(child_id),
+        "daily": progress.get_daily_progress(child_id, daily_goal=2, days=60),
+        "bulk": progress.get_bulk_progress([child_id], daily_goal=2, days=60),
+        "recent": progress.get_recent_exercises(child_id, 15),
+        "history": progress.get_exercise_history(child_id, limit=7),
+        "export": list(progress.iter_exercise_history(child_id, batch_size=9)),
+    }
+
+
+def test_archival_keeps_every_view_exact():
+    rng = random.Random(3)
+    child_id = progress.get_or_create_child("archive-child")
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    with get_connection() as conn:
+        conn.executemany(
+            """
+            INSERT INTO exercises (child_id, word, exercise_type, score, correct, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            [
+                (
+                    child_id,
+                    rng.choice(["apple", "river", "kite"]),
+                    rng.choice(["vocab", "spelling"]),
+                    score,
+                    score >= 70,
+                    (now - timedelta(days=rng.randint(0, 40), minutes=index)).strftime(
+                        "%Y-%m-%d %H:%M:%S"
+                    ),
+                )
+                for index, score in enumerate(rng.randint(0, 100) for _ in range(120))
+            ],
+        )
+        conn.commit()
+    before = _snapshot(child_id)
+
+    result = archive_exercises(older_than_days=10, batch_size=16, pause_seconds=0)
+    assert result["moved"] > 0 and result["batches"] > 1
+    with get_connection() as conn:
+        hot, archived = conn.execute(
+            "SELECT (SELECT COUNT(*) FROM exercises WHERE child_id = ?),"
+            " (SELECT COUNT(*) FROM exercises_archive WHERE child_id = ?)",
+            (child_id, child_id),
+        ).fetchone()
+    assert hot + archived == 120 and archived == result["moved"]
+
+    assert _snapshot(child_id) == before
+
+    progress.save_exercise(child_id, "apple", "vocab", 50, False)
+    assert progress.get_child_progress(child_id)["total_exercises"] == 121
@@ -0,0 +1,98 @@
+import asyncio
+import hashlib
+import io
+import time
+
+import pytest
+from fastapi import FastAPI, File, Request, UploadFile
+from fastapi.testclient import TestClient
+
+from backend.app.core.audio import (
+    TranscriptionBusy,
+    UploadLimitMiddleware,
+    hash_upload,
+    run_transcription,
+)
+
+
+def test_hash_upload_reads_in_place_and_rewinds():
+    data = b"a" * 200_000
+    stream = io.BytesIO(data)
+    digest = hashlib.sha256()
+    assert hash_upload(stream, digest) == len(data)
+    assert digest.hexdigest() == hashlib.sha256(data).hexdigest()
+    assert stream.read() == data
+
+
+def _upload_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, paths=["/upload"])
+
+    @app.post("/upload")
+    async def upload(request: Request, audio: UploadFile = File(...)) -> dict:
+        return {"size": audio.size, "upload_ms": request.state.upload_ms}
+
+    return app
+
+
+def test_upload_limit_applies_before_parsing(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_MAX_AUDIO_BYTES", "100000")
+    client = TestClient(_upload_app())
+
+    small = client.post("/upload", files={"audio": ("a.wav", b"x" * 50_000)})
+    assert small.status_code == 200 and small.json()["size"] == 50_000
+    assert small.json()["upload_ms"] >= 0
+
+    # Declared length over the cap: rejected without reading the body.
+    large = client.post("/upload", files={"audio": ("a.wav", b"x" * 300_000)})
+    assert large.status_code == 413
+
+    # No declared length: reading stops once the body passes the cap.
+    boundary = "limit-test"
+
+    def body():
+        yield (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="audio"; '
+            'filename="a.wav"\r\n\r\n'
+        ).encode()
+        for _ in range(50):
+            yield b"x" * 16_384
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    chunked = client.post(
+        "/upload",
+        content=body(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+    assert chunked.status_code == 413
+    assert chunked.json() == {"detail": "Audio file is too large."}
+
+
+def test_assess_reports_every_stage(monkeypatch):
+    from backend.app import main
+
+    monkeypatch.setenv("GOGOHANNAH_TRANSCRIPTION_CACHE_SIZE", "0")
+    monkeypatch.setattr(main, "transcribe", lambda audio, name, word: ("night", "fake"))
+    response = TestClient(main.app).post(
+        "/v1/pronunciation/assess",
+        data={"target_word": "night"},
+        files={"audio": ("a.webm", b"not really audio")},
+    )
+    assert response.status_code == 200
+    assert set(response.json()["timings_ms"]) == {"upload", "hash", "transcode", "transcribe"}
+
+
+def test_transcription_queue_timeout(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_TRANSCRIBE_WORKERS", "1")
+    monkeypatch.setenv("GOGOHANNAH_TRANSCRIBE_QUEUE_TIMEOUT", "0.05")
+
+    async def scenario():
+        slow = asyncio.ensure_future(run_transcription(time.sleep, 0.3))
+        await asyncio.sleep(0.01)
+        with pytest.raises(TranscriptionBusy):
+            await run_transcription(time.sleep, 0)
+        await slow
+        # The slot is free again once the first call finishes.
+        await run_transcription(time.sleep, 0)
+
+    asyncio.run(scenario())
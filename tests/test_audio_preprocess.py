@@ -0,0 +1,42 @@
+import io
+import wave
+
+import numpy as np
+
+from backend.app.core.audio_preprocess import preprocess_audio, read_wav
+
+
+def _stereo_wav(rate: int = 44_100) -> io.BytesIO:
+    silence = np.zeros(rate, dtype=np.float32)
+    t = np.arange(rate // 2) / rate
+    tone = (0.1 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    mono = np.concatenate([silence, tone, silence])
+    stereo = np.stack([mono, mono], axis=1)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((stereo * 32767).astype("<i2").tobytes())
+    buffer.seek(0)
+    return buffer
+
+
+def test_preprocess_audio_downmixes_resamples_and_trims():
+    source = _stereo_wav()
+    original_size = len(source.getvalue())
+    processed = preprocess_audio(source)
+    assert processed is not None
+    assert len(processed.getvalue()) < original_size / 10
+    samples, rate = read_wav(processed)
+    assert rate == 16_000
+    assert samples.shape[1] == 1
+    # 0.5 s tone plus at most 150 ms padding on each side.
+    assert 0.5 <= len(samples) / rate <= 0.85
+    assert 0.85 <= float(np.abs(samples).max()) <= 0.9
+
+
+def test_preprocess_audio_passes_through_non_wav():
+    source = io.BytesIO(b"\x1aE\xdf\xa3webm-data")
+    assert preprocess_audio(source) is None
+    assert source.tell() == 0
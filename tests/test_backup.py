@@ -0,0 +1,66 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+
+from backend.app.core import backup
+from backend.app.core.progress import get_child_progress, get_or_create_child, save_exercise
+from backend.app.core.versions import get_child_version
+
+
+def test_snapshot_verify_and_restore(tmp_path, monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_BACKUP_DIR", str(tmp_path))
+    child_id = get_or_create_child("backup-child")
+    save_exercise(child_id, "apple", "vocab", 90, True)
+
+    # Writers keep going while the copy runs.
+    stop = threading.Event()
+    errors = []
+
+    def writer():
+        while not stop.is_set():
+            try:
+                save_exercise(child_id, "river", "vocab", 50, False)
+            except sqlite3.OperationalError as exc:
+                errors.append(exc)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        result = backup.create_snapshot()
+    finally:
+        stop.set()
+        thread.join()
+    assert result["journal_mode"] == "wal"
+    assert errors == []
+    assert backup.verify_snapshot(result["path"])["ok"]
+    assert [item["path"] for item in backup.list_snapshots()] == [result["path"]]
+    assert not list(tmp_path.glob("*.partial"))
+
+    snapshot = sqlite3.connect(result["path"])
+    assert snapshot.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    snapshot_total = snapshot.execute(
+        "SELECT COUNT(*) FROM exercises WHERE child_id = ?", (child_id,)
+    ).fetchone()[0]
+    snapshot.close()
+
+    save_exercise(child_id, "kite", "vocab", 10, False)
+    version_before = get_child_version(child_id)
+    restored = backup.restore_snapshot(result["path"])
+    assert restored["safety_snapshot"]
+    assert get_child_progress(child_id)["total_exercises"] == snapshot_total
+    assert get_child_version(child_id) > version_before
+
+
+def test_retention_keeps_recent_and_daily(tmp_path):
+    now = datetime.now(timezone.utc)
+    for offset in range(10):
+        for hour in (1, 2):
+            stamp = (now - timedelta(days=offset, hours=hour)).strftime("%Y%m%dT%H%M%S%fZ")
+            (tmp_path / f"progress-{stamp}.db").write_bytes(b"")
+    removed = backup.prune_snapshots(keep_last=3, keep_daily=5, dest_dir=tmp_path)
+    remaining = backup.list_snapshots(tmp_path)
+    assert len(removed) + len(remaining) == 20
+    days = {item["created_at"].date() for item in remaining}
+    # Five daily keepers; the three newest may add one more day.
+    assert 5 <= len(days) <= 6
+    assert remaining[0]["created_at"] > remaining[-1]["created_at"]
@@ -0,0 +1,35 @@
+import pytest
+
+from benchmarks.bench_hot_paths import compare_results
+
+
+def test_compare_results_flags_slowdowns_past_threshold():
+    baseline = {
+        "results": {"fast": {"median_ms": 1.0}, "noisy": {"median_ms": 1.0}},
+        "thresholds": {"noisy": 1.0},
+    }
+    current = {
+        "results": {
+            "fast": {"median_ms": 1.5},
+            "noisy": {"median_ms": 1.5},
+            "new": {"median_ms": 9.0},
+        }
+    }
+    rows = {row["name"]: row for row in compare_results(current, baseline, 0.25)}
+    assert rows["fast"]["regressed"] is True
+    assert rows["noisy"]["regressed"] is False
+    assert "new" not in rows
+
+
+def test_compare_results_refuses_a_different_workload():
+    meta = {"children": 200, "exercises": 50_000, "documents": 200, "dim": 1536}
+    baseline = {"meta": meta, "results": {"fast": {"median_ms": 1.0}}}
+    current = {
+        "meta": {**meta, "python": "other", "exercises": 5_000},
+        "results": {"fast": {"median_ms": 0.1}},
+    }
+    with pytest.raises(ValueError, match="exercises 50000 -> 5000"):
+        compare_results(current, baseline, 0.25)
+    # Non-workload fields such as the interpreter version are not checked.
+    current["meta"]["exercises"] = 50_000
+    assert compare_results(current, baseline, 0.25)[0]["regressed"] is False
@@ -0,0 +1,43 @@
+import json
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from backend.app.core.progress import (
+    get_bulk_progress,
+    get_child_progress,
+    get_daily_progress,
+    get_or_create_child,
+    save_exercise,
+)
+from backend.app.main import app
+
+
+def test_bulk_progress_matches_per_child_queries():
+    ids = [get_or_create_child(f"bulk-{index}") for index in range(3)]
+    for index, child_id in enumerate(ids):
+        for attempt in range(index + 2):
+            save_exercise(child_id, f"word{attempt % 2}", "vocab", 40 + attempt * 20, attempt % 2 == 0)
+    bulk = get_bulk_progress(ids, daily_goal=2, days=7)
+    for child_id in ids:
+        assert bulk[child_id]["summary"] == get_child_progress(child_id)
+        assert bulk[child_id]["daily"] == get_daily_progress(child_id, daily_goal=2, days=7)
+
+
+def test_bulk_endpoint_json_and_stream():
+    client = TestClient(app)
+    child_id = get_or_create_child("bulk-endpoint")
+    save_exercise(child_id, "apple", "vocab", 90, True)
+    body = {"child_names": ["bulk-endpoint", "bulk-nobody"], "date": date.today().isoformat()}
+
+    rows = client.post("/v1/progress/bulk", json=body).json()["children"]
+    assert [row["known"] for row in rows] == [True, False]
+    assert rows[0]["summary"]["total_exercises"] == 1
+    assert rows[0]["daily"]["today_completed"] == 1
+    assert rows[0]["daily"]["history"] == []
+    assert rows[1]["summary"]["total_exercises"] == 0
+
+    streamed = client.post("/v1/progress/bulk", json={**body, "stream": True})
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    assert [line["child_name"] for line in lines] == ["bulk-endpoint", "bulk-nobody"]
@@ -0,0 +1,187 @@
+import sqlite3
+import threading
+import time
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from backend.app.core import progress, study_time
+from backend.app.core.archive import archive_exercises
+from backend.app.core.custom_vocab import save_custom_vocab
+from backend.app.core.db import get_connection
+from backend.app.core.deletion import (
+    get_deletion_status,
+    queue_orphan_deletions,
+    request_child_deletion,
+    run_deletion,
+    run_pending_deletions,
+    stop_deletion_worker,
+)
+from backend.app.core.study_time import add_study_time, flush_study_time
+from backend.app.main import app
+
+_TABLES = (
+    "exercises",
+    "exercises_archive",
+    "exercise_archive_totals",
+    "exercise_archive_daily",
+    "word_schedule",
+    "study_time",
+    "study_time_rollups",
+    "custom_vocab",
+    "documents",
+)
+
+
+def _seed(name: str) -> int:
+    child_id = progress.get_or_create_child(name)
+    for index in range(12):
+        progress.save_exercise(child_id, f"word{index % 4}", "vocab", 40 + index, index % 2 == 0)
+    with get_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO exercises (child_id, word, exercise_type, score, correct, created_at)
+            VALUES (?, 'old', 'vocab', 30, 0, '2020-01-01 00:00:00')
+        """,
+            (child_id,),
+        )
+        for index in range(3):
+            doc_id = conn.execute(
+                "INSERT INTO documents (child_id, doc_type, text) VALUES (?, 'story', ?)",
+                (child_id, f"story {index}"),
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO embeddings (doc_id, vector_json) VALUES (?, '[1.0]')", (doc_id,)
+            )
+        conn.commit()
+    archive_exercises(older_than_days=365, pause_seconds=0)
+    add_study_time(child_id, date.today(), 120)
+    flush_study_time()
+    save_custom_vocab(child_id, ["kite", "lamp"])
+    return child_id
+
+
+def _row_counts(child_id: int) -> dict:
+    with get_connection() as conn:
+        counts = {
+            table: conn.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE child_id = ?", (child_id,)
+            ).fetchone()[0]
+            for table in _TABLES
+        }
+        counts["embeddings"] = conn.execute(
+            """
+            SELECT COUNT(*) FROM embeddings
+            WHERE doc_id IN (SELECT id FROM documents WHERE child_id = ?)
+        """,
+            (child_id,),
+        ).fetchone()[0]
+    return counts
+
+
+def test_deletion_tombstones_then_purges_every_table_in_chunks():
+    child_id = _seed("delete-me")
+    other_id = _seed("keep-me")
+    before = _row_counts(child_id)
+    assert all(before.values())
+    other_before = _row_counts(other_id)
+
+    status = request_child_deletion(child_id, background=False)
+    assert status["status"] == "pending"
+    assert progress.get_children_by_names(["delete-me"]) == {}
+
+    stopped = threading.Event()
+    stopped.set()
+    assert run_deletion(child_id, stop=stopped)["status"] == "pending"
+
+    done = run_deletion(child_id, batch_size=2, pause_seconds=0)
+    assert done["status"] == "done" and done["finished_at"]
+    assert done["tables"] == before
+    assert done["rows_deleted"] == sum(before.values())
+    assert not any(_row_counts(child_id).values())
+    assert _row_counts(other_id) == other_before
+
+    # The name is free again and starts from nothing under a new id.
+    new_id = progress.get_or_create_child("delete-me")
+    assert new_id != child_id
+    assert progress.get_child_progress(new_id)["total_exercises"] == 0
+
+
+def test_orphaned_rows_are_queued_and_purged():
+    orphan_id = progress.get_or_create_child("orphan")
+    save_custom_vocab(orphan_id, ["moon"])
+    with get_connection() as conn:
+        conn.execute("DELETE FROM children WHERE id = ?", (orphan_id,))
+        conn.commit()
+
+    assert orphan_id in queue_orphan_deletions(background=False)
+    run_pending_deletions()
+    assert get_deletion_status(orphan_id)["status"] == "done"
+    assert not any(_row_counts(orphan_id).values())
+
+
+def test_delete_endpoint_runs_in_background():
+    client = TestClient(app)
+    child_id = _seed("delete-via-api")
+    try:
+        response = client.delete("/v1/progress/child", params={"child_name": "delete-via-api"})
+        assert response.status_code == 202
+        assert response.json()["child_id"] == child_id
+
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            status = client.get("/v1/progress/deletion", params={"child_id": child_id}).json()
+            if status["status"] == "done":
+                break
+            time.sleep(0.05)
+        assert status["status"] == "done"
+        assert not any(_row_counts(child_id).values())
+    finally:
+        stop_deletion_worker()
+
+    missing = client.delete("/v1/progress/child", params={"child_name": "delete-via-api"})
+    assert missing.status_code == 404
+
+
+def test_failed_flush_during_deletion_does_not_restore_study_time(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_STUDY_TIME_FLUSH_SECONDS", "3600")
+    child_id = progress.get_or_create_child("delete-mid-flush")
+    other_id = progress.get_or_create_child("flush-survivor")
+    add_study_time(child_id, date.today(), 90)
+    add_study_time(other_id, date.today(), 45)
+
+    write = study_time._write_increments
+    writing = threading.Event()
+    proceed = threading.Event()
+
+    def failing_write(increments, generation=None):
+        writing.set()
+        proceed.wait(5)
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(study_time, "_write_increments", failing_write)
+    errors = []
+
+    def flush() -> None:
+        try:
+            flush_study_time()
+        except sqlite3.OperationalError as exc:
+            errors.append(exc)
+
+    flusher = threading.Thread(target=flush)
+    flusher.start()
+    assert writing.wait(5)
+    request_child_deletion(child_id, background=False)
+    proceed.set()
+    flusher.join()
+    assert errors
+
+    # The next flush must not recreate rows for the tombstoned child; a
+    # purge that has already passed study_time would never remove them.
+    monkeypatch.setattr(study_time, "_write_increments", write)
+    flush_study_time()
+    assert _row_counts(child_id)["study_time"] == 0
+    assert _row_counts(child_id)["study_time_rollups"] == 0
+    # Other children in the failed batch are buffered again and written.
+    assert _row_counts(other_id)["study_time"] == 1
+    assert run_deletion(child_id, pause_seconds=0)["status"] == "done"
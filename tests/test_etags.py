@@ -0,0 +1,54 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from backend.app.core import study_time
+from backend.app.core.progress import get_or_create_child
+from backend.app.core.versions import etag_matches, get_child_version
+from backend.app.main import app
+
+
+def test_etag_matching_is_weak_and_accepts_lists():
+    etag = 'W/"summary-1-3"'
+    assert etag_matches('W/"summary-1-3"', etag)
+    assert etag_matches('"other", "summary-1-3"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"summary-1-2"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_progress_endpoints_answer_304_until_a_write():
+    client = TestClient(app)
+    params = {"child_name": "etag-child"}
+    for path in ("/v1/progress/summary", "/v1/progress/daily", "/v1/progress/recent"):
+        first = client.get(path, params=params)
+        etag = first.headers["etag"]
+        cached = client.get(path, params=params, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+    etag = client.get("/v1/progress/summary", params=params).headers["etag"]
+    client.post(
+        "/v1/progress/exercise",
+        json={**params, "word": "apple", "exercise_type": "vocab", "score": 80, "correct": True},
+    )
+    fresh = client.get("/v1/progress/summary", params=params, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["total_exercises"] == 1
+    assert fresh.headers["etag"] != etag
+
+
+def test_custom_vocab_and_study_time_writes_bump_the_version(monkeypatch):
+    client = TestClient(app)
+    params = {"child_name": "etag-vocab"}
+    etag = client.get("/v1/vocab/custom", params=params).headers["etag"]
+    client.post("/v1/vocab/custom/add", json={**params, "words": ["river"]})
+    fresh = client.get("/v1/vocab/custom", params=params, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["words"] == ["river"]
+
+    monkeypatch.setenv("GOGOHANNAH_STUDY_TIME_FLUSH_SECONDS", "0")
+    child_id = get_or_create_child("etag-vocab")
+    before = get_child_version(child_id)
+    study_time.add_study_time(child_id, date(2024, 5, 1), 30)
+    assert get_child_version(child_id) == before + 1
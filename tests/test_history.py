@@ -0,0 +1,66 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.app.core.db import get_connection
+from backend.app.core.progress import (
+    get_exercise_history,
+    get_or_create_child,
+    iter_exercise_history,
+)
+from backend.app.main import app
+
+
+def _seed(name: str, count: int) -> int:
+    child_id = get_or_create_child(name)
+    with get_connection() as conn:
+        # Several rows share a timestamp, so paging must break ties on id.
+        conn.executemany(
+            """
+            INSERT INTO exercises (child_id, word, exercise_type, score, correct, created_at)
+            VALUES (?, ?, 'vocab', ?, 1, ?)
+        """,
+            [
+                (child_id, f"word{index}", index % 100, f"2024-01-01 10:00:{index // 3:02d}")
+                for index in range(count)
+            ],
+        )
+        conn.commit()
+    return child_id
+
+
+def test_keyset_pages_cover_history_once_in_order():
+    child_id = _seed("history-pages", 23)
+    seen, cursor = [], None
+    while True:
+        page, cursor = get_exercise_history(child_id, limit=5, cursor=cursor)
+        seen.extend(page)
+        if cursor is None:
+            break
+    keys = [(row["created_at"], row["id"]) for row in seen]
+    assert len(keys) == 23
+    assert keys == sorted(keys, reverse=True)
+
+    exported = [(row["created_at"], row["id"]) for row in iter_exercise_history(child_id, batch_size=4)]
+    assert exported == sorted(keys)
+
+
+def test_history_endpoints():
+    _seed("history-api", 7)
+    client = TestClient(app)
+    first = client.get("/v1/progress/history", params={"child_name": "history-api", "limit": 4}).json()
+    assert len(first["exercises"]) == 4
+    second = client.get(
+        "/v1/progress/history",
+        params={"child_name": "history-api", "limit": 4, "cursor": first["next_cursor"]},
+    ).json()
+    assert len(second["exercises"]) == 3
+    assert second["next_cursor"] is None
+
+    bad = client.get("/v1/progress/history", params={"child_name": "history-api", "cursor": "nope"})
+    assert bad.status_code == 400
+
+    export = client.get("/v1/progress/history/export", params={"child_name": "history-api"})
+    assert export.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in export.text.splitlines()]
+    assert [row["word"] for row in rows] == [f"word{index}" for index in range(7)]
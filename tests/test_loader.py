@@ -1,7 +1,27 @@
-from backend.app.vocab.loader import load_default_vocab
+import io
+
+from backend.app.vocab.loader import (
+    load_default_vocab,
+    load_vocab_from_csv,
+    load_vocab_from_csv_report,
+)
 
 
 def test_load_default_vocab():
     words = load_default_vocab()
     assert isinstance(words, list)
     assert len(words) > 0
+
+
+def test_load_vocab_from_csv_header_and_headerless():
+    assert load_vocab_from_csv(io.BytesIO(b"id,Word\n1,apple\n2, pear \n")) == [
+        "apple",
+        "pear",
+    ]
+    assert load_vocab_from_csv(io.StringIO("apple\n\nbanana\n")) == ["apple", "banana"]
+
+
+def test_load_vocab_from_csv_report_collects_row_errors():
+    words, errors = load_vocab_from_csv_report(b"word\napple\nb@d\nkiwi\n")
+    assert words == ["apple", "kiwi"]
+    assert [(e["row"], e["value"]) for e in errors] == [(3, "b@d")]
@@ -0,0 +1,30 @@
+from fastapi.testclient import TestClient
+
+from backend.app.core.metrics import Histogram, reset_metrics
+from backend.app.main import app
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo.", ("span",))
+    histogram.observe(0.003, "db.select")
+    histogram.observe(0.2, "db.select")
+    lines = histogram.render()
+    assert 'demo_seconds_bucket{span="db.select",le="0.005"} 1' in lines
+    assert 'demo_seconds_bucket{span="db.select",le="+Inf"} 2' in lines
+    assert 'demo_seconds_count{span="db.select"} 2' in lines
+
+
+def test_requests_and_spans_are_exported(monkeypatch):
+    reset_metrics()
+    client = TestClient(app)
+    monkeypatch.setenv("GOGOHANNAH_DEBUG", "true")
+    response = client.get("/v1/progress/summary", params={"child_name": "metrics"})
+    assert response.status_code == 200
+    assert response.headers["Server-Timing"].startswith("total;dur=")
+    assert "db-select" in response.headers["Server-Timing"]
+
+    monkeypatch.setenv("GOGOHANNAH_DEBUG", "false")
+    assert "Server-Timing" not in client.get("/healthz").headers
+    body = client.get("/metrics").text
+    assert 'route="/v1/progress/summary",status="200"' in body
+    assert 'gogohannah_span_duration_seconds_count{span="db.select"}' in body
@@ -0,0 +1,60 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+
+
+def test_debug_profiling_endpoints_are_gated(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_DEBUG", "false")
+    client = TestClient(app)
+    assert client.post("/v1/debug/profile/start", json={"seconds": 1}).status_code == 404
+    assert client.get("/v1/debug/tracemalloc").status_code == 404
+
+
+def test_profile_next_requests(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_DEBUG", "true")
+    client = TestClient(app)
+    started = client.post("/v1/debug/profile/start", json={"requests": 2, "interval_ms": 1})
+    assert started.status_code == 200
+
+    def score() -> None:
+        client.post(
+            "/v1/pronunciation/score:batch",
+            json={"user_texts": ["aple"] * 200, "target_words": ["apple"] * 50},
+        )
+
+    # The start call and status polls do not use up the request budget.
+    polled = client.get("/v1/debug/profile").json()
+    assert polled["requests_seen"] == 0 and polled["requests_left"] == 2
+    score()
+    polled = client.get("/v1/debug/profile").json()
+    assert polled["running"] is True
+    assert polled["requests_seen"] == 1 and polled["requests_left"] == 1
+    score()
+    for _ in range(100):
+        if not client.get("/v1/debug/profile").json()["running"]:
+            break
+        time.sleep(0.01)
+    status = client.get("/v1/debug/profile").json()
+    assert status["running"] is False
+    assert status["requests_seen"] == 2
+    collapsed = client.get("/v1/debug/profile", params={"format": "collapsed"}).text
+    for line in collapsed.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0 and stack
+
+
+def test_tracemalloc_snapshot(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_DEBUG", "true")
+    client = TestClient(app)
+    assert client.post("/v1/debug/tracemalloc/start", json={"frames": 5}).json()["tracing"]
+    try:
+        client.get("/v1/debug/tracemalloc")
+        held = [bytearray(1024) for _ in range(200)]
+        snapshot = client.get("/v1/debug/tracemalloc", params={"limit": 5}).json()
+        assert snapshot["top"]
+        assert "growth_since_last" in snapshot
+        assert held
+    finally:
+        assert client.post("/v1/debug/tracemalloc/stop").json()["tracing"] is False
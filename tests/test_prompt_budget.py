@@ -0,0 +1,41 @@
+from backend.app.llm.prompt_budget import count_tokens, fit_context
+from backend.app.llm.prompts import (
+    STORY_TASK_INSTRUCTIONS,
+    TASK_INSTRUCTIONS,
+    build_story_task_prompt,
+    build_task_prompt,
+)
+
+
+def test_fit_context_keeps_ranked_snippets_within_budget():
+    snippets = [
+        "The brave fox crossed the river to find food for her cubs.",
+        "the brave fox crossed the river to find food for her cubs.",
+        "A long story about a rabbit. " * 40,
+        "An unrelated third snippet that should not fit.",
+    ]
+    kept, stats = fit_context(snippets, budget=60)
+    assert kept[0] == snippets[0]
+    assert len(kept) == 2
+    assert kept[1].startswith("A long story about a rabbit.")
+    assert sum(count_tokens(item) for item in kept) <= 60
+    assert stats["context_tokens_used"] <= 60
+    assert stats["tokens_saved"] == stats["context_tokens_in"] - stats["context_tokens_used"]
+    assert stats["tokens_saved"] > 0
+
+
+def test_fit_context_without_context():
+    kept, stats = fit_context(None, budget=100)
+    assert kept == []
+    assert stats["tokens_saved"] == 0
+
+
+def test_prompts_share_a_static_prefix():
+    assert build_task_prompt("apple").startswith(TASK_INSTRUCTIONS)
+    assert build_task_prompt("river", context=["A river story."]).startswith(
+        TASK_INSTRUCTIONS
+    )
+    config = {"word_count": "50-90", "complexity": "simple", "question_complexity": "Q1"}
+    prompt = build_story_task_prompt(config, theme="space")
+    assert prompt.startswith(STORY_TASK_INSTRUCTIONS)
+    assert prompt.rstrip().endswith("Focus on theme: space")
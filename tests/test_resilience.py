@@ -0,0 +1,107 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.app.llm import resilience
+from backend.app.llm.resilience import CircuitOpen, call_llm, get_breaker, reset_llm_state
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state(monkeypatch):
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt: 0.0)
+    reset_llm_state()
+    yield
+    reset_llm_state()
+
+
+def test_transient_errors_are_retried():
+    calls = []
+
+    def flaky(timeout: float) -> str:
+        calls.append(timeout)
+        if len(calls) < 3:
+            raise TimeoutError("slow upstream")
+        return "ok"
+
+    assert call_llm("translate", flaky) == "ok"
+    assert len(calls) == 3
+    assert resilience.llm_metrics()["operations"]["translate"]["retries"] == 2
+
+
+def test_non_transient_errors_are_not_retried():
+    calls = []
+
+    def bad_request(timeout: float) -> str:
+        calls.append(timeout)
+        raise ValueError("bad payload")
+
+    with pytest.raises(ValueError):
+        call_llm("translate", bad_request)
+    assert len(calls) == 1
+    assert get_breaker("chat").state == "closed"
+
+
+def test_breaker_opens_and_short_circuits(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_LLM_MAX_RETRIES", "0")
+    monkeypatch.setenv("GOGOHANNAH_LLM_BREAKER_FAILURES", "2")
+
+    def down(timeout: float) -> str:
+        raise ConnectionError("refused")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            call_llm("embed", down)
+    with pytest.raises(CircuitOpen):
+        call_llm("embed", lambda timeout: "never called")
+    assert get_breaker("embeddings").state == "open"
+
+
+def test_hedge_wins_when_the_primary_stalls(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_LLM_HEDGE_AFTER_MS", "20")
+    calls = []
+
+    def first_call_stalls(timeout: float) -> str:
+        calls.append(timeout)
+        if len(calls) == 1:
+            time.sleep(0.5)
+            return "primary"
+        return "hedge"
+
+    assert call_llm("translate", first_call_stalls) == "hedge"
+    counters = resilience.llm_metrics()["operations"]["translate"]
+    assert counters["hedges"] == 1 and counters["hedge_wins"] == 1
+
+
+def test_concurrent_calls_are_not_hedged_while_queued(monkeypatch):
+    # More concurrent calls than any fixed pool would hold: each one answers
+    # well inside the hedge delay, so none may be hedged.
+    monkeypatch.setenv("GOGOHANNAH_LLM_HEDGE_AFTER_MS", "150")
+
+    def steady(timeout: float) -> str:
+        time.sleep(0.05)
+        return "ok"
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(lambda _: call_llm("embed", steady), range(32)))
+    assert results == ["ok"] * 32
+    assert resilience.llm_metrics()["operations"]["embed"]["hedges"] == 0
+
+
+def test_hedges_are_skipped_when_every_slot_is_busy(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_LLM_HEDGE_AFTER_MS", "10")
+    monkeypatch.setenv("GOGOHANNAH_LLM_HEDGE_MAX_IN_FLIGHT", "1")
+    release = threading.Event()
+
+    def saturated(timeout: float) -> str:
+        release.wait(1)
+        return "ok"
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(call_llm, "translate", saturated) for _ in range(3)]
+        time.sleep(0.1)
+        release.set()
+        assert [future.result() for future in futures] == ["ok"] * 3
+    counters = resilience.llm_metrics()["operations"]["translate"]
+    assert counters["hedges"] == 1 and counters["hedges_skipped"] == 2
@@ -0,0 +1,44 @@
+from fastapi.testclient import TestClient
+
+from backend.app.core.responses import choose_encoding, dumps
+from backend.app.main import app
+from backend.app.schemas import DailyProgressResponse
+
+
+def test_choose_encoding_honours_quality_values():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, deflate") is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("*") in {"br", "gzip"}
+
+
+def test_dumps_is_compact_utf8():
+    assert dumps({"word": "小狐狸", "score": 1}) == '{"word":"小狐狸","score":1}'.encode()
+
+
+def test_large_daily_history_is_gzipped_and_matches_the_schema():
+    client = TestClient(app)
+    params = {"child_name": "compress-child", "days": 365}
+    response = client.get(
+        "/v1/progress/daily", params=params, headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    body = response.json()
+    assert len(body["history"]) == 365
+    assert DailyProgressResponse.model_validate(body).model_dump() == body
+    assert response.headers["etag"]
+
+    plain = client.get(
+        "/v1/progress/daily", params=params, headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == body
+
+    small = client.get(
+        "/v1/progress/recent",
+        params={"child_name": "compress-child"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert small.status_code == 200
+    assert "content-encoding" not in small.headers
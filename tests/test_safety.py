@@ -0,0 +1,12 @@
+from backend.app.core.safety import validate_words
+
+
+def test_validate_words_reports_per_index_codes():
+    result = validate_words(["Apple", "apple", " ", "a" * 33, "b@d", " pear "])
+    assert result["accepted"] == ["Apple", "pear"]
+    assert [(e["index"], e["code"]) for e in result["errors"]] == [
+        (1, "duplicate"),
+        (2, "empty"),
+        (3, "too_long"),
+        (4, "invalid_characters"),
+    ]
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from backend.app.core import scheduler
+from backend.app.core.db import get_connection
+from backend.app.core.progress import get_or_create_child, save_exercise
+from backend.app.main import app
+
+
+def test_sm2_intervals_grow_and_reset_on_a_lapse():
+    reviewed = datetime(2024, 1, 1, 9, 0, 0)
+    state = None
+    intervals = []
+    for _ in range(4):
+        *state, due_at = scheduler.next_state(state, 100, True, reviewed)
+        intervals.append(state[1])
+    assert intervals[:2] == [1.0, 6.0]
+    assert intervals[2] > 6.0 and intervals[3] > intervals[2]
+
+    ease, interval, repetitions, lapses, due_at = scheduler.next_state(
+        tuple(state), 30, False, reviewed
+    )
+    assert (interval, repetitions, lapses) == (0.0, 0, 1)
+    assert ease < state[0]
+    assert due_at == reviewed + timedelta(minutes=scheduler.LAPSE_MINUTES)
+
+
+def test_due_words_then_new_words_then_upcoming():
+    child_id = get_or_create_child("scheduler-child")
+    save_exercise(child_id, "apple", "vocab", 100, True)
+    save_exercise(child_id, "river", "vocab", 20, False)
+    with get_connection() as conn:
+        # Make the missed word due now.
+        conn.execute(
+            "UPDATE word_schedule SET due_at = '2000-01-01 00:00:00' "
+            "WHERE child_id = ? AND word = 'river'",
+            (child_id,),
+        )
+        conn.commit()
+
+    words = ["apple", "river", "garden", "rocket"]
+    assert scheduler.next_words(child_id, words, limit=3) == ["river", "garden", "rocket"]
+    assert scheduler.next_words(child_id, words, limit=10) == ["river", "garden", "rocket", "apple"]
+    assert scheduler.next_words(child_id, ["garden"], limit=5) == ["garden"]
+
+
+def test_rebuild_matches_incremental_updates():
+    child_id = get_or_create_child("scheduler-rebuild")
+    for score, correct in [(90, True), (40, False), (100, True), (80, True)]:
+        save_exercise(child_id, "bridge", "vocab", score, correct)
+    query = (
+        "SELECT ease, interval_days, repetitions, lapses, last_score "
+        "FROM word_schedule WHERE child_id = ? AND word = 'bridge'"
+    )
+    with get_connection() as conn:
+        incremental = conn.execute(query, (child_id,)).fetchone()
+        scheduler.rebuild_schedule(conn.cursor())
+        conn.commit()
+        rebuilt = conn.execute(query, (child_id,)).fetchone()
+    assert rebuilt == incremental
+
+
+def test_recommended_endpoint_uses_custom_lists():
+    client = TestClient(app)
+    client.post(
+        "/v1/vocab/custom/add",
+        json={"child_name": "scheduler-api", "words": ["kite", "moon"], "list_name": "week1"},
+    )
+    response = client.get(
+        "/v1/progress/recommended",
+        params={"child_name": "scheduler-api", "source": "custom", "list_name": "week1"},
+    )
+    assert response.json()["words"] == ["kite", "moon"]
+    bad = client.get(
+        "/v1/progress/recommended", params={"child_name": "scheduler-api", "source": "nope"}
+    )
+    assert bad.status_code == 400
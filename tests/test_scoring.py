@@ -1,6 +1,45 @@
-from backend.app.core.scoring import check_answer
+from backend.app.core.scoring import (
+    calculate_pronunciation_score,
+    check_answer,
+    score_pronunciation_matrix,
+    score_pronunciation_pairs,
+)
 
 
 def test_check_answer():
     assert check_answer("a", "A") is True
     assert check_answer("B", "A") is False
+
+
+def test_batch_scores_match_single_scores():
+    pairs = [("nite", "night"), ("  Cat ", "cat"), (" ", "dog")]
+    expected = [calculate_pronunciation_score(u, t) for u, t in pairs]
+    assert score_pronunciation_pairs(pairs) == expected
+    matrix = score_pronunciation_matrix(["cat", "kat"], ["cat", "hat", "dog"])
+    assert matrix[1] == [
+        calculate_pronunciation_score("kat", word) for word in ["cat", "hat", "dog"]
+    ]
+
+
+def test_phoneme_mode_accepts_homophone_spellings():
+    assert calculate_pronunciation_score("nite", "night", mode="spelling") < 70
+    assert calculate_pronunciation_score("nite", "night", mode="phoneme") == 100
+    assert calculate_pronunciation_score("dog", "cat", mode="phoneme") < 50
+
+
+def test_batch_endpoint_honours_each_items_mode():
+    from fastapi.testclient import TestClient
+
+    from backend.app.main import app
+
+    items = [
+        {"user_text": "nite", "target_word": "night", "mode": "phoneme"},
+        {"user_text": "nite", "target_word": "night"},
+        {"user_text": "nite", "target_word": "night", "mode": "spelling"},
+    ]
+    response = TestClient(app).post(
+        "/v1/pronunciation/score:batch", json={"items": items, "mode": "phoneme"}
+    )
+    assert response.status_code == 200
+    spelling = calculate_pronunciation_score("nite", "night", mode="spelling")
+    assert response.json()["scores"] == [100, 100, spelling]
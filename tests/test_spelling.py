@@ -0,0 +1,20 @@
+from backend.app.core.spelling import _lexicon, correct_word, correct_words
+
+
+def test_correct_words_resolves_typos_locally():
+    assert correct_words(["elefant", "Freind", "happy", "苹果", "zzqxv"]) == [
+        "elephant",
+        "Friend",
+        "happy",
+        "苹果",
+        None,
+    ]
+
+
+def test_ties_across_lengths_go_to_the_higher_priority_word():
+    # "soe" is one edit from both "so" and "see"; "see" ranks higher in the
+    # default vocabulary, so it wins even though it sits in another bucket.
+    ranks, _ = _lexicon()
+    assert ranks["see"] < ranks["so"]
+    assert correct_words(["soe", "ne", "Soe-ne"]) == ["see", "new", "See-new"]
+    assert correct_word("soe") == "see"
@@ -0,0 +1,106 @@
+import threading
+import time
+from datetime import date
+
+from backend.app.core import study_time
+from backend.app.core.db import get_connection
+
+
+def _stored(child_id: int, day: date) -> int | None:
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT total_seconds FROM study_time WHERE child_id = ? AND date = ?",
+            (child_id, day.isoformat()),
+        ).fetchone()
+    return row[0] if row else None
+
+
+def test_heartbeats_are_coalesced_until_flush(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_STUDY_TIME_FLUSH_SECONDS", "3600")
+    day = date(2024, 3, 5)
+    child_id = 9001
+    for _ in range(4):
+        total = study_time.add_study_time(child_id, day, 15)
+    assert total == 60
+    assert _stored(child_id, day) is None
+    assert study_time.get_total_study_time(child_id) == 60
+    assert study_time.get_study_time_range(child_id, date(2024, 3, 1), date(2024, 3, 31)) == 60
+
+    assert study_time.flush_study_time() == 1
+    assert _stored(child_id, day) == 60
+    assert study_time.add_study_time(child_id, day, 5) == 65
+    assert study_time.get_total_study_time(child_id) == 65
+    study_time.flush_study_time()
+    assert _stored(child_id, day) == 65
+
+
+def test_write_through_when_buffering_is_off(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_STUDY_TIME_FLUSH_SECONDS", "0")
+    day = date(2024, 3, 6)
+    assert study_time.add_study_time(9002, day, 30) == 30
+    assert _stored(9002, day) == 30
+
+
+def test_range_from_rollups_matches_daily_sum(monkeypatch):
+    import random
+    from datetime import timedelta
+
+    monkeypatch.setenv("GOGOHANNAH_STUDY_TIME_FLUSH_SECONDS", "0")
+    rng = random.Random(3)
+    child_id = 9003
+    origin = date(2023, 11, 20)
+    daily = {}
+    for offset in range(0, 200, 3):
+        day = origin + timedelta(days=offset)
+        seconds = rng.randint(1, 600)
+        study_time.add_study_time(child_id, day, seconds)
+        daily[day] = seconds
+    for _ in range(60):
+        start = origin + timedelta(days=rng.randint(-10, 200))
+        end = start + timedelta(days=rng.randint(0, 150))
+        expected = sum(v for d, v in daily.items() if start <= d <= end)
+        assert study_time.get_study_time_range(child_id, start, end) == expected
+
+    summary = study_time.get_study_time_summary(child_id, date(2024, 1, 10))
+    assert summary["total_seconds"] == sum(daily.values())
+    assert summary["month"]["total_seconds"] == sum(
+        v for d, v in daily.items() if d.year == 2024 and d.month == 1
+    )
+    assert summary["week"]["start_date"] == "2024-01-08"
+
+
+def test_reads_do_not_wait_for_a_slow_flush_and_stay_exact(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_STUDY_TIME_FLUSH_SECONDS", "3600")
+    day = date(2024, 4, 2)
+    child_id = 9010
+    study_time.add_study_time(child_id, day, 40)
+    write = study_time._write_increments
+    writing = threading.Event()
+
+    def slow_write(increments, generation=None):
+        writing.set()
+        time.sleep(0.3)
+        write(increments, generation)
+        # Committed, but the batch is still marked in flight.
+        time.sleep(0.3)
+
+    monkeypatch.setattr(study_time, "_write_increments", slow_write)
+    flusher = threading.Thread(target=study_time.flush_study_time)
+    flusher.start()
+    assert writing.wait(5)
+
+    totals, latencies, heartbeats = [], [], 0
+    while flusher.is_alive():
+        begin = time.perf_counter()
+        study_time.add_study_time(child_id, day, 1)
+        heartbeats += 1
+        totals.append((40 + heartbeats, study_time.get_total_study_time(child_id)))
+        totals.append((40 + heartbeats, study_time.get_study_time(child_id, day)))
+        latencies.append(time.perf_counter() - begin)
+    flusher.join()
+
+    assert heartbeats > 5
+    assert max(latencies) < 0.2
+    assert all(expected == seen for expected, seen in totals)
+    study_time.flush_study_time()
+    assert _stored(child_id, day) == 40 + heartbeats
@@ -0,0 +1,46 @@
+import io
+
+import pytest
+
+from backend.app.llm import transcription
+from backend.app.llm.client import LLMUnavailable
+
+
+class _Failing(transcription.TranscriptionBackend):
+    name = "failing"
+
+    def model_id(self):
+        return self.name
+
+    def transcribe(self, audio, filename, target_word=None):
+        audio.read()
+        raise LLMUnavailable("offline")
+
+
+class _Echo(transcription.TranscriptionBackend):
+    name = "echo"
+
+    def model_id(self):
+        return self.name
+
+    def transcribe(self, audio, filename, target_word=None):
+        return audio.read().decode()
+
+
+def test_backends_must_implement_the_interface():
+    class _Partial(transcription.TranscriptionBackend):
+        def transcribe(self, audio, filename, target_word=None):
+            return ""
+
+    with pytest.raises(TypeError):
+        _Partial()
+
+
+def test_transcribe_falls_back_in_configured_order(monkeypatch):
+    # Fresh instance cache, so the fakes never leak into other tests.
+    monkeypatch.setattr(transcription, "_backends", {})
+    monkeypatch.setitem(transcription._BACKEND_TYPES, "failing", _Failing)
+    monkeypatch.setitem(transcription._BACKEND_TYPES, "echo", _Echo)
+    monkeypatch.setenv("GOGOHANNAH_TRANSCRIBE_BACKENDS", "failing, echo")
+    assert transcription.transcribe(io.BytesIO(b"night"), "a.wav") == ("night", "echo")
+    assert transcription.configured_model_id() == "failing,echo"
@@ -0,0 +1,37 @@
+from backend.app.core import transcription_cache
+from backend.app.core.db import get_connection
+
+
+def test_transcription_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_TRANSCRIPTION_CACHE_SIZE", "2")
+    monkeypatch.setenv("GOGOHANNAH_TRANSCRIPTION_CACHE_PERSIST", "false")
+    transcription_cache.clear_transcription_cache()
+    keys = [transcription_cache.cache_key(f"digest{i}", "night", "m") for i in range(3)]
+    transcription_cache.store_transcription(keys[0], "night", "openai")
+    transcription_cache.store_transcription(keys[1], "nite", "openai")
+    assert transcription_cache.get_cached_transcription(keys[0]) == ("night", "openai")
+    transcription_cache.store_transcription(keys[2], "knight", "vosk")
+    assert transcription_cache.get_cached_transcription(keys[1]) is None
+    assert transcription_cache.get_cached_transcription(keys[0]) == ("night", "openai")
+    transcription_cache.clear_transcription_cache()
+
+
+def test_persisted_cache_trims_least_recently_used(monkeypatch):
+    monkeypatch.setenv("GOGOHANNAH_TRANSCRIPTION_CACHE_SIZE", "0")
+    monkeypatch.setenv("GOGOHANNAH_TRANSCRIPTION_CACHE_PERSIST", "true")
+    monkeypatch.setenv("GOGOHANNAH_TRANSCRIPTION_CACHE_PERSIST_SIZE", "3")
+    with get_connection() as conn:
+        conn.execute("DELETE FROM transcription_cache")
+        conn.commit()
+    keys = [transcription_cache.cache_key(f"persist{i}", "night", "m") for i in range(5)]
+    for key in keys[:3]:
+        transcription_cache.store_transcription(key, "night", "openai")
+    # A retried recording stays cached even though it was stored first,
+    # and re-storing an existing key does not shrink the table.
+    assert transcription_cache.get_cached_transcription(keys[0]) == ("night", "openai")
+    transcription_cache.store_transcription(keys[2], "nite", "openai")
+    transcription_cache.store_transcription(keys[3], "night", "openai")
+    with get_connection() as conn:
+        kept = {row[0] for row in conn.execute("SELECT cache_key FROM transcription_cache")}
+    assert kept == {keys[0], keys[2], keys[3]}
+    assert transcription_cache.get_cached_transcription(keys[1]) is None